@@ -0,0 +1,61 @@
+import asyncio
+import importlib
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import pool
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import settings
+from app.models.base import Base
+
+# メタデータへテーブルを登録するためにモデルをインポート
+for _module in ("engagement", "engagement_rollup", "engagement_snapshot", "post", "post_variant", "user"):
+    importlib.import_module(f"app.models.{_module}")
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline() -> None:
+    """DBに接続せずにSQLを出力します。"""
+    context.configure(
+        url=str(settings.SQLALCHEMY_DATABASE_URI),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection: Connection) -> None:
+    context.configure(connection=connection, target_metadata=target_metadata)
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_migrations_online() -> None:
+    """非同期エンジンでDBに接続してマイグレーションを実行します。"""
+    connectable = create_async_engine(
+        str(settings.SQLALCHEMY_DATABASE_URI),
+        poolclass=pool.NullPool,
+    )
+
+    async with connectable.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+
+    await connectable.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    asyncio.run(run_migrations_online())
@@ -0,0 +1,95 @@
+"""initial schema (users, posts, post_variants, engagements)
+
+Revision ID: 0000
+Revises:
+Create Date: 2026-10-19 00:00:00.000000
+
+以降のリビジョンが前提とするテーブルを作成します。
+マイグレーション導入前に Base.metadata.create_all で作成済みのデータベースでは、
+このリビジョンを適用せずに `alembic stamp 0000` を実行してから `alembic upgrade head` を実行してください。
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0000"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _timestamps():
+    return [
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("name", sa.String(), nullable=True),
+        sa.Column("auth_provider", sa.Enum("GITHUB", "TWITTER", "GOOGLE", name="authprovider"), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "posts",
+        sa.Column("id", sa.Integer(), nullable=False),
+        *_timestamps(),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("platform", sa.Enum("X", "REDDIT", "PRODUCTHUNT", name="platform"), nullable=False),
+        sa.Column("scheduled_at", sa.DateTime(), nullable=True),
+        sa.Column(
+            "status",
+            sa.Enum("DRAFT", "SCHEDULED", "PUBLISHED", "FAILED", name="poststatus"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_posts_id", "posts", ["id"])
+
+    op.create_table(
+        "post_variants",
+        sa.Column("id", sa.Integer(), nullable=False),
+        *_timestamps(),
+        sa.Column("post_id", sa.Integer(), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.ForeignKeyConstraint(["post_id"], ["posts.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_post_variants_id", "post_variants", ["id"])
+
+    op.create_table(
+        "engagements",
+        sa.Column("id", sa.Integer(), nullable=False),
+        *_timestamps(),
+        sa.Column("post_variant_id", sa.Integer(), nullable=False),
+        sa.Column("likes", sa.Integer(), nullable=False),
+        sa.Column("comments", sa.Integer(), nullable=False),
+        sa.Column("shares", sa.Integer(), nullable=False),
+        sa.Column("upvotes", sa.Integer(), nullable=False),
+        sa.Column("captured_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["post_variant_id"], ["post_variants.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_engagements_id", "engagements", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_table("engagements")
+    op.drop_table("post_variants")
+    op.drop_table("posts")
+    op.drop_table("users")
+    for enum_name in ("poststatus", "platform", "authprovider"):
+        op.execute(f"DROP TYPE IF EXISTS {enum_name}")
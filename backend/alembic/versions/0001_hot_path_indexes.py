@@ -0,0 +1,53 @@
+"""add hot-path composite indexes
+
+Revision ID: 0001
+Revises: 0000
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = "0000"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 稼働中のテーブルをロックしないよう CONCURRENTLY で作成する（トランザクション外で実行）
+    with op.get_context().autocommit_block():
+        # analysis_service: バリアントごとの最新/期間内エンゲージメント
+        op.create_index(
+            "ix_engagements_post_variant_id_captured_at",
+            "engagements",
+            ["post_variant_id", "captured_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        # ScheduleService / 投稿一覧: ユーザー + ステータス + 予定日時
+        op.create_index(
+            "ix_posts_user_id_status_scheduled_at",
+            "posts",
+            ["user_id", "status", "scheduled_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        # PostService: 投稿に紐づくバリアントの取得
+        op.create_index(
+            "ix_post_variants_post_id",
+            "post_variants",
+            ["post_id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_post_variants_post_id", table_name="post_variants", postgresql_concurrently=True, if_exists=True)
+        op.drop_index("ix_posts_user_id_status_scheduled_at", table_name="posts", postgresql_concurrently=True, if_exists=True)
+        op.drop_index("ix_engagements_post_variant_id_captured_at", table_name="engagements", postgresql_concurrently=True, if_exists=True)
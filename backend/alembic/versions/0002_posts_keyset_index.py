@@ -0,0 +1,34 @@
+"""add keyset pagination index for posts listing
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # GET /posts: user_id で絞り込み (created_at, id) の降順でキーセット走査する
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_posts_user_id_created_at_id",
+            "posts",
+            ["user_id", "created_at", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_posts_user_id_created_at_id", table_name="posts", postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,77 @@
+"""add append-only partitioned engagement history
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 初回に作成する月次パーティション数（当月を含む）。以降は app.tasks.engagement_retention が作成する
+INITIAL_PARTITION_MONTHS = 3
+
+
+def _counter_columns():
+    return [
+        sa.Column("likes", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("comments", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("shares", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("upvotes", sa.Integer(), nullable=False, server_default="0"),
+    ]
+
+
+def _create_monthly_partitions(table: str) -> None:
+    now = datetime.utcnow()
+    for offset in range(INITIAL_PARTITION_MONTHS):
+        index = now.year * 12 + (now.month - 1) + offset
+        start = datetime(index // 12, index % 12 + 1, 1)
+        end = datetime((index + 1) // 12, (index + 1) % 12 + 1, 1)
+        op.execute(
+            f"CREATE TABLE IF NOT EXISTS {table}_p{start:%Y%m} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{start:%Y-%m-%d}') TO ('{end:%Y-%m-%d}')"
+        )
+
+
+def upgrade() -> None:
+    op.create_table(
+        "engagement_snapshots",
+        sa.Column("post_variant_id", sa.Integer(), nullable=False),
+        sa.Column("captured_at", sa.DateTime(), nullable=False),
+        *_counter_columns(),
+        sa.PrimaryKeyConstraint("post_variant_id", "captured_at"),
+        postgresql_partition_by="RANGE (captured_at)",
+    )
+    op.create_table(
+        "engagement_snapshots_hourly",
+        sa.Column("post_variant_id", sa.Integer(), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(), nullable=False),
+        *_counter_columns(),
+        sa.PrimaryKeyConstraint("post_variant_id", "bucket_start"),
+        postgresql_partition_by="RANGE (bucket_start)",
+    )
+    op.create_table(
+        "engagement_snapshots_daily",
+        sa.Column("post_variant_id", sa.Integer(), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(), nullable=False),
+        *_counter_columns(),
+        sa.PrimaryKeyConstraint("post_variant_id", "bucket_start"),
+    )
+    _create_monthly_partitions("engagement_snapshots")
+    _create_monthly_partitions("engagement_snapshots_hourly")
+
+
+def downgrade() -> None:
+    op.drop_table("engagement_snapshots_daily")
+    op.drop_table("engagement_snapshots_hourly")
+    op.drop_table("engagement_snapshots")
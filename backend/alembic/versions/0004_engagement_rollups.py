@@ -0,0 +1,90 @@
+"""add daily engagement rollup tables
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# posts.platform と同じ列挙型を再利用する
+platform_enum = postgresql.ENUM("X", "REDDIT", "PRODUCTHUNT", name="platform", create_type=False)
+
+
+def _counter_columns(suffix: str = ""):
+    return [
+        sa.Column(f"likes{suffix}", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(f"comments{suffix}", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(f"shares{suffix}", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(f"upvotes{suffix}", sa.Integer(), nullable=False, server_default="0"),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "engagement_rollup_variant_daily",
+        sa.Column("post_variant_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("post_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("platform", platform_enum, nullable=False),
+        *_counter_columns(),
+        *_counter_columns("_gained"),
+        sa.PrimaryKeyConstraint("post_variant_id", "day"),
+    )
+    op.create_table(
+        "engagement_rollup_post_daily",
+        sa.Column("post_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("platform", platform_enum, nullable=False),
+        *_counter_columns(),
+        sa.Column("active_variants", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("engagement_rate", sa.Float(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("post_id", "day"),
+    )
+    op.create_table(
+        "engagement_rollup_user_daily",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("platform", platform_enum, nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        *_counter_columns(),
+        sa.Column("active_variants", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("engagement_rate", sa.Float(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("user_id", "platform", "day"),
+    )
+    op.create_index(
+        "ix_engagement_rollup_variant_daily_post_id_day",
+        "engagement_rollup_variant_daily",
+        ["post_id", "day"],
+    )
+    op.create_index(
+        "ix_engagement_rollup_post_daily_user_id_platform_day",
+        "engagement_rollup_post_daily",
+        ["user_id", "platform", "day"],
+    )
+    op.create_index(
+        "ix_engagement_rollup_user_daily_user_id_day",
+        "engagement_rollup_user_daily",
+        ["user_id", "day"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_engagement_rollup_user_daily_user_id_day", table_name="engagement_rollup_user_daily")
+    op.drop_index("ix_engagement_rollup_post_daily_user_id_platform_day", table_name="engagement_rollup_post_daily")
+    op.drop_index("ix_engagement_rollup_variant_daily_post_id_day", table_name="engagement_rollup_variant_daily")
+    op.drop_table("engagement_rollup_user_daily")
+    op.drop_table("engagement_rollup_post_daily")
+    op.drop_table("engagement_rollup_variant_daily")
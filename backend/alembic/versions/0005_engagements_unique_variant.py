@@ -0,0 +1,58 @@
+"""make engagements one row per variant for bulk upserts
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # バリアントごとに最新の1行のみを残す（履歴は engagement_snapshots に保存される）
+    op.execute(
+        """
+        DELETE FROM engagements e
+        USING engagements newer
+        WHERE newer.post_variant_id = e.post_variant_id
+          AND (newer.captured_at, newer.id) > (e.captured_at, e.id)
+        """
+    )
+    with op.get_context().autocommit_block():
+        # INSERT ... ON CONFLICT (post_variant_id) の対象
+        op.create_index(
+            "uq_engagements_post_variant_id",
+            "engagements",
+            ["post_variant_id"],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        # 1バリアント1行になったため (post_variant_id, captured_at) の索引は一意索引と重複する
+        op.drop_index(
+            "ix_engagements_post_variant_id_captured_at",
+            table_name="engagements",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_engagements_post_variant_id_captured_at",
+            "engagements",
+            ["post_variant_id", "captured_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index("uq_engagements_post_variant_id", table_name="engagements", postgresql_concurrently=True, if_exists=True)
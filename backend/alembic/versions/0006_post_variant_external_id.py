@@ -0,0 +1,28 @@
+"""store platform post ID on published variants
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("post_variants", sa.Column("external_id", sa.String(), nullable=True))
+    op.add_column("post_variants", sa.Column("published_at", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("post_variants", "published_at")
+    op.drop_column("post_variants", "external_id")
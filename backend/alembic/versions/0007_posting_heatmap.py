@@ -0,0 +1,48 @@
+"""add posting heatmap tables
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# posts.platform と同じ列挙型を再利用する
+platform_enum = postgresql.ENUM("X", "REDDIT", "PRODUCTHUNT", name="platform", create_type=False)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "posting_heatmap_variants",
+        sa.Column("post_variant_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("platform", platform_enum, nullable=False),
+        sa.Column("hour_of_week", sa.SmallInteger(), nullable=False),
+        sa.Column("interactions", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("post_variant_id"),
+    )
+    op.create_table(
+        "posting_heatmap",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("platform", platform_enum, nullable=False),
+        sa.Column("hour_of_week", sa.SmallInteger(), nullable=False),
+        sa.Column("posts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("interactions", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("user_id", "platform", "hour_of_week"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("posting_heatmap")
+    op.drop_table("posting_heatmap_variants")
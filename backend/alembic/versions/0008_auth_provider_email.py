@@ -0,0 +1,28 @@
+"""add EMAIL to the auth provider enum
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Supabaseのメール・パスワード認証（app_metadata.provider = "email"）
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE authprovider ADD VALUE IF NOT EXISTS 'EMAIL'")
+
+
+def downgrade() -> None:
+    # PostgreSQLの列挙型から値は削除できないため、そのまま残す
+    pass
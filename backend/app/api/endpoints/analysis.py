@@ -1,15 +1,16 @@
 # backend/app/api/endpoints/analysis.py
 from fastapi import APIRouter, HTTPException, Query, Depends, status
-from typing import Any, Optional, List
+from fastapi.responses import StreamingResponse
+from typing import Any, Optional
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.db.session import get_async_db, get_async_read_db
 from app.schemas.analysis_schemas import (
     EngagementResponse, 
     EngagementFetchRequest, 
-    EngagementSummary,
-    PerformanceMetrics
+    PerformanceMetrics,
+    PostingHeatmapResponse
 )
 from app.services.analysis_service import (
     get_engagements, 
@@ -18,7 +19,11 @@ from app.services.analysis_service import (
     get_best_performing_variant
 )
 from app.services.auth_service import get_current_user
+from app.services.export_service import MEDIA_TYPES, export_service
+from app.services.posting_heatmap import posting_heatmap_service
+from app.services.response_cache import post_tag, response_cache, user_tag
 from app.schemas.user_schemas import User
+from app.models.post import Platform
 
 router = APIRouter()
 
@@ -27,8 +32,9 @@ async def get_post_engagements(
     post_id: int,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
+    include_stats: bool = Query(False, description="期間内のスナップショット数と増加量を含める"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ) -> Any:
     """
     指定した投稿のエンゲージメント結果を取得します。
@@ -37,20 +43,34 @@ async def get_post_engagements(
         post_id: 投稿ID
         start_date: フィルタリング開始日時（省略可）
         end_date: フィルタリング終了日時（省略可）
+        include_stats: 期間内の集計値を含めるかどうか
         current_user: 認証済みユーザー
-        db: データベースセッション
+        db: 非同期データベースセッション（読み取り専用レプリカを優先）
         
     Returns:
         EngagementResponse: エンゲージメント情報
     """
     try:
         # 投稿の所有者確認を追加すべき
-        data = await get_engagements(
-            post_id,
-            user_id=current_user.id,
-            db=db,
+        cache_key = response_cache.make_key(
+            "engagements",
+            current_user.id,
+            post_id=post_id,
             start_date=start_date,
-            end_date=end_date
+            end_date=end_date,
+            include_stats=include_stats
+        )
+        data = await response_cache.get_or_compute(
+            cache_key,
+            [post_tag(post_id)],
+            lambda: get_engagements(
+                post_id,
+                user_id=current_user.id,
+                db=db,
+                start_date=start_date,
+                end_date=end_date,
+                include_stats=include_stats
+            )
         )
         return data
     except ValueError as e:
@@ -68,7 +88,7 @@ async def get_post_engagements(
 async def fetch_latest_engagements_endpoint(
     request: EngagementFetchRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     最新のエンゲージメントデータをSNS APIから取得してDBに保存します。
@@ -76,13 +96,12 @@ async def fetch_latest_engagements_endpoint(
     Args:
         request: 取得対象の投稿ID
         current_user: 認証済みユーザー
-        db: データベースセッション
+        db: 非同期データベースセッション
         
     Returns:
-        dict: 更新状態
+        dict: 更新状態とバッチごとの更新件数
     """
     try:
-        # 投稿の所有者確認を追加すべき
         result = await fetch_latest_engagements(
             request.post_id,
             user_id=current_user.id,
@@ -105,7 +124,7 @@ async def get_performance_metrics_endpoint(
     platform: Optional[str] = Query(None, description="フィルタリングするプラットフォーム"),
     days: int = Query(30, description="過去何日分のデータを取得するか", ge=1, le=365),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ) -> Any:
     """
     ユーザーの投稿パフォーマンス全体を分析したメトリクスを提供します。
@@ -114,7 +133,7 @@ async def get_performance_metrics_endpoint(
         platform: 特定プラットフォームでフィルタリング（省略可）
         days: 取得期間（日数）
         current_user: 認証済みユーザー
-        db: データベースセッション
+        db: 非同期データベースセッション（読み取り専用レプリカを優先）
         
     Returns:
         PerformanceMetrics: パフォーマンス統計情報
@@ -123,26 +142,75 @@ async def get_performance_metrics_endpoint(
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days)
         
-        metrics = await get_performance_metrics(
-            user_id=current_user.id,
-            platform=platform,
-            start_date=start_date,
-            end_date=end_date,
-            db=db
+        # 期間は日数で指定されるため、キーには日数を使う（古さはTTLで制限）
+        cache_key = response_cache.make_key("performance", current_user.id, platform=platform, days=days)
+        metrics = await response_cache.get_or_compute(
+            cache_key,
+            [user_tag(current_user.id)],
+            lambda: get_performance_metrics(
+                user_id=current_user.id,
+                platform=platform,
+                start_date=start_date,
+                end_date=end_date,
+                db=db
+            )
         )
         return metrics
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"パフォーマンスメトリクス取得中にエラーが発生しました: {str(e)}"
         )
 
+@router.get("/best-times", response_model=PostingHeatmapResponse)
+async def get_best_posting_times(
+    platform: Optional[str] = Query(None, description="フィルタリングするプラットフォーム"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_read_db)
+) -> Any:
+    """
+    曜日・時間帯（UTCの週内時間）ごとのエンゲージメントのヒートマップを返します。
+    ヒートマップはスナップショット取り込み時に更新済みのため、履歴の走査は行いません。
+    
+    Args:
+        platform: 特定プラットフォームでフィルタリング（省略可）
+        current_user: 認証済みユーザー
+        db: 非同期データベースセッション（読み取り専用レプリカを優先）
+        
+    Returns:
+        PostingHeatmapResponse: プラットフォームごとのヒートマップと最適な時間帯
+    """
+    try:
+        platform_filter = Platform(platform.lower()) if platform else None
+        cache_key = response_cache.make_key("best_times", current_user.id, platform=platform_filter)
+
+        async def build() -> dict:
+            heatmap = await posting_heatmap_service.get_heatmap(db, current_user.id, platform_filter)
+            return {"timezone": "UTC", "platforms": heatmap}
+
+        return await response_cache.get_or_compute(cache_key, [user_tag(current_user.id)], build)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"投稿時間帯の取得中にエラーが発生しました: {str(e)}"
+        )
+
 @router.get("/best-variant/{post_id}", response_model=dict)
 async def get_best_variant(
     post_id: int,
     metric: str = Query("engagement_rate", description="最適化基準となるメトリック"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ) -> Any:
     """
     指定投稿の最も効果の高いバリエーションを特定します。
@@ -151,25 +219,19 @@ async def get_best_variant(
         post_id: 投稿ID
         metric: 評価基準（likes, comments, shares, engagement_rate など）
         current_user: 認証済みユーザー
-        db: データベースセッション
+        db: 非同期データベースセッション（読み取り専用レプリカを優先）
         
     Returns:
         dict: 最適バリエーション情報
     """
     try:
         # 投稿の所有者確認を追加すべき
-        result = await get_best_performing_variant(
-            post_id,
-            metric=metric,
-            user_id=current_user.id,
-            db=db
+        cache_key = response_cache.make_key("best_variant", current_user.id, post_id=post_id, metric=metric)
+        return await response_cache.get_or_compute(
+            cache_key,
+            [post_tag(post_id)],
+            lambda: _best_variant_response(post_id, metric, current_user.id, db)
         )
-        return {
-            "best_variant_id": result.variant_id,
-            "content": result.content,
-            "metric_value": result.metric_value,
-            "improvement_percentage": result.improvement_percentage  # 平均と比較した改善率
-        }
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -180,3 +242,77 @@ async def get_best_variant(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"最適バリエーション取得中にエラーが発生しました: {str(e)}"
         )
+
+async def _best_variant_response(post_id: int, metric: str, user_id: int, db: AsyncSession) -> dict:
+    """最適バリエーションのレスポンスを組み立てます。"""
+    result = await get_best_performing_variant(
+        post_id,
+        metric=metric,
+        user_id=user_id,
+        db=db
+    )
+    significance = result.significance
+    return {
+        "best_variant_id": result.variant_id,
+        "content": result.content,
+        "metric_value": result.metric_value,
+        "improvement_percentage": result.improvement_percentage,  # 平均と比較した改善率
+        "winner_probability": significance.winner_probabilities[result.variant_id],
+        "credible_level": significance.credible_level,
+        "variants": [
+            {
+                "variant_id": variant_id,
+                "metric_value": value,
+                "rate_per_hour": significance.posterior_rates[variant_id],
+                "credible_interval": significance.credible_intervals[variant_id],
+                "winner_probability": significance.winner_probabilities[variant_id]
+            }
+            for variant_id, value in result.values.items()
+        ]
+    }
+
+@router.get("/export/{dataset}")
+async def export_dataset(
+    dataset: str,
+    fmt: str = Query("ndjson", alias="format", description="出力形式（ndjson または csv）"),
+    gzip: bool = Query(False, description="gzip圧縮して出力する"),
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    current_user: User = Depends(get_current_user)
+) -> StreamingResponse:
+    """
+    投稿・バリエーション・エンゲージメント履歴をストリーミングでエクスポートします。
+    サーバーサイドカーソルで一定件数ずつ読み出すため、データ量にかかわらずメモリ使用量は一定です。
+    
+    Args:
+        dataset: posts, variants, engagements のいずれか
+        fmt: 出力形式（ndjson または csv）
+        gzip: gzip圧縮するかどうか
+        start_date: フィルタリング開始日時（省略可）
+        end_date: フィルタリング終了日時（省略可）
+        current_user: 認証済みユーザー
+        
+    Returns:
+        StreamingResponse: エクスポートデータ
+    """
+    try:
+        chunks = export_service.stream(
+            dataset,
+            user_id=current_user.id,
+            fmt=fmt,
+            compress=gzip,
+            start_date=start_date,
+            end_date=end_date
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    filename = f"{dataset}.{fmt}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        chunks,
+        media_type="application/gzip" if gzip else MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -3,30 +3,24 @@ from datetime import timedelta
 from typing import Any, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status, Body, Request
-from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
-from sqlalchemy.orm import Session
 import logging
 
 from app.core.config import settings
-from app.core.security import create_access_token, verify_supabase_token, get_password_hash
-from app.db.session import get_db
-from app.services.auth_service import get_current_user, authenticate_user, check_rate_limit
+from app.core.security import create_access_token, verify_supabase_token
+from app.services.auth_service import get_current_user, authenticate_user, oauth2_scheme, revoke_token
+from app.services.rate_limiter import rate_limiter
 from app.schemas.user_schemas import Token, TokenPayload, User, UserCreate
 
 # ロギング設定
 logger = logging.getLogger(__name__)
 
-# OAuthスキーム（トークン取得用）
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
-
 router = APIRouter()
 
 @router.post("/login", response_model=Token)
 async def login(
     request: Request,
-    token: str = Body(..., embed=True),
-    db: Session = Depends(get_db)
+    token: str = Body(..., embed=True)
 ) -> Any:
     """
     Supabase認証トークンを使用してログインします。
@@ -34,27 +28,34 @@ async def login(
     Args:
         request: リクエスト情報（レート制限に使用）
         token: SupabaseのOAuthトークン
-        db: データベースセッション
         
     Returns:
         Token: アクセストークン情報
     """
     # レート制限チェック（ブルートフォース攻撃対策）
     client_ip = request.client.host
-    if not check_rate_limit(client_ip, "login"):
+    limit = await rate_limiter.hit("login", client_ip)
+    if not limit.allowed:
         logger.warning(f"レート制限超過: {client_ip}")
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail="リクエスト数が多すぎます。しばらく待ってから再試行してください。",
+            headers=limit.headers(),
         )
     
     try:
         # Supabaseトークンを検証
         payload = verify_supabase_token(token)
+        if payload is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="無効なSupabaseトークンです",
+            )
         
         # ペイロードからユーザー情報を取得
         user_email = payload.get("email")
-        auth_provider = payload.get("provider", "email")
+        # Supabaseはプロバイダーを app_metadata.provider に設定する（メール・パスワード認証は "email"）
+        auth_provider = (payload.get("app_metadata") or {}).get("provider", "email")
         user_name = payload.get("name", "")
         
         if not user_email:
@@ -64,7 +65,7 @@ async def login(
             )
         
         # ユーザーをDBに登録または取得
-        user = authenticate_user(db, user_email, auth_provider, name=user_name)
+        user = await authenticate_user(user_email, auth_provider, name=user_name)
         
         # JWTトークンを生成
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -85,6 +86,14 @@ async def login(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="無効なSupabaseトークンです",
         )
+    except HTTPException:
+        # 既に HTTPException の場合はそのまま再送
+        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
     except Exception as e:
         logger.error(f"ログインエラー: {str(e)}")
         raise HTTPException(
@@ -109,22 +118,25 @@ async def read_users_me(
 
 @router.post("/logout")
 async def logout(
+    token: str = Depends(oauth2_scheme),
     current_user: User = Depends(get_current_user),
 ) -> dict:
     """
     ユーザーをログアウトします。
     
-    注: JWTベースの認証では実際のログアウトはクライアント側で行われます。
-    このエンドポイントは監査目的で提供されています。
+    使用中のアクセストークンを失効させるため、以降このトークンでのリクエストは拒否されます。
     
     Args:
+        token: 失効させるアクセストークン
         current_user: 現在のユーザー
         
     Returns:
         dict: ログアウト状態
     """
+    revoked = await revoke_token(token)
+    
     # 監査ログ
-    logger.info(f"ユーザーログアウト: {current_user.email}")
+    logger.info(f"ユーザーログアウト: {current_user.email}, トークン失効: {revoked}")
     
     # フロントエンドでJWTトークンを削除する指示を返す
     return {"status": "success", "message": "ログアウトしました"}
@@ -1,21 +1,69 @@
 # backend/app/api/endpoints/posts.py
-from fastapi import APIRouter, HTTPException, Depends, status
-from typing import Any
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, Depends, Query, status
+from typing import Any, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
-from app.schemas.post_schemas import PostCreate, PostResponse, ScheduleRequest
-from app.services.post_service import create_post_with_variants, schedule_post, publish_post
+from app.db.session import get_async_db, get_async_read_db
+from app.models.post import Platform, PostStatus
+from app.schemas.post_schemas import PostCreate, PostListResponse, PostResponse, PostSchedule
+from app.services.post_service import post_service
+from app.services.schedule_service import ScheduleService
 from app.services.auth_service import get_current_user
 from app.schemas.user_schemas import User
 
 router = APIRouter()
 
+@router.get("", response_model=PostListResponse)
+async def list_posts(
+    cursor: Optional[str] = Query(None, description="前ページのnext_cursor"),
+    limit: int = Query(20, ge=1, le=100, description="取得件数"),
+    platform: Optional[Platform] = Query(None, description="特定プラットフォームの投稿のみ取得"),
+    post_status: Optional[PostStatus] = Query(None, alias="status", description="特定ステータスの投稿のみ取得"),
+    include_engagement: bool = Query(False, description="各バリエーションの最新エンゲージメントを含める"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_read_db)
+) -> Any:
+    """
+    ユーザーの投稿一覧を新しい順に取得します（(created_at, id) によるキーセットページネーション）。
+    
+    Args:
+        cursor: 次ページ取得用カーソル（省略時は先頭ページ）
+        limit: 取得件数
+        platform: フィルタリングするプラットフォーム（省略可）
+        post_status: フィルタリングするステータス（省略可）
+        include_engagement: 最新エンゲージメントを含めるかどうか
+        current_user: 認証済みユーザー
+        db: 非同期データベースセッション（読み取り専用レプリカを優先）
+        
+    Returns:
+        PostListResponse: 投稿一覧と次ページのカーソル
+    """
+    try:
+        return await post_service.list_posts(
+            db,
+            user_id=current_user.id,
+            limit=limit,
+            cursor=cursor,
+            platform=platform,
+            status=post_status,
+            include_engagement=include_engagement,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"投稿一覧取得中にエラーが発生しました: {str(e)}",
+        )
+
 @router.post("/create", response_model=PostResponse, status_code=status.HTTP_201_CREATED)
 async def create_post(
     post: PostCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     新規投稿を作成し、GPT-4で複数の文案バリエーションを生成します。
@@ -29,7 +77,13 @@ async def create_post(
         PostResponse: 作成された投稿ID、バリエーション一覧
     """
     try:
-        result = await create_post_with_variants(post, user_id=current_user.id, db=db)
+        result = await post_service.create_post_with_variants(
+            db,
+            user_id=current_user.id,
+            platform=post.platform,
+            title=post.title,
+            keywords=post.keywords,
+        )
         return result
     except ValueError as e:
         raise HTTPException(
@@ -45,16 +99,16 @@ async def create_post(
 @router.post("/schedule/{post_id}", response_model=dict)
 async def schedule_post_endpoint(
     post_id: int, 
-    schedule_request: ScheduleRequest,
+    schedule_request: PostSchedule,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     投稿をスケジュールします。
     
     Args:
         post_id: スケジュールする投稿ID
-        schedule_request: スケジュール日時とバリエーションID
+        schedule_request: スケジュール日時（"auto" で最適な時刻を自動選択）とバリエーションID
         current_user: 認証済みユーザー
         db: データベースセッション
         
@@ -62,14 +116,19 @@ async def schedule_post_endpoint(
         dict: スケジュール状態とジョブID
     """
     try:
-        # 投稿の所有者確認を追加すべき
-        result = await schedule_post(
-            post_id, 
-            schedule_request.variant_id, 
+        result = await ScheduleService.schedule_post(
+            db,
+            post_id,
+            schedule_request.variant_id,
             schedule_request.scheduled_at,
             user_id=current_user.id,
-            db=db
         )
+        if result is None:
+            # 他のユーザーの投稿も存在しない投稿と同じく扱う
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"投稿ID {post_id} が見つかりません",
+            )
         return result
     except ValueError as e:
         raise HTTPException(
@@ -89,7 +148,7 @@ async def schedule_post_endpoint(
 async def publish_post_endpoint(
     post_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     投稿を即時公開します。
@@ -103,8 +162,7 @@ async def publish_post_endpoint(
         dict: 公開状態とSNSレスポンス
     """
     try:
-        # 投稿の所有者確認を追加すべき
-        result = await publish_post(post_id, user_id=current_user.id, db=db)
+        result = await post_service.publish_post(db, post_id, user_id=current_user.id)
         return result
     except ValueError as e:
         raise HTTPException(
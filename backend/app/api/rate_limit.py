@@ -0,0 +1,47 @@
+# backend/app/api/rate_limit.py
+from typing import Callable
+
+from fastapi import HTTPException, Request, Response, status
+
+from app.services.rate_limiter import rate_limiter
+from app.services.user_cache import user_cache
+
+
+def _client_ip(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+
+def rate_limit(route: str, per: str = "ip") -> Callable:
+    """
+    ルーターやエンドポイントに付与するレート制限の依存性関数を作成します。
+
+    例: api_router.include_router(router, dependencies=[Depends(rate_limit("analysis", per="user"))])
+
+    Args:
+        route: RATE_LIMIT_RULES のルール名（未定義の場合は default）
+        per: "ip" はクライアントIPごと、"user" は認証済みユーザーごとに制限
+             （トークンが未検証の場合はIPごと）
+
+    Returns:
+        Callable: 依存性関数
+    """
+    async def dependency(request: Request, response: Response) -> None:
+        identifier = None
+        if per == "user":
+            authorization = request.headers.get("Authorization", "")
+            if authorization.lower().startswith("bearer "):
+                # 検証済みトークンのみ対象。未検証のトークンでは制限を回避できないようIPに切り替える
+                verified = user_cache.get_token(authorization[7:])
+                identifier = f"user:{verified[0]}" if verified else None
+        identifier = identifier or f"ip:{_client_ip(request)}"
+
+        result = await rate_limiter.hit(route, identifier)
+        if not result.allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="リクエスト数が多すぎます。しばらく待ってから再試行してください。",
+                headers=result.headers(),
+            )
+        response.headers.update(result.headers())
+
+    return dependency
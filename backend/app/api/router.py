@@ -1,11 +1,18 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from app.api.endpoints import auth, posts, schedule, analysis
+from app.api.rate_limit import rate_limit
 
 # メインAPIルーター
 api_router = APIRouter()
 
 # 各エンドポイントモジュールをルーターに登録
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
-api_router.include_router(posts.router, prefix="/posts", tags=["posts"])
-api_router.include_router(schedule.router, prefix="/schedule", tags=["schedule"])
-api_router.include_router(analysis.router, prefix="/analysis", tags=["analysis"])
+api_router.include_router(
+    posts.router, prefix="/posts", tags=["posts"], dependencies=[Depends(rate_limit("posts", per="user"))]
+)
+api_router.include_router(
+    schedule.router, prefix="/schedule", tags=["schedule"], dependencies=[Depends(rate_limit("schedule", per="user"))]
+)
+api_router.include_router(
+    analysis.router, prefix="/analysis", tags=["analysis"], dependencies=[Depends(rate_limit("analysis", per="user"))]
+)
@@ -43,10 +43,31 @@ class Settings(BaseSettings):
             path=f"{values.data.get('POSTGRES_DB') or ''}",
         )
 
+    # Database connection pool settings
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # Seconds
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    DB_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))  # asyncpg prepared statements
+
+    # Read replica settings (optional)
+    SQLALCHEMY_REPLICA_DATABASE_URI: Optional[str] = os.getenv("SQLALCHEMY_REPLICA_DATABASE_URI")
+    REPLICA_MAX_LAG_SECONDS: float = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+    REPLICA_LAG_CHECK_INTERVAL: float = float(os.getenv("REPLICA_LAG_CHECK_INTERVAL", "10"))  # Seconds
+
     # Supabase settings
     SUPABASE_URL: str = os.getenv("SUPABASE_URL", "")
     SUPABASE_KEY: str = os.getenv("SUPABASE_KEY", "")
     SUPABASE_JWT_SECRET: str = os.getenv("SUPABASE_JWT_SECRET", "")
+    # Asymmetric signing keys; defaults to the project's JWKS endpoint
+    SUPABASE_JWKS_URL: str = os.getenv(
+        "SUPABASE_JWKS_URL",
+        f"{os.getenv('SUPABASE_URL', '').rstrip('/')}/auth/v1/.well-known/jwks.json" if os.getenv("SUPABASE_URL") else "",
+    )
+    SUPABASE_JWKS_REFRESH_INTERVAL: int = int(os.getenv("SUPABASE_JWKS_REFRESH_INTERVAL", "600"))  # Seconds
+    SUPABASE_JWT_AUDIENCE: str = os.getenv("SUPABASE_JWT_AUDIENCE", "authenticated")
+    SUPABASE_TOKEN_CACHE_SIZE: int = int(os.getenv("SUPABASE_TOKEN_CACHE_SIZE", "10000"))
     
     # Redis settings
     REDIS_HOST: str = os.getenv("REDIS_HOST", "localhost")
@@ -55,10 +76,13 @@ class Settings(BaseSettings):
     REDIS_DB: int = int(os.getenv("REDIS_DB", "0"))
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
     REDIS_QUEUE_NAME: str = "schedule_queue"
+    REDIS_MAX_CONNECTIONS: int = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+    REDIS_SOCKET_TIMEOUT: float = float(os.getenv("REDIS_SOCKET_TIMEOUT", "5"))
+    REDIS_HEALTH_CHECK_INTERVAL: int = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", "30"))
     
     # OpenAI settings
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
-    GPT_MODEL: str = "gpt-4"
+    GPT_MODEL: str = os.getenv("GPT_MODEL", "gpt-4")
     
     # Social Media API settings
     TWITTER_API_KEY: str = os.getenv("X_API_KEY", "")
@@ -79,8 +103,65 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
     
+    # Authenticated user cache settings
+    USER_CACHE_TTL: int = int(os.getenv("USER_CACHE_TTL", "60"))  # Seconds a resolved user is reused
+    USER_CACHE_SIZE: int = int(os.getenv("USER_CACHE_SIZE", "10000"))  # Entries per worker
+    USER_CACHE_REDIS_ENABLED: bool = os.getenv("USER_CACHE_REDIS_ENABLED", "true").lower() == "true"
+    
+    # Token revocation settings
+    REVOCATION_BLOOM_CAPACITY: int = int(os.getenv("REVOCATION_BLOOM_CAPACITY", "100000"))  # Revoked tokens alive at once
+    REVOCATION_BLOOM_ERROR_RATE: float = float(os.getenv("REVOCATION_BLOOM_ERROR_RATE", "0.001"))
+    REVOCATION_REBUILD_INTERVAL: int = int(os.getenv("REVOCATION_REBUILD_INTERVAL", "3600"))  # Seconds
+    REVOCATION_RECONNECT_MIN_DELAY: float = float(os.getenv("REVOCATION_RECONNECT_MIN_DELAY", "1"))  # Seconds
+    REVOCATION_RECONNECT_MAX_DELAY: float = float(os.getenv("REVOCATION_RECONNECT_MAX_DELAY", "60"))  # Seconds
+    
+    # Rate limit settings: "route=requests/seconds,..."; "default" applies to unlisted routes
+    RATE_LIMIT_RULES: str = os.getenv("RATE_LIMIT_RULES", "login=5/60,analysis=120/60,default=300/60")
+    RATE_LIMIT_REDIS_COOLDOWN: float = float(os.getenv("RATE_LIMIT_REDIS_COOLDOWN", "30"))  # Seconds on local limits after a Redis failure
+    
     # Scheduler settings
     SCHEDULER_INTERVAL: int = 60  # Seconds between scheduler job checks
+    SCHEDULER_METRICS_PORT: int = int(os.getenv("SCHEDULER_METRICS_PORT", "0"))  # Prometheus port of the scheduler worker; 0 disables
+    
+    # Engagement history settings
+    ENGAGEMENT_SNAPSHOT_BATCH_SIZE: int = int(os.getenv("ENGAGEMENT_SNAPSHOT_BATCH_SIZE", "500"))
+    ENGAGEMENT_SNAPSHOT_FLUSH_INTERVAL: float = float(os.getenv("ENGAGEMENT_SNAPSHOT_FLUSH_INTERVAL", "2"))  # Seconds
+    ENGAGEMENT_SNAPSHOT_MAX_RETRIES: int = int(os.getenv("ENGAGEMENT_SNAPSHOT_MAX_RETRIES", "3"))  # Failed flushes before a batch is dropped
+    ENGAGEMENT_UPSERT_BATCH_SIZE: int = int(os.getenv("ENGAGEMENT_UPSERT_BATCH_SIZE", "1000"))
+    ENGAGEMENT_PARTITIONS_AHEAD: int = int(os.getenv("ENGAGEMENT_PARTITIONS_AHEAD", "2"))  # Months
+    ENGAGEMENT_RAW_RETENTION_DAYS: int = int(os.getenv("ENGAGEMENT_RAW_RETENTION_DAYS", "30"))
+    ENGAGEMENT_HOURLY_RETENTION_DAYS: int = int(os.getenv("ENGAGEMENT_HOURLY_RETENTION_DAYS", "180"))
+    ENGAGEMENT_DAILY_RETENTION_DAYS: int = int(os.getenv("ENGAGEMENT_DAILY_RETENTION_DAYS", "730"))
+    ENGAGEMENT_MAINTENANCE_INTERVAL: int = int(os.getenv("ENGAGEMENT_MAINTENANCE_INTERVAL", "3600"))  # Seconds
+    
+    # Engagement poller settings
+    ENGAGEMENT_POLLER_ENABLED: bool = os.getenv("ENGAGEMENT_POLLER_ENABLED", "false").lower() == "true"  # Run inside the API process
+    ENGAGEMENT_POLL_MIN_INTERVAL: int = int(os.getenv("ENGAGEMENT_POLL_MIN_INTERVAL", "120"))  # Seconds
+    ENGAGEMENT_POLL_MAX_INTERVAL: int = int(os.getenv("ENGAGEMENT_POLL_MAX_INTERVAL", "21600"))  # Seconds
+    ENGAGEMENT_POLL_BACKOFF: float = float(os.getenv("ENGAGEMENT_POLL_BACKOFF", "2"))
+    ENGAGEMENT_POLL_MAX_AGE_DAYS: int = int(os.getenv("ENGAGEMENT_POLL_MAX_AGE_DAYS", "30"))
+    ENGAGEMENT_POLL_BATCH_SIZE: int = int(os.getenv("ENGAGEMENT_POLL_BATCH_SIZE", "100"))
+    ENGAGEMENT_POLL_SYNC_INTERVAL: int = int(os.getenv("ENGAGEMENT_POLL_SYNC_INTERVAL", "300"))  # Seconds
+    ENGAGEMENT_POLL_CONCURRENCY_X: int = int(os.getenv("ENGAGEMENT_POLL_CONCURRENCY_X", "4"))
+    ENGAGEMENT_POLL_CONCURRENCY_REDDIT: int = int(os.getenv("ENGAGEMENT_POLL_CONCURRENCY_REDDIT", "2"))
+    ENGAGEMENT_POLL_CONCURRENCY_PRODUCTHUNT: int = int(os.getenv("ENGAGEMENT_POLL_CONCURRENCY_PRODUCTHUNT", "1"))
+    
+    # Variant significance settings
+    AB_POSTERIOR_SAMPLES: int = int(os.getenv("AB_POSTERIOR_SAMPLES", "20000"))
+    AB_CREDIBLE_LEVEL: float = float(os.getenv("AB_CREDIBLE_LEVEL", "0.95"))
+    AB_RESULT_CACHE_SIZE: int = int(os.getenv("AB_RESULT_CACHE_SIZE", "1024"))  # Posts
+    
+    # Analysis response cache settings
+    RESPONSE_CACHE_ENABLED: bool = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+    RESPONSE_CACHE_TTL: int = int(os.getenv("RESPONSE_CACHE_TTL", "300"))  # Seconds
+    RESPONSE_CACHE_COMPRESS_MIN_BYTES: int = int(os.getenv("RESPONSE_CACHE_COMPRESS_MIN_BYTES", "1024"))
+    
+    # Posting time settings
+    POSTING_HEATMAP_MIN_POSTS: int = int(os.getenv("POSTING_HEATMAP_MIN_POSTS", "2"))  # Variants per slot before it is recommended
+    AUTO_SCHEDULE_MIN_LEAD_MINUTES: int = int(os.getenv("AUTO_SCHEDULE_MIN_LEAD_MINUTES", "5"))
+    
+    # Export settings
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))  # Rows fetched per server-side cursor round trip
     
     class Config:
         case_sensitive = True
@@ -0,0 +1,92 @@
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.core.config import settings
+from app.core.logger import app_logger
+
+
+class JWKSCache:
+    """
+    Local copy of an identity provider's JSON Web Key Set.
+
+    Keys are fetched in the background every refresh_interval seconds, so
+    verifying a token only needs a dictionary lookup by kid. An unknown kid
+    (e.g. right after key rotation) schedules an early refresh instead of
+    blocking the request on a network call.
+    """
+
+    def __init__(self, url: str, refresh_interval: float, min_refresh_gap: float = 30.0):
+        self.url = url
+        self.refresh_interval = refresh_interval
+        self.min_refresh_gap = min_refresh_gap
+        self.keys: Dict[str, Dict[str, Any]] = {}
+        self.fetched_at: Optional[float] = None
+        self._refresh_requested = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.url)
+
+    def get_key(self, kid: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Return the JWK for kid, requesting a refresh when it is unknown."""
+        key = self.keys.get(kid) if kid else None
+        if key is None and self.enabled:
+            self._refresh_requested.set()
+        return key
+
+    async def refresh(self) -> int:
+        """
+        Fetch the key set.
+
+        Returns:
+            Number of keys loaded
+        """
+        async with httpx.AsyncClient(timeout=5.0) as client:
+            response = await client.get(self.url)
+            response.raise_for_status()
+            jwks = response.json()
+        self.keys = {key["kid"]: key for key in jwks.get("keys", []) if "kid" in key}
+        self.fetched_at = time.monotonic()
+        return len(self.keys)
+
+    async def run(self) -> None:
+        """Refresh periodically, or early on request, until cancelled."""
+        while True:
+            try:
+                count = await self.refresh()
+                app_logger.debug(f"JWKS refreshed: {count} keys")
+            except Exception as e:
+                # Keep serving the previous keys
+                app_logger.error(f"JWKSの取得に失敗しました: {e}")
+
+            self._refresh_requested.clear()
+            try:
+                await asyncio.wait_for(self._refresh_requested.wait(), timeout=self.refresh_interval)
+                # Avoid hammering the provider with tokens signed by unknown keys
+                await asyncio.sleep(self.min_refresh_gap)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        """Start background refreshing on the running event loop."""
+        if self.enabled and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+supabase_jwks = JWKSCache(
+    url=settings.SUPABASE_JWKS_URL,
+    refresh_interval=settings.SUPABASE_JWKS_REFRESH_INTERVAL,
+)
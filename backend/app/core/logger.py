@@ -3,9 +3,8 @@ import logging
 from pathlib import Path
 from loguru import logger
 
-# ログファイルパス
+# ログファイルパス（ディレクトリは setup_logger の呼び出し時に作成）
 LOG_FILE_PATH = Path("logs/app.log")
-LOG_FILE_PATH.parent.mkdir(parents=True, exist_ok=True)
 
 # ログのフォーマット
 LOG_FORMAT = (
@@ -22,8 +21,20 @@ class InterceptHandler(logging.Handler):
         logger_opt = logger.opt(depth=6, exception=record.exc_info)
         logger_opt.log(record.levelno, record.getMessage())
 
+_configured = False
+
 # ロガー設定
 def setup_logger():
+    """
+    ログの出力先を設定します。インポート時には実行せず、
+    アプリケーションのlifespanや各ワーカーの起動時に一度だけ呼び出します。
+    """
+    global _configured
+    if _configured:
+        return logger
+    _configured = True
+
+    LOG_FILE_PATH.parent.mkdir(parents=True, exist_ok=True)
     # Loguruの設定
     logger.configure(
         handlers=[
@@ -42,7 +53,7 @@ def setup_logger():
     
     return logger
 
-# デフォルトロガーをエクスポート
-app_logger = setup_logger()
+# デフォルトロガーをエクスポート（出力先の設定前はLoguruの標準出力先に出力される）
+app_logger = logger
 # DevMarketerアプリケーション用のロガー
 logger = app_logger.bind(name="devmarketer")
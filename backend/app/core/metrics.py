@@ -0,0 +1,137 @@
+import os
+import time
+from typing import List, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.registry import Collector
+
+# 外部API・DB・Redisの呼び出しを想定したバケット（秒）
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# 投稿ジョブの実行遅延（秒）
+LATENESS_BUCKETS = (0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 900.0, 3600.0)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTPリクエストの処理時間（ルートのパステンプレートごと）",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "SQLクエリの実行時間（件数は _count）",
+    ["pool", "operation"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_QUERY_ERRORS = Counter(
+    "db_query_errors_total",
+    "エラーになったSQLクエリの件数",
+    ["pool"],
+)
+REDIS_COMMAND_DURATION = Histogram(
+    "redis_command_duration_seconds",
+    "Redisコマンドの実行時間（パイプラインは1往復をPIPELINEとして計測）",
+    ["client", "command"],
+    buckets=LATENCY_BUCKETS,
+)
+GPT_REQUEST_DURATION = Histogram(
+    "gpt_request_duration_seconds",
+    "GPT APIの呼び出し時間",
+    ["model", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+GPT_TOKENS = Counter(
+    "gpt_tokens_total",
+    "GPT APIで消費したトークン数",
+    ["model", "kind"],
+)
+PUBLISH_DURATION = Histogram(
+    "publish_duration_seconds",
+    "SNSプラットフォームへの投稿処理の時間と結果",
+    ["platform", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+SCHEDULER_QUEUE_DEPTH = Gauge(
+    "scheduler_queue_depth",
+    "スケジュールキューのジョブ数（pending: 実行待ち, scheduled: 予定時刻待ち）",
+    ["state"],
+    multiprocess_mode="max",
+)
+JOB_LATENESS = Histogram(
+    "scheduler_job_lateness_seconds",
+    "投稿ジョブの予定時刻から実行開始までの遅延",
+    buckets=LATENESS_BUCKETS,
+)
+
+# ルートに一致しなかったリクエストはラベルを1つにまとめる（ラベルの種類が増え続けないように）
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    ルートごとのリクエスト処理時間を記録するASGIミドルウェア
+    ラベルには実際のURLではなくルートのパステンプレート（/api/posts/{post_id} など）を使用します。
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.labels(
+                scope["method"],
+                getattr(route, "path", UNMATCHED_ROUTE),
+                str(status_code),
+            ).observe(time.perf_counter() - started)
+
+
+# スクレイプ時にプロセス内の値を出力するコレクター（マルチプロセスモードでも出力に含める）
+_PROCESS_COLLECTORS: List[Collector] = []
+
+
+def register_process_collector(collector: Collector) -> None:
+    """プロセス内の値を出力するコレクターを /metrics の出力に追加します。"""
+    REGISTRY.register(collector)
+    _PROCESS_COLLECTORS.append(collector)
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Prometheusのテキスト形式でメトリクスを出力します。
+    PROMETHEUS_MULTIPROC_DIR が設定されている場合は全ワーカープロセスの値を集計し、
+    register_process_collector() で登録したコレクターはスクレイプを処理したプロセスの値を出力します。
+
+    Returns:
+        Tuple[bytes, str]: 本文とContent-Type
+    """
+    registry = REGISTRY
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        for collector in _PROCESS_COLLECTORS:
+            registry.register(collector)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,40 @@
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+# numpy配列・numpyスカラー（分析系エンドポイント）と、int型のキーを持つdictをそのまま出力する
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any) -> Any:
+    """orjsonが直接扱えない型の変換（datetime / Enum / UUID / dataclass はorjsonが処理する）"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    APIレスポンス用にJSONのバイト列を作成します。
+
+    Args:
+        content: dict / list など（response_model のあるエンドポイントではFastAPIが変換済みの値）
+
+    Returns:
+        bytes: UTF-8のJSON
+    """
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    orjsonでシリアライズするJSONレスポンス（アプリケーションのデフォルトレスポンスクラス）
+    datetime は標準のレスポンスと同じくISO 8601形式、Enum（Platform, PostStatus など）は値で出力されます。
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
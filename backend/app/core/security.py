@@ -1,3 +1,5 @@
+import hashlib
+import uuid
 from datetime import datetime, timedelta
 from typing import Any, Dict, Optional
 
@@ -5,10 +7,20 @@ from jose import jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings
+from app.core.jwks import supabase_jwks
+from app.core.ttl_cache import TTLCache
 
 # パスワードハッシュのためのコンテキスト
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# JWKSで検証する非対称署名アルゴリズム
+ASYMMETRIC_ALGORITHMS = ("RS256", "ES256")
+
+# 検証済みSupabaseトークンのペイロード（トークンのハッシュをキーとし、expまで保持）
+_verified_supabase_tokens: TTLCache[Dict[str, Any]] = TTLCache(
+    settings.SUPABASE_TOKEN_CACHE_SIZE, ttl=float("inf")
+)
+
 def create_access_token(
     subject: str, expires_delta: Optional[timedelta] = None, additional_data: Dict[str, Any] = {}
 ) -> str:
@@ -28,8 +40,8 @@ def create_access_token(
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    # JWTペイロードを作成
-    to_encode = {"exp": expire, "sub": str(subject), **additional_data}
+    # JWTペイロードを作成（jtiは失効処理で使用するトークンID）
+    to_encode = {"exp": expire, "sub": str(subject), "jti": uuid.uuid4().hex, **additional_data}
     
     # JWTトークンをエンコード
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
@@ -58,19 +70,38 @@ def verify_supabase_token(token: str) -> Dict[str, Any]:
     """
     SupabaseのJWTトークンを検証します。
     
+    一度検証したトークンはハッシュをキーにexpまでキャッシュし、再送時は検証を省略します。
+    HS*はSUPABASE_JWT_SECRETで、非対称鍵（RS*/ES*）はバックグラウンドで取得済みのJWKSで検証します。
+    
     Args:
         token: 検証するSupabaseのJWTトークン
         
     Returns:
-        Dict[str, Any]: デコードされたトークンペイロード
-    
-    Raises:
-        jwt.JWTError: トークンが無効な場合
+        Dict[str, Any]: デコードされたトークンペイロード（無効な場合はNone）
     """
+    cache_key = hashlib.sha256(token.encode()).hexdigest()
+    payload = _verified_supabase_tokens.get(cache_key)
+    if payload is not None:
+        return payload
+
     try:
+        header = jwt.get_unverified_header(token)
+        algorithm = header.get("alg")
+        if algorithm == settings.ALGORITHM:
+            key: Any = settings.SUPABASE_JWT_SECRET
+        elif algorithm in ASYMMETRIC_ALGORITHMS:
+            key = supabase_jwks.get_key(header.get("kid"))
+            # 鍵に指定されたアルゴリズム以外での署名は受け付けない
+            if key is None or key.get("alg", algorithm) != algorithm:
+                return None
+        else:
+            return None
         payload = jwt.decode(
-            token, settings.SUPABASE_JWT_SECRET, algorithms=[settings.ALGORITHM]
+            token, key, algorithms=[algorithm], audience=settings.SUPABASE_JWT_AUDIENCE
         )
-        return payload
     except jwt.JWTError:
-        return None
\ No newline at end of file
+        return None
+
+    if "exp" in payload:
+        _verified_supabase_tokens.set(cache_key, payload, expires_at=float(payload["exp"]))
+    return payload
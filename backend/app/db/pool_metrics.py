@@ -0,0 +1,254 @@
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Type, Union
+
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from redis import BlockingConnectionPool
+from redis.asyncio import BlockingConnectionPool as AsyncBlockingConnectionPool
+from sqlalchemy import exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+
+from app.core.metrics import register_process_collector
+
+
+class PoolStats:
+    """接続プールの待機状況を記録するクラス"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.checked_out = 0
+        self.waiting = 0
+        self.wait_count = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self.timeouts = 0
+        self._lock = threading.Lock()
+
+    def begin_wait(self) -> float:
+        with self._lock:
+            self.waiting += 1
+        return time.perf_counter()
+
+    def end_wait(self, started: float, acquired: bool, timed_out: bool = False) -> None:
+        """待機の終了を記録します（接続の取得に失敗した場合や取り消された場合も必ず呼び出す）"""
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.waiting -= 1
+            self.wait_count += 1
+            self.wait_time_total += elapsed
+            self.wait_time_max = max(self.wait_time_max, elapsed)
+            if acquired:
+                self.checked_out += 1
+            elif timed_out:
+                self.timeouts += 1
+
+    def release(self) -> None:
+        with self._lock:
+            self.checked_out = max(self.checked_out - 1, 0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "checked_out": self.checked_out,
+                "waiting": self.waiting,
+                "wait_count": self.wait_count,
+                "wait_time_total": round(self.wait_time_total, 6),
+                "wait_time_avg": round(self.wait_time_total / self.wait_count, 6) if self.wait_count else 0.0,
+                "wait_time_max": round(self.wait_time_max, 6),
+                "timeouts": self.timeouts,
+            }
+
+
+# プール名 -> 統計情報
+_pool_stats: Dict[str, PoolStats] = {}
+# プール名 -> SQLAlchemyエンジン
+_engines: Dict[str, Engine] = {}
+# プール名 -> Redis接続プール
+_redis_pools: Dict[str, Union[BlockingConnectionPool, AsyncBlockingConnectionPool]] = {}
+
+
+def get_pool_stats(name: str) -> PoolStats:
+    """
+    指定した名前のプール統計を取得します（存在しない場合は作成）。
+
+    Args:
+        name: プール名
+
+    Returns:
+        PoolStats: プール統計
+    """
+    if name not in _pool_stats:
+        _pool_stats[name] = PoolStats(name)
+    return _pool_stats[name]
+
+
+def instrumented_pool_class(base: Type[Pool], name: str) -> Type[Pool]:
+    """
+    接続取得の待機時間を計測するSQLAlchemyプールクラスを生成します。
+
+    Args:
+        base: 元となるプールクラス（QueuePool, AsyncAdaptedQueuePool など）
+        name: メトリクス上のプール名
+
+    Returns:
+        Type[Pool]: 計測機能付きのプールクラス
+    """
+    stats = get_pool_stats(name)
+
+    class InstrumentedPool(base):
+        def _do_get(self):
+            started = stats.begin_wait()
+            acquired = timed_out = False
+            try:
+                conn = super()._do_get()
+                acquired = True
+                return conn
+            except exc.TimeoutError:
+                timed_out = True
+                raise
+            finally:
+                # 接続エラー（OperationalError など）でも待機数を戻す
+                stats.end_wait(started, acquired, timed_out)
+
+        def _do_return_conn(self, record):
+            stats.release()
+            super()._do_return_conn(record)
+
+    InstrumentedPool.__name__ = f"Instrumented{base.__name__}"
+    return InstrumentedPool
+
+
+class InstrumentedBlockingConnectionPool(BlockingConnectionPool):
+    """接続取得の待機時間を計測するRedis接続プール"""
+
+    def __init__(self, *args, metrics_name: str = "redis", **kwargs):
+        self.stats = get_pool_stats(metrics_name)
+        super().__init__(*args, **kwargs)
+
+    def get_connection(self, command_name, *keys, **options):
+        started = self.stats.begin_wait()
+        acquired = timed_out = False
+        try:
+            connection = super().get_connection(command_name, *keys, **options)
+            acquired = True
+            return connection
+        except Exception:
+            timed_out = True
+            raise
+        finally:
+            self.stats.end_wait(started, acquired, timed_out)
+
+    def release(self, connection):
+        self.stats.release()
+        super().release(connection)
+
+
+class InstrumentedAsyncBlockingConnectionPool(AsyncBlockingConnectionPool):
+    """接続取得の待機時間を計測する非同期Redis接続プール"""
+
+    def __init__(self, *args, metrics_name: str = "redis_async", **kwargs):
+        self.stats = get_pool_stats(metrics_name)
+        super().__init__(*args, **kwargs)
+
+    async def get_connection(self, command_name, *keys, **options):
+        started = self.stats.begin_wait()
+        acquired = timed_out = False
+        try:
+            connection = await super().get_connection(command_name, *keys, **options)
+            acquired = True
+            return connection
+        except Exception:
+            timed_out = True
+            raise
+        finally:
+            # タスクの取り消し（CancelledError）でも待機数を戻す
+            self.stats.end_wait(started, acquired, timed_out)
+
+    async def release(self, connection):
+        self.stats.release()
+        await super().release(connection)
+
+
+def register_engine(name: str, engine: Engine) -> None:
+    """メトリクス出力対象としてSQLAlchemyエンジンを登録します。"""
+    _engines[name] = engine
+
+
+def register_redis_pool(name: str, pool: Union[BlockingConnectionPool, AsyncBlockingConnectionPool]) -> None:
+    """メトリクス出力対象としてRedis接続プールを登録します。"""
+    _redis_pools[name] = pool
+
+
+def _engine_snapshot(name: str, engine: Engine) -> Dict[str, Any]:
+    pool = engine.pool
+    data: Dict[str, Any] = {"type": "postgres"}
+    data.update(get_pool_stats(name).snapshot())
+    # QueuePool系のみがサイズ情報を持つ（プール自身の値を優先）
+    for attr, key in (("size", "size"), ("checkedin", "checked_in"), ("checkedout", "checked_out"), ("overflow", "overflow")):
+        method = getattr(pool, attr, None)
+        if callable(method):
+            data[key] = method()
+    return data
+
+
+def _redis_snapshot(name: str, pool: Union[BlockingConnectionPool, AsyncBlockingConnectionPool]) -> Dict[str, Any]:
+    data: Dict[str, Any] = {
+        "type": "redis",
+        "size": pool.max_connections,
+    }
+    data.update(get_pool_stats(name).snapshot())
+    return data
+
+
+def get_pool_metrics(name: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    登録済みのすべての接続プールの現在の状態を取得します。
+
+    Args:
+        name: 特定のプールのみ取得する場合のプール名（省略可）
+
+    Returns:
+        Dict[str, Dict[str, Any]]: プール名ごとのメトリクス
+    """
+    metrics: Dict[str, Dict[str, Any]] = {}
+    for pool_name, engine in _engines.items():
+        if name is None or name == pool_name:
+            metrics[pool_name] = _engine_snapshot(pool_name, engine)
+    for pool_name, pool in _redis_pools.items():
+        if name is None or name == pool_name:
+            metrics[pool_name] = _redis_snapshot(pool_name, pool)
+    return metrics
+
+
+# Prometheus出力用: (get_pool_metrics のキー, メトリクス名, 説明, 累積値かどうか)
+_PROMETHEUS_FIELDS = (
+    ("size", "connection_pool_size", "プールの最大接続数（オーバーフローを除く）", False),
+    ("checked_out", "connection_pool_checked_out", "使用中の接続数", False),
+    ("overflow", "connection_pool_overflow", "オーバーフロー接続数", False),
+    ("waiting", "connection_pool_waiting", "接続の空きを待機中の数", False),
+    ("wait_count", "connection_pool_waits", "接続取得の回数", True),
+    ("wait_time_total", "connection_pool_wait_seconds", "接続取得の待機時間の合計", True),
+    ("timeouts", "connection_pool_timeouts", "接続取得のタイムアウト回数", True),
+)
+
+
+class PoolMetricsCollector:
+    """get_pool_metrics() の値をスクレイプ時にPrometheusのメトリクスとして出力するコレクター"""
+
+    def collect(self):
+        metrics = get_pool_metrics()
+        # マルチプロセスモードではワーカーごとに別のプールになるため、プロセスIDで区別する
+        pid = [str(os.getpid())] if os.getenv("PROMETHEUS_MULTIPROC_DIR") else []
+        labels = ["pool", "type"] + (["pid"] if pid else [])
+        for field, name, documentation, cumulative in _PROMETHEUS_FIELDS:
+            family_class = CounterMetricFamily if cumulative else GaugeMetricFamily
+            family = family_class(name, documentation, labels=labels)
+            for pool_name, data in metrics.items():
+                if field in data:
+                    family.add_metric([pool_name, data["type"]] + pid, data[field])
+            yield family
+
+
+register_process_collector(PoolMetricsCollector())
@@ -0,0 +1,70 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.logger import app_logger
+from app.db.redis_client import async_redis_client
+from app.db.session import get_async_engine, get_replica_async_engine, get_supabase_client
+
+# プライマリDBが使用できない場合はリクエストを処理できない
+REQUIRED_CLIENTS = ("postgres",)
+
+
+class ClientReadiness:
+    """
+    外部クライアント（DB / Redis / Supabase）のウォームアップと準備状況を管理するクラス
+    lifespanの開始時に各クライアントを並列に作成・接続確認し、結果を /health/ready で返します。
+    """
+
+    def __init__(self, timeout: float = 10.0):
+        self.timeout = timeout
+        self.status: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def ready(self) -> bool:
+        return all(self.status.get(name, {}).get("ready") for name in REQUIRED_CLIENTS)
+
+    async def _check(self, name: str, probe: Callable[[], Awaitable[Any]]) -> None:
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(probe(), timeout=self.timeout)
+            self.status[name] = {"ready": True, "error": None}
+        except Exception as e:
+            app_logger.error(f"{name} のウォームアップに失敗しました: {e}")
+            self.status[name] = {"ready": False, "error": str(e) or type(e).__name__}
+        self.status[name]["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+    async def warm_up(self) -> Dict[str, Dict[str, Any]]:
+        """
+        各クライアントを並列に作成し、最初の接続を確立します。
+        失敗しても例外は送出せず、状態として記録します（初回リクエスト時に再接続を試みる）。
+
+        Returns:
+            Dict[str, Dict[str, Any]]: クライアント名ごとの ready / error / latency_ms
+        """
+        probes = {
+            "postgres": lambda: _ping_async_engine(get_async_engine()),
+            "redis": lambda: async_redis_client.ping(),
+        }
+        if settings.SQLALCHEMY_REPLICA_DATABASE_URI:
+            probes["postgres_replica"] = lambda: _ping_async_engine(get_replica_async_engine())
+        if settings.SUPABASE_URL and settings.SUPABASE_KEY:
+            probes["supabase"] = lambda: asyncio.to_thread(get_supabase_client)
+
+        await asyncio.gather(*(self._check(name, probe) for name, probe in probes.items()))
+        app_logger.info(
+            "外部クライアントのウォームアップが完了しました: "
+            + ", ".join(f"{name}={'ok' if s['ready'] else 'NG'}({s['latency_ms']}ms)" for name, s in self.status.items())
+        )
+        return self.status
+
+
+async def _ping_async_engine(engine) -> None:
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+client_readiness = ClientReadiness()
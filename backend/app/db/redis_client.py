@@ -1,25 +1,120 @@
 import json
+import time
 from datetime import datetime
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
 import redis
-from rq import Queue
+import redis.asyncio as aioredis
 
 from app.core.config import settings
 from app.core.logger import app_logger
+from app.core.metrics import REDIS_COMMAND_DURATION
+from app.db.pool_metrics import (
+    InstrumentedAsyncBlockingConnectionPool,
+    InstrumentedBlockingConnectionPool,
+    register_redis_pool,
+)
+
+# コマンドごとの実行時間をメトリクスに記録するクライアント
+# パイプラインは送信から応答までの1往復を "PIPELINE" として記録する
+class InstrumentedRedis(redis.Redis):
+    def execute_command(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            return super().execute_command(*args, **options)
+        finally:
+            REDIS_COMMAND_DURATION.labels("sync", str(args[0]).upper()).observe(time.perf_counter() - started)
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        return InstrumentedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+class InstrumentedPipeline(redis.client.Pipeline):
+    def execute(self, raise_on_error=True):
+        started = time.perf_counter()
+        try:
+            return super().execute(raise_on_error)
+        finally:
+            REDIS_COMMAND_DURATION.labels("sync", "PIPELINE").observe(time.perf_counter() - started)
+
+class InstrumentedAsyncRedis(aioredis.Redis):
+    async def execute_command(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            REDIS_COMMAND_DURATION.labels("async", str(args[0]).upper()).observe(time.perf_counter() - started)
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        return InstrumentedAsyncPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+class InstrumentedAsyncPipeline(aioredis.client.Pipeline):
+    async def execute(self, raise_on_error=True):
+        started = time.perf_counter()
+        try:
+            return await super().execute(raise_on_error)
+        finally:
+            REDIS_COMMAND_DURATION.labels("async", "PIPELINE").observe(time.perf_counter() - started)
 
 # Redis接続クライアント
-try:
-    redis_client = redis.Redis.from_url(settings.REDIS_URL)
-    app_logger.info("Redisクライアントの初期化に成功しました。")
-    
-    # RQ Queueの初期化
-    schedule_queue = Queue(settings.REDIS_QUEUE_NAME, connection=redis_client)
+# 接続は初回のコマンド実行時に確立されるため、ここではネットワークアクセスは発生しない。
+# 到達性はlifespanのウォームアップで確認する。
+# 上限到達時はエラーではなくタイムアウトまで空き接続を待機する
+redis_pool = InstrumentedBlockingConnectionPool.from_url(
+    settings.REDIS_URL,
+    max_connections=settings.REDIS_MAX_CONNECTIONS,
+    timeout=settings.REDIS_SOCKET_TIMEOUT,
+    socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+    socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+    health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+    metrics_name="redis",
+)
+register_redis_pool("redis", redis_pool)
+redis_client = InstrumentedRedis(connection_pool=redis_pool)
+
+# 非同期Redis接続クライアント（サービス層・APIから使用し、イベントループをブロックしない）
+# hiredisがインストールされている場合、応答のパースには自動的にhiredisが使用される。
+# 複数のコマンドは async_redis_client.pipeline() でまとめて1往復で送信できる。
+# 同期クライアントはRQ（スケジュールキュー）のみが使用する。
+async_redis_pool = InstrumentedAsyncBlockingConnectionPool.from_url(
+    settings.REDIS_URL,
+    max_connections=settings.REDIS_MAX_CONNECTIONS,
+    timeout=settings.REDIS_SOCKET_TIMEOUT,
+    socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+    socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+    health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+    metrics_name="redis_async",
+)
+register_redis_pool("redis_async", async_redis_pool)
+async_redis_client = InstrumentedAsyncRedis(connection_pool=async_redis_pool)
+
+async def close_async_redis() -> None:
+    """非同期Redisの接続をすべて閉じます（lifespanの終了時に呼び出す）。"""
+    await async_redis_pool.disconnect()
+
+async def get_schedule_queue_depth() -> Dict[str, int]:
+    """
+    スケジュールキューのジョブ数を返します（/metrics のスクレイプ時に使用）。
+
+    Returns:
+        Dict[str, int]: pending（実行待ち）と scheduled（RQの予定時刻待ち）のジョブ数
+    """
+    async with async_redis_client.pipeline(transaction=False) as pipe:
+        # scheduler_loop が処理するリストと、RQのキュー・予定ジョブのレジストリ
+        pipe.llen("schedule_queue")
+        pipe.llen(f"rq:queue:{settings.REDIS_QUEUE_NAME}")
+        pipe.zcard(f"rq:scheduled:{settings.REDIS_QUEUE_NAME}")
+        listed, queued, scheduled = await pipe.execute()
+    return {"pending": listed + queued, "scheduled": scheduled}
+
+@lru_cache(maxsize=None)
+def get_schedule_queue():
+    """RQキューを返します（初回呼び出し時に作成）。"""
+    from rq import Queue
+
+    queue = Queue(settings.REDIS_QUEUE_NAME, connection=redis_client)
     app_logger.info(f"Redisキュー '{settings.REDIS_QUEUE_NAME}' の初期化に成功しました。")
-except Exception as e:
-    app_logger.error(f"Redisクライアントの初期化に失敗しました: {e}")
-    redis_client = None
-    schedule_queue = None
+    return queue
 
 class RedisScheduler:
     """Redisを使用したスケジュール管理クラス"""
@@ -57,7 +152,7 @@ class RedisScheduler:
         
         # ジョブをキューに追加
         # RQの遅延実行機能を使用
-        job = schedule_queue.enqueue_at(
+        job = get_schedule_queue().enqueue_at(
             scheduled_at,
             "app.tasks.scheduler.publish_post",
             job_data,
@@ -80,7 +175,7 @@ class RedisScheduler:
         """
         try:
             # ジョブを取得して削除
-            job = schedule_queue.fetch_job(job_id)
+            job = get_schedule_queue().fetch_job(job_id)
             if job:
                 job.cancel()
                 app_logger.info(f"ジョブをキャンセルしました: {job_id}")
@@ -101,11 +196,12 @@ class RedisScheduler:
         """
         try:
             # キュー内のすべてのジョブを取得
-            job_ids = schedule_queue.get_job_ids()
+            queue = get_schedule_queue()
+            job_ids = queue.get_job_ids()
             jobs = []
             
             for job_id in job_ids:
-                job = schedule_queue.fetch_job(job_id)
+                job = queue.fetch_job(job_id)
                 if job and not job.is_finished:
                     # ジョブがまだ終了していなければリストに追加
                     job_data = job.args[0] if job.args else {}
@@ -136,7 +232,7 @@ class RedisScheduler:
             Optional[Dict[str, Any]]: ジョブデータ、存在しない場合はNone
         """
         try:
-            job = schedule_queue.fetch_job(job_id)
+            job = get_schedule_queue().fetch_job(job_id)
             if job:
                 job_data = job.args[0] if job.args else {}
                 return {
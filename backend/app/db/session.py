@@ -1,39 +1,231 @@
-from sqlalchemy import create_engine
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
-from typing import Generator
+import asyncio
+import time
+from functools import lru_cache
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from typing import Any, Callable, Dict, Generator, Optional
 
 from app.core.config import settings
 from app.core.logger import app_logger
-from supabase import create_client
+from app.core.metrics import DB_QUERY_DURATION, DB_QUERY_ERRORS
+from app.db.pool_metrics import instrumented_pool_class, register_engine
 
-# SQLAlchemyのBaseクラス
-Base = declarative_base()
+# 外部クライアントはインポート時には作成せず、初回使用時（またはlifespanのウォームアップ時）に作成する
 
-# Supabaseクライアントの初期化
-try:
-    supabase_client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+@lru_cache(maxsize=None)
+def get_supabase_client():
+    """
+    Supabaseクライアントを返します（初回呼び出し時に作成）。
+
+    Raises:
+        Exception: クライアントを作成できない場合
+    """
+    from supabase import create_client
+
+    client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
     app_logger.info("Supabaseクライアントの初期化に成功しました。")
-except Exception as e:
-    app_logger.error(f"Supabaseクライアントの初期化に失敗しました: {e}")
-    supabase_client = None
-
-# 同期SQLAlchemyエンジン
-engine = create_engine(settings.DATABASE_URI, echo=False)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-# 非同期SQLAlchemyエンジン
-async_engine = create_async_engine(
-    str(settings.SQLALCHEMY_DATABASE_URI),
-    echo=False,
-    future=True,
+    return client
+
+def _pool_options() -> Dict[str, Any]:
+    """
+    Settingsから接続プールの設定を組み立てます。
+
+    Returns:
+        Dict[str, Any]: create_engine / create_async_engine に渡すプール設定
+    """
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+# メトリクスのラベルとして区別するSQLの種類（それ以外はOTHER）
+QUERY_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE"}
+
+def _instrument_queries(engine: Engine, name: str) -> None:
+    """
+    SQLの実行時間と件数をメトリクスに記録するイベントフックを登録します。
+
+    Args:
+        engine: 同期エンジン（非同期エンジンの場合は sync_engine）
+        name: メトリクス上のプール名
+    """
+    errors = DB_QUERY_ERRORS.labels(name)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context._query_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        # 操作の種類（SELECT / INSERT など）のみをラベルにする
+        operation = statement.lstrip()[:6].upper()
+        if operation not in QUERY_OPERATIONS:
+            operation = "OTHER"
+        DB_QUERY_DURATION.labels(name, operation).observe(time.perf_counter() - context._query_started)
+
+    @event.listens_for(engine, "handle_error")
+    def _error(exception_context):
+        errors.inc()
+
+@lru_cache(maxsize=None)
+def get_engine() -> Engine:
+    """同期SQLAlchemyエンジンを返します（初回呼び出し時に作成）。"""
+    # 非同期エンジンと同じ接続先を、同期ドライバ（psycopg2）で使う
+    url = make_url(str(settings.SQLALCHEMY_DATABASE_URI)).set(drivername="postgresql+psycopg2")
+    new_engine = create_engine(
+        url,
+        echo=False,
+        poolclass=instrumented_pool_class(QueuePool, "postgres_sync"),
+        **_pool_options(),
+    )
+    register_engine("postgres_sync", new_engine)
+    _instrument_queries(new_engine, "postgres_sync")
+    return new_engine
+
+def _create_async_engine(url: str, name: str) -> AsyncEngine:
+    """
+    プール設定とメトリクス計測を適用した非同期エンジンを作成します。
+
+    Args:
+        url: 接続先URL
+        name: メトリクス上のプール名
+
+    Returns:
+        AsyncEngine: 非同期SQLAlchemyエンジン
+    """
+    # PgBouncer(transaction mode)経由の場合はDB_STATEMENT_CACHE_SIZE=0でプリペアドステートメントを無効化する
+    new_engine = create_async_engine(
+        url,
+        echo=False,
+        future=True,
+        poolclass=instrumented_pool_class(AsyncAdaptedQueuePool, name),
+        connect_args={
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        },
+        **_pool_options(),
+    )
+    register_engine(name, new_engine.sync_engine)
+    _instrument_queries(new_engine.sync_engine, name)
+    return new_engine
+
+@lru_cache(maxsize=None)
+def get_async_engine() -> AsyncEngine:
+    """非同期SQLAlchemyエンジン（プライマリ）を返します（初回呼び出し時に作成）。"""
+    return _create_async_engine(str(settings.SQLALCHEMY_DATABASE_URI), "postgres")
+
+@lru_cache(maxsize=None)
+def get_replica_async_engine() -> Optional[AsyncEngine]:
+    """非同期SQLAlchemyエンジン（読み取り専用レプリカ）を返します。未設定の場合はNone。"""
+    if not settings.SQLALCHEMY_REPLICA_DATABASE_URI:
+        return None
+    return _create_async_engine(settings.SQLALCHEMY_REPLICA_DATABASE_URI, "postgres_replica")
+
+class LazySessionFactory:
+    """
+    初回呼び出し時にエンジンとsessionmakerを作成するセッションファクトリ
+    sessionmaker と同様に SessionLocal() でセッションを作成できます。
+    """
+
+    def __init__(self, build: Callable[[], sessionmaker]):
+        self._build = build
+        self._factory: Optional[sessionmaker] = None
+
+    def __call__(self, **kwargs):
+        if self._factory is None:
+            self._factory = self._build()
+        return self._factory(**kwargs)
+
+# 同期DBセッション
+SessionLocal = LazySessionFactory(
+    lambda: sessionmaker(autocommit=False, autoflush=False, bind=get_engine())
 )
-AsyncSessionLocal = sessionmaker(
-    async_engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False,
+
+def _async_sessionmaker(engine: AsyncEngine) -> sessionmaker:
+    return sessionmaker(
+        engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+    )
+
+# 非同期DBセッション（プライマリ）
+AsyncSessionLocal = LazySessionFactory(lambda: _async_sessionmaker(get_async_engine()))
+
+# 非同期DBセッション（読み取り専用レプリカ、設定時のみ）
+AsyncReplicaSessionLocal: Optional[LazySessionFactory] = None
+if settings.SQLALCHEMY_REPLICA_DATABASE_URI:
+    AsyncReplicaSessionLocal = LazySessionFactory(lambda: _async_sessionmaker(get_replica_async_engine()))
+
+# レプリカの遅延（秒）。プライマリに接続している場合は0とみなす
+REPLICA_LAG_SQL = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+    """
+)
+
+class ReplicaLagGuard:
+    """レプリカの遅延を定期的に確認し、読み取りに使用できるかを判定するクラス"""
+
+    def __init__(self, engine_getter: Callable[[], Optional[AsyncEngine]], max_lag: float, check_interval: float):
+        self.engine_getter = engine_getter
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.last_lag: Optional[float] = None
+        self._usable = False
+        self._checked_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    async def is_usable(self) -> bool:
+        """
+        レプリカが読み取りに使用できるかを返します。
+        遅延の確認はcheck_interval秒に1回のみ行い、それ以外はキャッシュした結果を返します。
+
+        Returns:
+            bool: 遅延が許容範囲内で接続可能な場合はTrue
+        """
+        engine = self.engine_getter()
+        if engine is None:
+            return False
+        if self._is_fresh():
+            return self._usable
+
+        async with self._lock:
+            # 待機中に他のリクエストが確認済みの場合はその結果を使う
+            if self._is_fresh():
+                return self._usable
+            try:
+                async with engine.connect() as conn:
+                    lag = (await conn.execute(REPLICA_LAG_SQL)).scalar()
+                self.last_lag = float(lag) if lag is not None else None
+                self._usable = self.last_lag is not None and self.last_lag <= self.max_lag
+                if not self._usable:
+                    app_logger.warning(f"レプリカの遅延が許容値を超えています。プライマリを使用します: {self.last_lag}s")
+            except Exception as e:
+                app_logger.error(f"レプリカの遅延確認に失敗しました。プライマリを使用します: {e}")
+                self.last_lag = None
+                self._usable = False
+            self._checked_at = time.monotonic()
+        return self._usable
+
+    def _is_fresh(self) -> bool:
+        return self._checked_at is not None and time.monotonic() - self._checked_at < self.check_interval
+
+replica_lag_guard = ReplicaLagGuard(
+    get_replica_async_engine,
+    max_lag=settings.REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.REPLICA_LAG_CHECK_INTERVAL,
 )
 
 # 同期DBセッション取得用の依存性関数
@@ -60,3 +252,32 @@ async def get_async_db() -> AsyncSession:
     """
     async with AsyncSessionLocal() as session:
         yield session
+
+async def get_read_session_factory():
+    """
+    読み取りに使用するセッションファクトリを返します。
+    レプリカが設定されていて遅延が許容範囲内であればレプリカ、そうでなければプライマリです。
+    レスポンス送信後もセッションを使うストリーミング処理では、依存性関数の代わりにこれを使用します。
+    
+    Returns:
+        sessionmaker: 非同期セッションファクトリ
+    """
+    if AsyncReplicaSessionLocal is not None and await replica_lag_guard.is_usable():
+        return AsyncReplicaSessionLocal
+    return AsyncSessionLocal
+
+# 読み取り専用の非同期DBセッション取得用の依存性関数
+async def get_async_read_db() -> AsyncSession:
+    """
+    読み取り専用エンドポイント向けの非同期DBセッションを取得するための依存性関数
+    
+    レプリカが設定されていて遅延が許容範囲内であればレプリカを、
+    そうでなければプライマリを使用します。書き込みや書き込み直後の読み取りには
+    get_async_db を使用してください。
+    
+    Returns:
+        AsyncSession: 非同期DBセッション
+    """
+    session_factory = await get_read_session_factory()
+    async with session_factory() as session:
+        yield session
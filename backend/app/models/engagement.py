@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -7,6 +7,10 @@ from app.models.base import Base, TimeStampedModel
 
 class Engagement(Base, TimeStampedModel):
     __tablename__ = "engagements"
+    __table_args__ = (
+        # Latest-state table: one row per variant (upsert target)
+        Index("uq_engagements_post_variant_id", "post_variant_id", unique=True),
+    )
 
     post_variant_id = Column(Integer, ForeignKey("post_variants.id"), nullable=False)
     likes = Column(Integer, default=0, nullable=False)
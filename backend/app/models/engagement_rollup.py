@@ -0,0 +1,88 @@
+from sqlalchemy import Column, Integer, BigInteger, SmallInteger, Date, Enum, Float, Index
+
+from app.models.base import Base
+from app.models.engagement_snapshot import EngagementCounts
+from app.models.post import Platform
+
+
+class EngagementRollupVariantDaily(Base, EngagementCounts):
+    """
+    Per-variant daily rollup.
+
+    likes/comments/shares/upvotes hold the cumulative counters at the end of
+    the day; the *_gained columns hold the increase over the previous day.
+    """
+    __tablename__ = "engagement_rollup_variant_daily"
+    __table_args__ = (
+        Index("ix_engagement_rollup_variant_daily_post_id_day", "post_id", "day"),
+    )
+
+    post_variant_id = Column(Integer, primary_key=True)
+    day = Column(Date, primary_key=True)
+    post_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, nullable=False)
+    platform = Column(Enum(Platform), nullable=False)
+    likes_gained = Column(Integer, default=0, nullable=False)
+    comments_gained = Column(Integer, default=0, nullable=False)
+    shares_gained = Column(Integer, default=0, nullable=False)
+    upvotes_gained = Column(Integer, default=0, nullable=False)
+
+
+class EngagementRollupPostDaily(Base, EngagementCounts):
+    """Per-post daily rollup; counters are the engagement gained that day across all variants."""
+    __tablename__ = "engagement_rollup_post_daily"
+    __table_args__ = (
+        Index("ix_engagement_rollup_post_daily_user_id_platform_day", "user_id", "platform", "day"),
+    )
+
+    post_id = Column(Integer, primary_key=True)
+    day = Column(Date, primary_key=True)
+    user_id = Column(Integer, nullable=False)
+    platform = Column(Enum(Platform), nullable=False)
+    active_variants = Column(Integer, default=0, nullable=False)
+    engagement_rate = Column(Float, default=0.0, nullable=False)
+
+
+class EngagementRollupUserDaily(Base, EngagementCounts):
+    """Per-user, per-platform daily rollup; counters are the engagement gained that day."""
+    __tablename__ = "engagement_rollup_user_daily"
+    __table_args__ = (
+        Index("ix_engagement_rollup_user_daily_user_id_day", "user_id", "day"),
+    )
+
+    user_id = Column(Integer, primary_key=True)
+    platform = Column(Enum(Platform), primary_key=True)
+    day = Column(Date, primary_key=True)
+    active_variants = Column(Integer, default=0, nullable=False)
+    engagement_rate = Column(Float, default=0.0, nullable=False)
+
+
+class PostingHeatmapVariant(Base):
+    """
+    Interactions already counted into the posting heatmap for each published variant.
+
+    Lets each new snapshot add only its increase to the heatmap cell.
+    """
+    __tablename__ = "posting_heatmap_variants"
+
+    post_variant_id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, nullable=False)
+    platform = Column(Enum(Platform), nullable=False)
+    hour_of_week = Column(SmallInteger, nullable=False)
+    interactions = Column(BigInteger, default=0, nullable=False)
+
+
+class PostingHeatmap(Base):
+    """
+    Engagement by publication hour of week (0 = Monday 00:00 UTC) per user and platform.
+
+    posts is the number of variants published in the slot and interactions
+    their total engagement so far.
+    """
+    __tablename__ = "posting_heatmap"
+
+    user_id = Column(Integer, primary_key=True)
+    platform = Column(Enum(Platform), primary_key=True)
+    hour_of_week = Column(SmallInteger, primary_key=True)
+    posts = Column(Integer, default=0, nullable=False)
+    interactions = Column(BigInteger, default=0, nullable=False)
@@ -0,0 +1,38 @@
+from sqlalchemy import Column, Integer, DateTime
+from datetime import datetime
+
+from app.models.base import Base
+
+
+class EngagementCounts:
+    """Cumulative engagement counters shared by the snapshot tables."""
+    likes = Column(Integer, default=0, nullable=False)
+    comments = Column(Integer, default=0, nullable=False)
+    shares = Column(Integer, default=0, nullable=False)  # RTs in Twitter
+    upvotes = Column(Integer, default=0, nullable=False)  # For Reddit, PH
+
+
+class EngagementSnapshot(Base, EngagementCounts):
+    """Append-only raw engagement readings, range-partitioned by month on captured_at."""
+    __tablename__ = "engagement_snapshots"
+    __table_args__ = {"postgresql_partition_by": "RANGE (captured_at)"}
+
+    post_variant_id = Column(Integer, primary_key=True)
+    captured_at = Column(DateTime, primary_key=True, default=datetime.utcnow)
+
+
+class EngagementSnapshotHourly(Base, EngagementCounts):
+    """Raw snapshots downsampled to the last reading per hour, partitioned by month."""
+    __tablename__ = "engagement_snapshots_hourly"
+    __table_args__ = {"postgresql_partition_by": "RANGE (bucket_start)"}
+
+    post_variant_id = Column(Integer, primary_key=True)
+    bucket_start = Column(DateTime, primary_key=True)
+
+
+class EngagementSnapshotDaily(Base, EngagementCounts):
+    """Hourly snapshots downsampled to the last reading per day."""
+    __tablename__ = "engagement_snapshots_daily"
+
+    post_variant_id = Column(Integer, primary_key=True)
+    bucket_start = Column(DateTime, primary_key=True)
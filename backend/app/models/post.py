@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime, Enum, Integer
+from sqlalchemy import Column, String, ForeignKey, DateTime, Enum, Integer, Index
 from sqlalchemy.orm import relationship
 import enum
 
@@ -20,6 +20,10 @@ class PostStatus(enum.Enum):
 
 class Post(Base, TimeStampedModel):
     __tablename__ = "posts"
+    __table_args__ = (
+        Index("ix_posts_user_id_status_scheduled_at", "user_id", "status", "scheduled_at"),
+        Index("ix_posts_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
 
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     platform = Column(Enum(Platform), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, Text
+from sqlalchemy import Column, Integer, ForeignKey, Text, String, DateTime
 from sqlalchemy.orm import relationship
 
 from app.models.base import Base, TimeStampedModel
@@ -7,8 +7,10 @@ from app.models.base import Base, TimeStampedModel
 class PostVariant(Base, TimeStampedModel):
     __tablename__ = "post_variants"
 
-    post_id = Column(Integer, ForeignKey("posts.id"), nullable=False)
+    post_id = Column(Integer, ForeignKey("posts.id"), nullable=False, index=True)
     content = Column(Text, nullable=False)
+    external_id = Column(String, nullable=True)  # Post ID returned by the platform on publish
+    published_at = Column(DateTime, nullable=True)
     
     # Relationships
     post = relationship("Post", back_populates="variants")
@@ -1,9 +1,10 @@
 from sqlalchemy import Column, Integer, String, DateTime, Enum, func
-from app.db.session import Base
+from app.models.base import Base
 import enum
 
 
 class AuthProvider(enum.Enum):
+    EMAIL = "email"
     GITHUB = "github"
     TWITTER = "twitter"
     GOOGLE = "google"
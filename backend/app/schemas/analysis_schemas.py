@@ -1,6 +1,14 @@
 from pydantic import BaseModel
-from typing import List, Optional
-from datetime import datetime
+from typing import Dict, List, Optional
+from datetime import date, datetime
+
+
+class EngagementSummary(BaseModel):
+    snapshot_count: int
+    likes_gained: int
+    comments_gained: int
+    shares_gained: int
+    upvotes_gained: int
 
 
 class VariantEngagement(BaseModel):
@@ -9,6 +17,8 @@ class VariantEngagement(BaseModel):
     comments: int
     shares: int
     upvotes: int
+    captured_at: Optional[datetime] = None
+    stats: Optional[EngagementSummary] = None
 
 
 class PostEngagementAnalysis(BaseModel):
@@ -16,10 +26,55 @@ class PostEngagementAnalysis(BaseModel):
     variants: List[VariantEngagement]
 
 
+class EngagementResponse(BaseModel):
+    post_id: int
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    variants: List[VariantEngagement]
+
+
 class EngagementFetchRequest(BaseModel):
     post_id: int
 
 
 class EngagementFetchResponse(BaseModel):
     status: str
-    updated_count: int
\ No newline at end of file
+    updated_count: int
+
+
+class DailyPerformance(BaseModel):
+    date: date
+    likes: int
+    comments: int
+    shares: int
+    upvotes: int
+    engagement_rate: float
+
+
+class PerformanceMetrics(BaseModel):
+    platform: Optional[str] = None
+    start_date: datetime
+    end_date: datetime
+    total_posts: int
+    total_likes: int
+    total_comments: int
+    total_shares: int
+    total_upvotes: int
+    engagement_rate: float
+    daily: List[DailyPerformance]
+
+class HeatmapCell(BaseModel):
+    hour_of_week: int  # 0 = 月曜 00:00 (UTC)
+    posts: int
+    interactions: int
+    avg_interactions: float
+
+
+class PlatformHeatmap(BaseModel):
+    best_hour_of_week: Optional[int] = None
+    cells: List[HeatmapCell]
+
+
+class PostingHeatmapResponse(BaseModel):
+    timezone: str = "UTC"
+    platforms: Dict[str, PlatformHeatmap]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import List, Literal, Optional, Union
 from datetime import datetime
 from app.models.post import Platform, PostStatus
 
@@ -38,7 +38,8 @@ class PostCreate(PostBase):
 
 
 class PostSchedule(BaseModel):
-    scheduled_at: datetime
+    # "auto" はユーザーの投稿時間ヒートマップから次の最適な時刻を選ぶ
+    scheduled_at: Union[datetime, Literal["auto"]]
     variant_id: int
 
 
@@ -58,6 +59,44 @@ class Post(PostInDB):
     variants: List[PostVariant] = []
 
 
+class VariantEngagementStats(BaseModel):
+    likes: int
+    comments: int
+    shares: int
+    upvotes: int
+    captured_at: datetime
+
+
+class PostListVariant(BaseModel):
+    id: int
+    content: str
+    created_at: datetime
+    latest_engagement: Optional[VariantEngagementStats] = None
+
+
+class PostListItem(BaseModel):
+    id: int
+    user_id: int
+    platform: Platform
+    status: PostStatus
+    scheduled_at: Optional[datetime] = None
+    created_at: datetime
+    updated_at: datetime
+    variants: List[PostListVariant] = []
+
+
+class PostResponse(BaseModel):
+    post_id: int
+    platform: Platform
+    created_at: datetime
+    variants: List[PostListVariant] = []
+
+
+class PostListResponse(BaseModel):
+    items: List[PostListItem]
+    next_cursor: Optional[str] = None
+
+
 class PublishResponse(BaseModel):
     status: str
     sns_response: dict
\ No newline at end of file
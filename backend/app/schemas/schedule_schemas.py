@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime
+from app.models.post import Platform
 
 
 class ScheduleJob(BaseModel):
@@ -20,4 +21,20 @@ class ScheduleJobsList(BaseModel):
 
 
 class ScheduleJobCancel(BaseModel):
-    status: str
\ No newline at end of file
+    status: str
+
+
+class JobResponse(BaseModel):
+    job_id: str
+    post_id: int
+    variant_id: int
+    platform: Platform
+    scheduled_at: Optional[datetime] = None
+
+
+class JobDetail(JobResponse):
+    status: str
+
+
+class BulkJobIds(BaseModel):
+    ids: List[str]
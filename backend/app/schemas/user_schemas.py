@@ -29,4 +29,14 @@ class UserInDB(UserBase):
 
 class User(UserInDB):
     """User schema to return to client"""
-    pass
\ No newline at end of file
+    pass
+
+
+class Token(BaseModel):
+    access_token: str
+    token_type: str
+
+
+class TokenPayload(BaseModel):
+    sub: Optional[int] = None
+    exp: Optional[int] = None
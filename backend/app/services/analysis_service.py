@@ -1,79 +1,240 @@
 # backend/app/services/analysis_service.py
-import random
-from sqlalchemy.orm import Session
-from app.db.session import SessionLocal
-from app.models.engagement import Engagement
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import Row, func, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.post_variant import PostVariant
-from app.models.post import Post
+from app.models.post import Post, Platform
+from app.services.engagement_ingest import engagement_ingest_service
+from app.services.engagement_analytics import VariantComparison, engagement_analytics, engagement_history_query
+from app.services.engagement_rollup import COUNTERS, engagement_rollup_service
+from app.services.platform_engagement import platform_engagement_service
+from app.services.variant_significance import variant_significance
 
-async def get_engagements(post_id: int) -> dict:
+async def get_engagements(
+    post_id: int,
+    user_id: int,
+    db: AsyncSession,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    include_stats: bool = False
+) -> dict:
     """
-    指定投稿の各バリエーションについて、DB 内のエンゲージメントデータ（likes, comments, shares, upvotes）を集計して返す。
+    指定投稿の各バリエーションについて、期間内の最新エンゲージメントスナップショットを返す。
+    include_stats が True の場合は期間内のスナップショット数と増加量も含める。
+    生データの保持期間を過ぎた投稿は、集約済みのスナップショットと engagements の最新値から返す。
+    バリエーション数に関わらずクエリは1回のみ発行する。
     """
-    db: Session = SessionLocal()
-    try:
-        post = db.query(Post).filter(Post.id == post_id).first()
-        if not post:
-            return {"error": "Post not found"}
-        
-        variants = db.query(PostVariant).filter(PostVariant.post_id == post_id).all()
-        result = {"post_id": post_id, "variants": []}
-        for variant in variants:
-            engagement = db.query(Engagement).filter(Engagement.post_variant_id == variant.id).first()
-            if engagement:
-                result["variants"].append({
-                    "variant_id": variant.id,
-                    "likes": engagement.likes,
-                    "comments": engagement.comments,
-                    "shares": engagement.shares,
-                    "upvotes": engagement.upvotes
-                })
-            else:
-                result["variants"].append({
-                    "variant_id": variant.id,
-                    "likes": 0,
-                    "comments": 0,
-                    "shares": 0,
-                    "upvotes": 0
-                })
-    finally:
-        db.close()
+    def window(history):
+        conditions = [history.c.post_variant_id == PostVariant.id]
+        if start_date is not None:
+            conditions.append(history.c.captured_at >= start_date)
+        if end_date is not None:
+            conditions.append(history.c.captured_at <= end_date)
+        return conditions
+
+    # バリエーションごとの期間内最新値（各テーブルの PK (post_variant_id, 時刻) を逆順に1件）
+    history = engagement_history_query(include_latest=True)
+    latest = (
+        select(*[history.c[c] for c in COUNTERS], history.c.captured_at)
+        .where(*window(history))
+        .order_by(history.c.captured_at.desc())
+        .limit(1)
+        .lateral("latest")
+    )
+    columns = [PostVariant.id.label("variant_id"), *[latest.c[c] for c in COUNTERS], latest.c.captured_at]
+    stmt = (
+        select(Post.id)
+        .outerjoin(PostVariant, PostVariant.post_id == Post.id)
+        .outerjoin(latest, true())
+    )
+
+    if include_stats:
+        # 累積値のため、期間内の増加量は最大値と最小値の差になる
+        snapshots = engagement_history_query()
+        stats = (
+            select(
+                func.count().label("snapshot_count"),
+                *[(func.max(snapshots.c[c]) - func.min(snapshots.c[c])).label(f"{c}_gained") for c in COUNTERS]
+            )
+            .where(*window(snapshots))
+            .lateral("stats")
+        )
+        columns += [stats.c.snapshot_count, *[stats.c[f"{c}_gained"] for c in COUNTERS]]
+        stmt = stmt.outerjoin(stats, true())
+
+    stmt = (
+        stmt.add_columns(*columns)
+        .where(Post.id == post_id, Post.user_id == user_id)
+        .order_by(PostVariant.id)
+    )
+    rows = (await db.execute(stmt)).all()
+    if not rows:
+        raise ValueError(f"Post with ID {post_id} not found")
+
+    variants = []
+    for row in rows:
+        if row.variant_id is None:
+            # バリエーションが存在しない投稿
+            continue
+        variant = {
+            "variant_id": row.variant_id,
+            **{c: getattr(row, c) or 0 for c in COUNTERS},
+            "captured_at": row.captured_at
+        }
+        if include_stats:
+            variant["stats"] = {
+                "snapshot_count": row.snapshot_count,
+                **{f"{c}_gained": getattr(row, f"{c}_gained") or 0 for c in COUNTERS}
+            }
+        variants.append(variant)
+
+    return {
+        "post_id": post_id,
+        "start_date": start_date,
+        "end_date": end_date,
+        "variants": variants
+    }
+
+async def _fetch_platform_engagements(variants: List[Row]) -> List[dict]:
+    """
+    SNS API から各バリエーションの最新エンゲージメントデータを取得する。
+    公開時に保存した外部投稿IDをプラットフォームごとにまとめ、一括取得APIで問い合わせる。
+    """
+    captured_at = datetime.utcnow()
+    by_platform: dict = {}
+    for variant in variants:
+        by_platform.setdefault(variant.platform, []).append(variant)
+
+    readings = []
+    for platform, platform_variants in by_platform.items():
+        engagements = await platform_engagement_service.fetch_engagements(
+            platform,
+            [variant.external_id for variant in platform_variants]
+        )
+        for variant in platform_variants:
+            counters = engagements.get(variant.external_id)
+            if counters is None:
+                continue
+            readings.append({
+                "post_variant_id": variant.id,
+                **{c: counters.get(c, 0) for c in COUNTERS},
+                "captured_at": captured_at
+            })
+    return readings
+
+async def fetch_latest_engagements_for_posts(
+    post_ids: List[int],
+    db: AsyncSession,
+    user_id: Optional[int] = None
+) -> dict:
+    """
+    複数投稿の公開済みバリエーションについて最新のエンゲージメントデータを取得し、
+    一括アップサートでDBに保存する。投稿数に関わらずDBへの往復はバッチ数分のみ。
+    """
+    stmt = (
+        select(PostVariant.id, PostVariant.post_id, PostVariant.external_id, Post.platform)
+        .join(Post, Post.id == PostVariant.post_id)
+        .where(Post.id.in_(post_ids), PostVariant.external_id.is_not(None))
+    )
+    if user_id is not None:
+        stmt = stmt.where(Post.user_id == user_id)
+    variants = (await db.execute(stmt)).all()
+    if not variants:
+        raise ValueError("No published variants found for post")
+
+    readings = await _fetch_platform_engagements(variants)
+    result = await engagement_ingest_service.upsert_engagements(db, readings)
+
+    # 投稿ごとの総インタラクション数（ポーラーがエンゲージメント速度の算出に使用）
+    post_by_variant = {variant.id: variant.post_id for variant in variants}
+    post_totals: dict = {}
+    for reading in readings:
+        post_id = post_by_variant[reading["post_variant_id"]]
+        post_totals[post_id] = post_totals.get(post_id, 0) + sum(reading[c] for c in COUNTERS)
+    result["post_totals"] = post_totals
     return result
 
-async def fetch_latest_engagements(post_id: int) -> dict:
+async def fetch_latest_engagements(post_id: int, user_id: int, db: AsyncSession) -> dict:
     """
-    SNS API から最新のエンゲージメントデータを（ダミー値として）取得し、DB のエンゲージメントレコードを更新する。
-    ※実際の実装では、外部 API との連携により動的な値を取得する。
+    指定投稿の全バリエーションについて最新のエンゲージメントデータを取得し、DB を更新する。
     """
-    db: Session = SessionLocal()
-    try:
-        variant = db.query(PostVariant).filter(PostVariant.post_id == post_id).first()
-        if not variant:
-            return {"error": "No variants found for post"}
-        
-        # ダミーのエンゲージメント数（ランダム値を生成）
-        likes = random.randint(0, 100)
-        comments = random.randint(0, 50)
-        shares = random.randint(0, 20)
-        upvotes = random.randint(0, 100)
-        
-        engagement = db.query(Engagement).filter(Engagement.post_variant_id == variant.id).first()
-        if not engagement:
-            from app.models.engagement import Engagement
-            engagement = Engagement(
-                post_variant_id=variant.id,
-                likes=likes,
-                comments=comments,
-                shares=shares,
-                upvotes=upvotes
-            )
-            db.add(engagement)
-        else:
-            engagement.likes = likes
-            engagement.comments = comments
-            engagement.shares = shares
-            engagement.upvotes = upvotes
-        db.commit()
-    finally:
-        db.close()
-    return {"status": "success", "updated_count": 1}
\ No newline at end of file
+    return await fetch_latest_engagements_for_posts([post_id], db=db, user_id=user_id)
+
+async def get_performance_metrics(
+    user_id: int,
+    db: AsyncSession,
+    start_date: datetime,
+    end_date: datetime,
+    platform: Optional[str] = None
+) -> dict:
+    """
+    ユーザーの期間内パフォーマンスを日次ロールアップテーブルから集計して返す。
+    生のエンゲージメント行は参照しないため、期間が365日でもデータ量に依存せず一定時間で応答する。
+    """
+    platform_filter = Platform(platform.lower()) if platform else None
+
+    daily_rows = await engagement_rollup_service.get_user_daily_series(
+        db,
+        user_id=user_id,
+        start_date=start_date.date(),
+        end_date=end_date.date(),
+        platform=platform_filter
+    )
+
+    stmt = select(func.count()).select_from(Post).where(
+        Post.user_id == user_id,
+        Post.created_at >= start_date,
+        Post.created_at <= end_date
+    )
+    if platform_filter is not None:
+        stmt = stmt.where(Post.platform == platform_filter)
+    total_posts = (await db.execute(stmt)).scalar_one()
+
+    summary = engagement_analytics.summarize_daily(daily_rows)
+
+    return {
+        "platform": platform_filter.value if platform_filter else None,
+        "start_date": start_date,
+        "end_date": end_date,
+        "total_posts": total_posts,
+        **{f"total_{c}": summary["totals"][c] for c in COUNTERS},
+        "engagement_rate": summary["engagement_rate"],
+        "daily": [
+            {
+                "date": row["day"],
+                **{c: row[c] for c in COUNTERS},
+                "engagement_rate": rate
+            }
+            for row, rate in zip(daily_rows, summary["daily_rates"])
+        ]
+    }
+
+async def get_best_performing_variant(
+    post_id: int,
+    user_id: int,
+    db: AsyncSession,
+    metric: str = "engagement_rate"
+) -> VariantComparison:
+    """
+    指定投稿のバリエーションのうち、指定メトリックの最新値が最も高いものを返す。
+    各バリエーションの勝率と信用区間をベイズ推定で付与し、結果は新しい
+    スナップショットが届くまで投稿ごとにキャッシュされる。
+    """
+    stmt = (
+        select(PostVariant.id, PostVariant.content, PostVariant.published_at)
+        .join(Post, Post.id == PostVariant.post_id)
+        .where(Post.id == post_id, Post.user_id == user_id)
+    )
+    rows = (await db.execute(stmt)).all()
+    if not rows:
+        raise ValueError(f"Post with ID {post_id} not found")
+
+    comparison = await variant_significance.evaluate(
+        db, post_id, metric, {row.id: row.published_at for row in rows}
+    )
+    if comparison is None:
+        raise ValueError(f"No engagement data for post ID {post_id}")
+
+    comparison.content = next(row.content for row in rows if row.id == comparison.variant_id)
+    return comparison
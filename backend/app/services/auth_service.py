@@ -1,44 +1,128 @@
 # backend/app/services/auth_service.py
-from sqlalchemy.orm import Session
-from app.core.security import create_jwt_token, verify_jwt_token
-from app.models.user import User as UserModel
+from fastapi import Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.future import select
+from app.core.security import verify_token
+from app.models.user import AuthProvider, User as UserModel
 from app.schemas.user_schemas import User
-from app.db.session import SessionLocal
+from app.db.session import AsyncSessionLocal
+from app.services.rate_limiter import rate_limiter
+from app.services.token_revocation import token_revocation
+from app.services.user_cache import user_cache
 
-async def authenticate_user(supabase_token: str) -> User | None:
-    """
-    Supabase から受け取ったトークンを元にユーザーを認証する。
-    本サンプルでは、トークンが "valid" の場合にユーザー情報を取得または新規作成し、Pydantic の User を返す。
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
+
+async def authenticate_user(email: str, auth_provider: str, name: str | None = None) -> User:
     """
-    if supabase_token != "valid":
-        return None
+    ログインしたユーザーを登録または取得する。
+    INSERT ... ON CONFLICT (email) DO UPDATE ... RETURNING の1文で行うため、
+    初回ログインが同時に発生しても重複ユーザーは作成されない。
+    既存ユーザーの認証プロバイダーは変更せず、名前が指定された場合のみ更新する。
 
-    db: Session = SessionLocal()
+    Raises:
+        ValueError: 未対応の認証プロバイダーの場合
+    """
     try:
-        # 実際はトークンからメール等のユーザー情報を抽出して検索する
-        user_obj = db.query(UserModel).filter(UserModel.email == "user@example.com").first()
-        if not user_obj:
-            user_obj = UserModel(email="user@example.com", name="Test User", auth_provider="supabase")
-            db.add(user_obj)
-            db.commit()
-            db.refresh(user_obj)
-        return User.from_orm(user_obj)
-    finally:
-        db.close()
+        provider = AuthProvider(auth_provider)
+    except ValueError:
+        raise ValueError(f"Unsupported auth provider: {auth_provider}")
 
-async def get_user_from_token(token: str) -> User | None:
+    stmt = pg_insert(UserModel).values(email=email, name=name or None, auth_provider=provider)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[UserModel.email],
+        set_={
+            "name": func.coalesce(stmt.excluded.name, UserModel.name),
+            "updated_at": func.now(),
+        },
+    ).returning(UserModel)
+
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(stmt, execution_options={"populate_existing": True})
+        user = User.model_validate(result.scalar_one())
+        await db.commit()
+
+    await user_cache.invalidate(user.id)
+    return user
+
+async def check_rate_limit(identifier: str, route: str) -> bool:
+    """
+    レート制限の範囲内かどうかを返す（全ワーカー共通のカウント）。
+    Retry-After ヘッダーが必要な場合は rate_limiter.hit の結果を使用する。
+    """
+    return (await rate_limiter.hit(route, identifier)).allowed
+
+def _verify_claims(token: str) -> tuple | None:
     """
-    JWT トークンを検証し、該当するユーザー情報をデータベースから取得する。
+    トークンを検証し (sub, jti, exp) を返す（検証済みのトークンはキャッシュから返す）。
+    sub が数値でない、exp が無いなど必須クレームが不正なトークンは、署名が無効な場合と同じく None を返す。
     """
-    payload = verify_jwt_token(token)
+    verified = user_cache.get_token(token)
+    if verified is not None:
+        return verified
+    payload = verify_token(token)
     if payload is None:
         return None
-    user_id = payload.get("user_id")
-    db: Session = SessionLocal()
     try:
-        user_obj = db.query(UserModel).filter(UserModel.id == user_id).first()
-        if user_obj:
-            return User.from_orm(user_obj)
+        subject = str(int(payload["sub"]))
+        verified = (subject, payload.get("jti"), float(payload["exp"]))
+    except (KeyError, TypeError, ValueError):
+        return None
+    user_cache.set_token(token, *verified)
+    return verified
+
+async def get_user_from_token(token: str) -> User | None:
+    """
+    JWT トークンを検証し、該当するユーザー情報を返す。
+    検証済みトークンとユーザーはキャッシュされるため、通常はJWTのデコードもDBアクセスも行わない。
+    トークンのキャッシュは exp までしか保持されないので、期限切れのトークンは再検証で拒否される。
+    失効済みトークンの確認はローカルのBloomフィルタで行う。
+    """
+    verified = _verify_claims(token)
+    if verified is None:
+        return None
+    subject, jti, _ = verified
+    if await token_revocation.is_revoked(jti):
+        return None
+
+    user = await user_cache.get_user(subject)
+    if user is not None:
+        return user
+
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(UserModel).where(UserModel.id == int(subject)))
+        user_obj = result.scalar_one_or_none()
+    if user_obj is None:
         return None
-    finally:
-        db.close()
\ No newline at end of file
+    user = User.model_validate(user_obj)
+    await user_cache.set_user(subject, user)
+    return user
+
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
+    """
+    認証済みユーザーを返す依存性関数。
+    トークンが無効・期限切れ、またはユーザーが存在しない場合は401を返す。
+    """
+    user = await get_user_from_token(token)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="認証情報を検証できませんでした",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
+
+async def revoke_token(token: str) -> bool:
+    """
+    アクセストークンを失効させる（有効期限まで全ワーカーで拒否される）。
+    jti を持たない旧形式のトークンは失効できないため False を返す。
+    """
+    verified = _verify_claims(token)
+    if verified is None:
+        return False
+    _, jti, expires_at = verified
+    if not jti:
+        return False
+    await token_revocation.revoke(jti, expires_at)
+    return True
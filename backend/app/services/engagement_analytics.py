@@ -0,0 +1,382 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import true, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.models.engagement import Engagement
+from app.models.engagement_snapshot import EngagementSnapshot, EngagementSnapshotDaily, EngagementSnapshotHourly
+from app.models.post_variant import PostVariant
+
+METRICS = ("likes", "comments", "shares", "upvotes")
+SUPPORTED_METRICS = METRICS + ("engagement_rate",)
+
+
+def engagement_history_query(include_latest: bool = False):
+    """
+    Raw, hourly and daily snapshots as one subquery.
+
+    Raw snapshots are downsampled into the coarser tables once they pass
+    their retention, so old posts keep a history under the same columns.
+    With include_latest, the engagements latest-value rows are included
+    too (they may repeat the newest raw snapshot).
+
+    Returns:
+        Subquery with post_variant_id, captured_at, likes, comments, shares
+        and upvotes
+    """
+    sources = [
+        select(EngagementSnapshot.post_variant_id, EngagementSnapshot.captured_at,
+               *[getattr(EngagementSnapshot, m) for m in METRICS]),
+        select(EngagementSnapshotHourly.post_variant_id, EngagementSnapshotHourly.bucket_start.label("captured_at"),
+               *[getattr(EngagementSnapshotHourly, m) for m in METRICS]),
+        select(EngagementSnapshotDaily.post_variant_id, EngagementSnapshotDaily.bucket_start.label("captured_at"),
+               *[getattr(EngagementSnapshotDaily, m) for m in METRICS]),
+    ]
+    if include_latest:
+        sources.append(
+            select(Engagement.post_variant_id, Engagement.captured_at, *[getattr(Engagement, m) for m in METRICS])
+        )
+    return union_all(*sources).subquery("history_latest" if include_latest else "history")
+
+
+@dataclass
+class EngagementSeries:
+    """
+    Engagement snapshots held column-wise in NumPy arrays.
+
+    Rows are sorted by variant, then by capture time. variant_index maps
+    each row to a position in variant_ids.
+    """
+    variant_ids: np.ndarray      # (v,) int64
+    variant_index: np.ndarray    # (n,) int64
+    captured_at: np.ndarray      # (n,) float64, epoch seconds
+    metrics: Dict[str, np.ndarray]  # metric name -> (n,) int64
+
+    @classmethod
+    def from_columns(
+        cls,
+        variant_ids: Sequence[int],
+        captured_at: Sequence[float],
+        **metrics: Sequence[int],
+    ) -> "EngagementSeries":
+        """Build a series from raw columns, sorting rows by (variant, time)."""
+        raw_variants = np.asarray(variant_ids, dtype=np.int64)
+        times = np.asarray(captured_at, dtype=np.float64)
+        order = np.lexsort((times, raw_variants))
+        unique_ids, index = np.unique(raw_variants[order], return_inverse=True)
+        return cls(
+            variant_ids=unique_ids,
+            variant_index=index.astype(np.int64),
+            captured_at=times[order],
+            metrics={m: np.asarray(metrics.get(m, np.zeros(len(order))), dtype=np.int64)[order] for m in METRICS},
+        )
+
+    @property
+    def size(self) -> int:
+        return len(self.captured_at)
+
+    def interactions(self) -> np.ndarray:
+        """Total interactions per row (sum of all metric columns)."""
+        return sum(self.metrics[m] for m in METRICS)
+
+    def group_bounds(self) -> np.ndarray:
+        """Start offset of every variant's rows, plus the total row count."""
+        return np.searchsorted(self.variant_index, np.arange(len(self.variant_ids) + 1))
+
+
+@dataclass
+class LatestEngagement:
+    """
+    Latest metric values of each variant and the time span of its history.
+
+    All arrays are aligned with variant_ids (ascending); variants without
+    any engagement data are left out.
+    """
+    variant_ids: np.ndarray          # (v,) int64
+    first_captured_at: np.ndarray    # (v,) float64, epoch seconds
+    last_captured_at: np.ndarray     # (v,) float64, epoch seconds
+    metrics: Dict[str, np.ndarray]   # metric name (incl. engagement_rate) -> (v,) float64
+
+    @property
+    def size(self) -> int:
+        return len(self.variant_ids)
+
+    def fingerprint(self) -> tuple:
+        """Hashable summary that changes whenever any loaded value changes."""
+        return (
+            tuple(self.variant_ids.tolist()),
+            tuple(self.first_captured_at.tolist()),
+            tuple(self.last_captured_at.tolist()),
+            *(tuple(self.metrics[m].tolist()) for m in METRICS),
+        )
+
+
+@dataclass
+class SignificanceResult:
+    """
+    Posterior comparison of the variants of one post.
+
+    Rates are interactions (of the compared metric) per hour since the
+    variant was published, keyed by variant ID.
+    """
+    winner_probabilities: Dict[int, float]
+    credible_intervals: Dict[int, Tuple[float, float]]
+    posterior_rates: Dict[int, float]
+    credible_level: float
+    samples: int
+
+
+@dataclass
+class VariantComparison:
+    variant_id: int
+    metric_value: float
+    improvement_percentage: float
+    values: Dict[int, float]
+    content: Optional[str] = None
+    significance: Optional[SignificanceResult] = None
+
+
+class EngagementAnalytics:
+    @staticmethod
+    async def load_series(
+        db: AsyncSession,
+        variant_ids: List[int],
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> EngagementSeries:
+        """
+        Load the engagement history of the given variants into column arrays.
+
+        Reads the raw, downsampled and latest-value tables, so variants
+        past the raw retention still have data.
+
+        Args:
+            db: Database session
+            variant_ids: Variants to load
+            start_date: Earliest capture time (optional)
+            end_date: Latest capture time (optional)
+
+        Returns:
+            EngagementSeries with one array per metric
+        """
+        history = engagement_history_query(include_latest=True)
+        stmt = (
+            select(history.c.post_variant_id, history.c.captured_at, *[history.c[m] for m in METRICS])
+            .where(history.c.post_variant_id.in_(variant_ids))
+            # The latest-value row usually repeats the newest raw snapshot
+            .distinct()
+            .order_by(history.c.post_variant_id, history.c.captured_at)
+        )
+        if start_date is not None:
+            stmt = stmt.where(history.c.captured_at >= start_date)
+        if end_date is not None:
+            stmt = stmt.where(history.c.captured_at <= end_date)
+
+        rows = (await db.execute(stmt)).all()
+        if not rows:
+            return EngagementSeries.from_columns([], [])
+
+        columns = list(zip(*rows))
+        captured_at = np.array(columns[1], dtype="datetime64[us]").astype(np.int64) / 1e6
+        return EngagementSeries.from_columns(
+            columns[0],
+            captured_at,
+            **{m: columns[i + 2] for i, m in enumerate(METRICS)},
+        )
+
+    @staticmethod
+    async def load_latest(db: AsyncSession, variant_ids: List[int]) -> LatestEngagement:
+        """
+        Load the latest values and the first/last capture time of each variant.
+
+        Reads one row per variant and direction (ORDER BY captured_at ...
+        LIMIT 1 on each history table's primary key), however long the
+        history is.
+
+        Args:
+            db: Database session
+            variant_ids: Variants to load
+
+        Returns:
+            LatestEngagement of the variants that have engagement data
+        """
+        def edge(name: str, newest: bool):
+            history = engagement_history_query(include_latest=True)
+            order = history.c.captured_at.desc() if newest else history.c.captured_at
+            return (
+                select(history.c.captured_at, *([history.c[m] for m in METRICS] if newest else []))
+                .where(history.c.post_variant_id == PostVariant.id)
+                .order_by(order)
+                .limit(1)
+                .lateral(name)
+            )
+
+        first = edge("first", newest=False)
+        last = edge("last", newest=True)
+        stmt = (
+            select(
+                PostVariant.id,
+                first.c.captured_at.label("first_captured_at"),
+                last.c.captured_at.label("last_captured_at"),
+                *[last.c[m] for m in METRICS],
+            )
+            .select_from(PostVariant)
+            .join(first, true())
+            .join(last, true())
+            .where(PostVariant.id.in_(variant_ids))
+            .order_by(PostVariant.id)
+        )
+        rows = (await db.execute(stmt)).all()
+
+        def epoch(values) -> np.ndarray:
+            return np.array(values, dtype="datetime64[us]").astype(np.int64) / 1e6
+
+        metrics = {m: np.array([getattr(row, m) for row in rows], dtype=np.float64) for m in METRICS}
+        metrics["engagement_rate"] = sum(metrics[m] for m in METRICS) if rows else np.zeros(0)
+        return LatestEngagement(
+            variant_ids=np.array([row.id for row in rows], dtype=np.int64),
+            first_captured_at=epoch([row.first_captured_at for row in rows]),
+            last_captured_at=epoch([row.last_captured_at for row in rows]),
+            metrics=metrics,
+        )
+
+    @staticmethod
+    def latest(series: EngagementSeries) -> Dict[str, np.ndarray]:
+        """
+        Latest value of every metric per variant, aligned with series.variant_ids.
+
+        Also includes engagement_rate, i.e. interactions per variant.
+        """
+        if series.size == 0:
+            return {m: np.zeros(0) for m in SUPPORTED_METRICS}
+        last_rows = series.group_bounds()[1:] - 1
+        latest = {m: series.metrics[m][last_rows].astype(np.float64) for m in METRICS}
+        latest["engagement_rate"] = sum(latest[m] for m in METRICS)
+        return latest
+
+    @staticmethod
+    def deltas(series: EngagementSeries) -> Dict[str, np.ndarray]:
+        """
+        Change of every metric between consecutive snapshots of the same variant.
+
+        The first snapshot of each variant gets a delta of 0.
+        """
+        first_of_group = np.ones(series.size, dtype=bool)
+        first_of_group[1:] = series.variant_index[1:] != series.variant_index[:-1]
+        result = {}
+        for m in METRICS:
+            delta = np.diff(series.metrics[m], prepend=0)
+            delta[first_of_group] = 0
+            result[m] = delta
+        return result
+
+    @staticmethod
+    def growth_curves(
+        series: EngagementSeries,
+        bucket_seconds: float,
+        start: float,
+        end: float,
+    ) -> np.ndarray:
+        """
+        Cumulative interactions per variant sampled on a regular time grid.
+
+        Args:
+            series: Engagement series
+            bucket_seconds: Grid spacing in seconds
+            start: First grid point (epoch seconds)
+            end: Last grid point (epoch seconds)
+
+        Returns:
+            (variants, buckets) array; points before a variant's first
+            snapshot are 0
+        """
+        grid = np.arange(start, end + bucket_seconds, bucket_seconds)
+        curves = np.zeros((len(series.variant_ids), len(grid)))
+        if series.size == 0:
+            return curves
+
+        interactions = series.interactions().astype(np.float64)
+        # Offsetting each variant's timestamps by a large stride turns the
+        # per-variant searches into one searchsorted over the whole array
+        stride = max(series.captured_at.max(), grid.max()) - min(series.captured_at.min(), grid.min()) + 1.0
+        keys = series.captured_at + series.variant_index * stride
+        queries = grid[np.newaxis, :] + (np.arange(len(series.variant_ids)) * stride)[:, np.newaxis]
+        positions = np.searchsorted(keys, queries, side="right") - 1
+
+        bounds = series.group_bounds()
+        valid = positions >= bounds[:-1, np.newaxis]
+        curves[valid] = interactions[positions[valid]]
+        return curves
+
+    @staticmethod
+    def compare_variants(series: EngagementSeries, metric: str) -> Optional[VariantComparison]:
+        """
+        Pick the variant with the highest latest value of metric.
+
+        improvement_percentage compares the winner against the mean of all
+        variants.
+
+        Args:
+            series: Engagement series
+            metric: One of likes, comments, shares, upvotes, engagement_rate
+
+        Returns:
+            VariantComparison, or None when there is no engagement data
+        """
+        if metric not in SUPPORTED_METRICS:
+            raise ValueError(f"Unsupported metric: {metric}")
+        if series.size == 0:
+            return None
+        return EngagementAnalytics._pick_best(series.variant_ids, EngagementAnalytics.latest(series)[metric])
+
+    @staticmethod
+    def compare_latest(latest: LatestEngagement, metric: str) -> Optional[VariantComparison]:
+        """Same as compare_variants, from values loaded with load_latest."""
+        if metric not in SUPPORTED_METRICS:
+            raise ValueError(f"Unsupported metric: {metric}")
+        if latest.size == 0:
+            return None
+        return EngagementAnalytics._pick_best(latest.variant_ids, latest.metrics[metric])
+
+    @staticmethod
+    def _pick_best(variant_ids: np.ndarray, values: np.ndarray) -> VariantComparison:
+        best = int(np.argmax(values))
+        mean = float(values.mean())
+        improvement = (values[best] - mean) / mean * 100 if mean > 0 else 0.0
+        return VariantComparison(
+            variant_id=int(variant_ids[best]),
+            metric_value=float(values[best]),
+            improvement_percentage=round(float(improvement), 2),
+            values={int(v): float(x) for v, x in zip(variant_ids, values)},
+        )
+
+    @staticmethod
+    def summarize_daily(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Totals and engagement rates for daily rollup rows in one vectorized pass.
+
+        Args:
+            rows: Dicts with the metric columns and active_variants
+
+        Returns:
+            Totals per metric, overall engagement_rate and per-day rates
+        """
+        if not rows:
+            return {"totals": {m: 0 for m in METRICS}, "engagement_rate": 0.0, "daily_rates": []}
+
+        matrix = np.array([[row[m] for m in METRICS] for row in rows], dtype=np.int64)
+        active = np.array([row["active_variants"] for row in rows], dtype=np.float64)
+        interactions = matrix.sum(axis=1)
+        totals = matrix.sum(axis=0)
+        return {
+            "totals": {m: int(totals[i]) for i, m in enumerate(METRICS)},
+            "engagement_rate": float(interactions.sum() / max(active.sum(), 1.0)),
+            "daily_rates": (interactions / np.maximum(active, 1.0)).tolist(),
+        }
+
+
+engagement_analytics = EngagementAnalytics()
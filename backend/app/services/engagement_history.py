@@ -0,0 +1,214 @@
+import asyncio
+import time
+from typing import List, Dict, Any, Iterable, Set
+from datetime import datetime
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from loguru import logger
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.engagement_snapshot import EngagementSnapshot
+from app.models.post import Post
+from app.models.post_variant import PostVariant
+from app.services.engagement_rollup import engagement_rollup_service
+from app.services.posting_heatmap import posting_heatmap_service
+from app.services.response_cache import post_tag, response_cache, user_tag
+from app.tasks.engagement_retention import ensure_raw_partitions, ensure_upcoming_partitions, raw_partition_window
+
+
+class EngagementHistoryWriter:
+    """
+    Buffers engagement readings and appends them to the partitioned
+    engagement_snapshots table in batches.
+
+    Snapshots are flushed when the buffer reaches batch_size, or every
+    flush_interval seconds while the background loop is running. Each
+    flush also updates the daily engagement rollups and the posting heatmap
+    in the same transaction, then invalidates the cached analysis responses
+    of the affected posts and users.
+
+    Readings already stored for the same (post_variant_id, captured_at) are
+    skipped. A batch that fails max_retries flushes in a row is dropped and
+    logged, so a permanently failing batch cannot grow the buffer. The
+    background loop also creates upcoming monthly partitions.
+
+    A reading whose month has no partition yet gets one before the insert,
+    as long as it falls within raw retention and the months created ahead.
+    Readings outside that window are logged and skipped on their own, so
+    they cannot fail the rest of the batch.
+    """
+
+    def __init__(self, batch_size: int, flush_interval: float, max_retries: int, partition_interval: float):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.partition_interval = partition_interval
+        self._buffer: List[Dict[str, Any]] = []
+        self._failures = 0
+        # Months whose raw partition is known to exist
+        self._partition_months: Set[datetime] = set()
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    async def add(self, snapshots: Iterable[Dict[str, Any]]) -> None:
+        """
+        Queue engagement readings for writing.
+
+        Never raises: a failed flush is logged and retried by the next one.
+
+        Args:
+            snapshots: Dicts with post_variant_id, likes, comments, shares,
+                upvotes and optionally captured_at (defaults to now)
+        """
+        now = datetime.utcnow()
+        for snapshot in snapshots:
+            self._buffer.append({
+                "post_variant_id": snapshot["post_variant_id"],
+                "captured_at": snapshot.get("captured_at") or now,
+                "likes": snapshot.get("likes", 0),
+                "comments": snapshot.get("comments", 0),
+                "shares": snapshot.get("shares", 0),
+                "upvotes": snapshot.get("upvotes", 0),
+            })
+
+        if len(self._buffer) >= self.batch_size:
+            try:
+                await self.flush()
+            except Exception:
+                # Already logged; the caller's own writes have committed
+                pass
+
+    async def flush(self) -> int:
+        """
+        Write all buffered snapshots.
+
+        Returns:
+            Number of snapshots written
+        """
+        async with self._lock:
+            if not self._buffer:
+                return 0
+            batch, self._buffer = self._buffer, []
+
+            start, end = raw_partition_window(datetime.utcnow())
+            out_of_range = [s for s in batch if not start <= s["captured_at"] < end]
+            if out_of_range:
+                logger.error(
+                    f"Skipping {len(out_of_range)} engagement snapshots captured outside [{start}, {end}): "
+                    + ", ".join(f"{s['post_variant_id']}@{s['captured_at']}" for s in out_of_range[:10])
+                )
+                batch = [s for s in batch if start <= s["captured_at"] < end]
+                if not batch:
+                    return 0
+
+            written = 0
+            try:
+                missing = {
+                    datetime(s["captured_at"].year, s["captured_at"].month, 1) for s in batch
+                } - self._partition_months
+                if missing:
+                    self._partition_months.update(await ensure_raw_partitions(missing))
+                async with AsyncSessionLocal() as db:
+                    for start in range(0, len(batch), self.batch_size):
+                        chunk = batch[start:start + self.batch_size]
+                        inserted = {
+                            (row.post_variant_id, row.captured_at)
+                            for row in await db.execute(
+                                pg_insert(EngagementSnapshot)
+                                .on_conflict_do_nothing(index_elements=["post_variant_id", "captured_at"])
+                                .returning(EngagementSnapshot.post_variant_id, EngagementSnapshot.captured_at),
+                                chunk,
+                            )
+                        }
+                        # Only readings that were actually new may count towards the rollups
+                        new = {}
+                        for snapshot in chunk:
+                            key = (snapshot["post_variant_id"], snapshot["captured_at"])
+                            if key in inserted:
+                                new.setdefault(key, snapshot)
+                        chunk = list(new.values())
+                        # Keep the daily rollups in step with the raw history
+                        await engagement_rollup_service.apply_snapshots(db, chunk)
+                        await posting_heatmap_service.apply_snapshots(db, chunk)
+                        written += len(chunk)
+                    owners = (await db.execute(
+                        select(PostVariant.post_id, Post.user_id)
+                        .join(Post, Post.id == PostVariant.post_id)
+                        .where(PostVariant.id.in_({s["post_variant_id"] for s in batch}))
+                        .distinct()
+                    )).all()
+                    await db.commit()
+            except Exception as e:
+                self._failures += 1
+                if self._failures >= self.max_retries:
+                    logger.error(
+                        f"Dropping {len(batch)} engagement snapshots after {self._failures} failed flushes: {str(e)}"
+                    )
+                    self._failures = 0
+                else:
+                    # Put the batch back so the next flush retries it
+                    logger.error(f"Error writing engagement snapshots (attempt {self._failures}): {str(e)}")
+                    self._buffer = batch + self._buffer
+                raise
+            self._failures = 0
+
+            await response_cache.invalidate_tags(
+                [post_tag(row.post_id) for row in owners] + [user_tag(row.user_id) for row in owners]
+            )
+
+            logger.debug(f"Wrote {written} engagement snapshots")
+            return written
+
+    async def ensure_partitions(self) -> None:
+        """Create the monthly partitions upcoming snapshots will be written to."""
+        try:
+            await ensure_upcoming_partitions()
+        except Exception as e:
+            logger.error(f"Error creating engagement snapshot partitions: {str(e)}")
+
+    async def run(self) -> None:
+        """Flush the buffer periodically until cancelled."""
+        partitions_checked_at = None
+        try:
+            while True:
+                if partitions_checked_at is None or time.monotonic() - partitions_checked_at >= self.partition_interval:
+                    await self.ensure_partitions()
+                    partitions_checked_at = time.monotonic()
+                await asyncio.sleep(self.flush_interval)
+                try:
+                    await self.flush()
+                except Exception:
+                    # Already logged; keep the loop alive
+                    pass
+        except asyncio.CancelledError:
+            try:
+                await self.flush()
+            except Exception:
+                pass
+            raise
+
+    def start(self) -> None:
+        """Start the background flush loop on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Stop the background flush loop, flushing anything still buffered."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        else:
+            await self.flush()
+
+
+engagement_history = EngagementHistoryWriter(
+    batch_size=settings.ENGAGEMENT_SNAPSHOT_BATCH_SIZE,
+    flush_interval=settings.ENGAGEMENT_SNAPSHOT_FLUSH_INTERVAL,
+    max_retries=settings.ENGAGEMENT_SNAPSHOT_MAX_RETRIES,
+    partition_interval=settings.ENGAGEMENT_MAINTENANCE_INTERVAL,
+)
@@ -0,0 +1,92 @@
+from typing import Dict, Any, Iterable
+from datetime import datetime
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from loguru import logger
+
+from app.core.config import settings
+from app.models.engagement import Engagement
+from app.services.engagement_history import engagement_history
+from app.services.engagement_rollup import COUNTERS
+
+
+class EngagementIngestService:
+    @staticmethod
+    async def upsert_engagements(
+        db: AsyncSession,
+        readings: Iterable[Dict[str, Any]],
+        batch_size: int = settings.ENGAGEMENT_UPSERT_BATCH_SIZE,
+    ) -> Dict[str, Any]:
+        """
+        Write engagement readings for many variants in a few round trips.
+
+        The latest-state engagements table is updated with multi-row
+        INSERT ... ON CONFLICT (post_variant_id) DO UPDATE statements, one per
+        batch, and every reading is also appended to the engagement history.
+        A reading older than the stored one never overwrites it.
+
+        Args:
+            db: Database session
+            readings: Dicts with post_variant_id, the counters and
+                optionally captured_at (defaults to now)
+            batch_size: Maximum rows per INSERT statement
+
+        Returns:
+            Overall status with the number of rows upserted per batch
+        """
+        now = datetime.utcnow()
+
+        # Every reading goes to the history; the latest-state upsert keeps
+        # only the newest one per variant, since one row may not be affected
+        # twice by the same ON CONFLICT statement
+        history = []
+        latest: Dict[int, Dict[str, Any]] = {}
+        for reading in readings:
+            row = {
+                "post_variant_id": reading["post_variant_id"],
+                "captured_at": reading.get("captured_at") or now,
+                **{c: reading.get(c, 0) for c in COUNTERS},
+                "created_at": now,
+                "updated_at": now,
+            }
+            history.append(row)
+            current = latest.get(row["post_variant_id"])
+            if current is None or row["captured_at"] >= current["captured_at"]:
+                latest[row["post_variant_id"]] = row
+
+        rows = list(latest.values())
+        batches = []
+        try:
+            for start in range(0, len(rows), batch_size):
+                batch = rows[start:start + batch_size]
+                stmt = pg_insert(Engagement).values(batch)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[Engagement.post_variant_id],
+                    set_={
+                        **{c: getattr(stmt.excluded, c) for c in COUNTERS},
+                        "captured_at": stmt.excluded.captured_at,
+                        "updated_at": stmt.excluded.updated_at,
+                    },
+                    where=Engagement.captured_at <= stmt.excluded.captured_at,
+                )
+                result = await db.execute(stmt)
+                batches.append({"size": len(batch), "upserted": result.rowcount})
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Error upserting engagements: {str(e)}")
+            raise
+
+        # Append all readings, including older ones of the same variant, to the history
+        await engagement_history.add(history)
+
+        updated_count = sum(batch["upserted"] for batch in batches)
+        logger.info(f"Upserted {updated_count} engagements in {len(batches)} batches")
+        return {
+            "status": "success",
+            "updated_count": updated_count,
+            "batches": batches,
+        }
+
+
+engagement_ingest_service = EngagementIngestService()
@@ -0,0 +1,208 @@
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import date
+from sqlalchemy import text, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.models.engagement_rollup import EngagementRollupUserDaily
+from app.models.post import Platform
+
+COUNTERS = ("likes", "comments", "shares", "upvotes")
+
+# Engagement rate = interactions per active variant (per day for daily rows)
+ENGAGEMENT_RATE_SQL = (
+    "CAST(sum(v.likes{s}) + sum(v.comments{s}) + sum(v.shares{s}) + sum(v.upvotes{s}) AS float)"
+    " / GREATEST({variants}, 1)"
+)
+
+# Affected (variant, day) keys of the current batch
+_AFFECTED_KEYS = "unnest(CAST(:variant_ids AS integer[]), CAST(:days AS date[])) AS a(post_variant_id, day)"
+
+UPSERT_VARIANT_DAILY = text(f"""
+    INSERT INTO engagement_rollup_variant_daily
+        (post_variant_id, day, post_id, user_id, platform, likes, comments, shares, upvotes)
+    SELECT b.post_variant_id, b.day, pv.post_id, p.user_id, p.platform,
+           b.likes, b.comments, b.shares, b.upvotes
+    FROM unnest(
+        CAST(:variant_ids AS integer[]), CAST(:days AS date[]),
+        CAST(:likes AS integer[]), CAST(:comments AS integer[]),
+        CAST(:shares AS integer[]), CAST(:upvotes AS integer[])
+    ) AS b(post_variant_id, day, likes, comments, shares, upvotes)
+    JOIN post_variants pv ON pv.id = b.post_variant_id
+    JOIN posts p ON p.id = pv.post_id
+    ON CONFLICT (post_variant_id, day) DO UPDATE SET
+        {", ".join(f"{c} = GREATEST(engagement_rollup_variant_daily.{c}, EXCLUDED.{c})" for c in COUNTERS)}
+""")
+
+UPDATE_VARIANT_GAINS = text(f"""
+    UPDATE engagement_rollup_variant_daily AS v SET
+        {", ".join(f"{c}_gained = v.{c} - COALESCE(prev.{c}, 0)" for c in COUNTERS)}
+    FROM {_AFFECTED_KEYS}
+    LEFT JOIN LATERAL (
+        SELECT r.likes, r.comments, r.shares, r.upvotes
+        FROM engagement_rollup_variant_daily r
+        WHERE r.post_variant_id = a.post_variant_id AND r.day < a.day
+        ORDER BY r.day DESC
+        LIMIT 1
+    ) prev ON true
+    WHERE v.post_variant_id = a.post_variant_id AND v.day = a.day
+""")
+
+# The next stored day after each affected key: its gain is relative to the
+# affected day, so a late or out-of-order snapshot changes it too
+SELECT_NEXT_DAYS = text(f"""
+    SELECT a.post_variant_id, n.day
+    FROM {_AFFECTED_KEYS}
+    JOIN LATERAL (
+        SELECT r.day
+        FROM engagement_rollup_variant_daily r
+        WHERE r.post_variant_id = a.post_variant_id AND r.day > a.day
+        ORDER BY r.day
+        LIMIT 1
+    ) n ON true
+""")
+
+UPSERT_POST_DAILY = text(f"""
+    INSERT INTO engagement_rollup_post_daily
+        (post_id, day, user_id, platform, likes, comments, shares, upvotes, active_variants, engagement_rate)
+    SELECT v.post_id, v.day, v.user_id, v.platform,
+           {", ".join(f"sum(v.{c}_gained)" for c in COUNTERS)},
+           count(*),
+           {ENGAGEMENT_RATE_SQL.format(s="_gained", variants="count(*)")}
+    FROM engagement_rollup_variant_daily v
+    WHERE (v.post_id, v.day) IN (
+        SELECT r.post_id, r.day
+        FROM engagement_rollup_variant_daily r
+        JOIN {_AFFECTED_KEYS} ON r.post_variant_id = a.post_variant_id AND r.day = a.day
+    )
+    GROUP BY v.post_id, v.day, v.user_id, v.platform
+    ON CONFLICT (post_id, day) DO UPDATE SET
+        {", ".join(f"{c} = EXCLUDED.{c}" for c in COUNTERS)},
+        active_variants = EXCLUDED.active_variants,
+        engagement_rate = EXCLUDED.engagement_rate
+""")
+
+UPSERT_USER_DAILY = text(f"""
+    INSERT INTO engagement_rollup_user_daily
+        (user_id, platform, day, likes, comments, shares, upvotes, active_variants, engagement_rate)
+    SELECT v.user_id, v.platform, v.day,
+           {", ".join(f"sum(v.{c})" for c in COUNTERS)},
+           sum(v.active_variants),
+           {ENGAGEMENT_RATE_SQL.format(s="", variants="sum(v.active_variants)")}
+    FROM engagement_rollup_post_daily v
+    WHERE (v.user_id, v.platform, v.day) IN (
+        SELECT r.user_id, r.platform, r.day
+        FROM engagement_rollup_variant_daily r
+        JOIN {_AFFECTED_KEYS} ON r.post_variant_id = a.post_variant_id AND r.day = a.day
+    )
+    GROUP BY v.user_id, v.platform, v.day
+    ON CONFLICT (user_id, platform, day) DO UPDATE SET
+        {", ".join(f"{c} = EXCLUDED.{c}" for c in COUNTERS)},
+        active_variants = EXCLUDED.active_variants,
+        engagement_rate = EXCLUDED.engagement_rate
+""")
+
+
+def engagement_rate(interactions: float, active_variants: float) -> float:
+    """Interactions per active variant, matching ENGAGEMENT_RATE_SQL."""
+    return float(interactions) / max(active_variants, 1)
+
+
+class EngagementRollupService:
+    @staticmethod
+    async def apply_snapshots(
+        db: AsyncSession,
+        snapshots: List[Dict[str, Any]]
+    ) -> int:
+        """
+        Incrementally fold a batch of engagement snapshots into the daily rollups.
+
+        Only the (variant, day) keys touched by the batch, the next stored
+        day of each (whose gain is measured against the touched day), and
+        the post and user days they belong to are recomputed, so the cost
+        depends on the batch size rather than on the amount of history.
+        Runs in the caller's transaction.
+
+        Args:
+            db: Database session
+            snapshots: Dicts with post_variant_id, captured_at and counters
+
+        Returns:
+            Number of (variant, day) rollup rows touched
+        """
+        # Counters are cumulative, so the highest reading of the day wins
+        latest: Dict[Tuple[int, date], Dict[str, int]] = {}
+        for snapshot in snapshots:
+            key = (snapshot["post_variant_id"], snapshot["captured_at"].date())
+            current = latest.setdefault(key, {c: 0 for c in COUNTERS})
+            for c in COUNTERS:
+                current[c] = max(current[c], snapshot.get(c, 0))
+
+        if not latest:
+            return 0
+
+        keys = list(latest.keys())
+        params = {
+            "variant_ids": [variant_id for variant_id, _ in keys],
+            "days": [day for _, day in keys],
+        }
+        await db.execute(UPSERT_VARIANT_DAILY, {
+            **params,
+            **{c: [latest[key][c] for key in keys] for c in COUNTERS},
+        })
+        # Late snapshots also shift the gain of the following stored day
+        following = (await db.execute(SELECT_NEXT_DAYS, params)).all()
+        keys = list(dict.fromkeys(keys + [(row.post_variant_id, row.day) for row in following]))
+        params = {
+            "variant_ids": [variant_id for variant_id, _ in keys],
+            "days": [day for _, day in keys],
+        }
+        await db.execute(UPDATE_VARIANT_GAINS, params)
+        await db.execute(UPSERT_POST_DAILY, params)
+        await db.execute(UPSERT_USER_DAILY, params)
+        return len(keys)
+
+    @staticmethod
+    async def get_user_daily_series(
+        db: AsyncSession,
+        user_id: int,
+        start_date: date,
+        end_date: date,
+        platform: Optional[Platform] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Read a user's daily engagement gains from the user rollup.
+
+        Args:
+            db: Database session
+            user_id: User ID
+            start_date: First day (inclusive)
+            end_date: Last day (inclusive)
+            platform: Restrict to one platform (optional)
+
+        Returns:
+            One dict per day with counters and active variant count
+        """
+        rollup = EngagementRollupUserDaily
+        stmt = (
+            select(
+                rollup.day,
+                *[func.sum(getattr(rollup, c)).label(c) for c in COUNTERS],
+                func.sum(rollup.active_variants).label("active_variants"),
+            )
+            .where(
+                rollup.user_id == user_id,
+                rollup.day >= start_date,
+                rollup.day <= end_date,
+            )
+            .group_by(rollup.day)
+            .order_by(rollup.day)
+        )
+        if platform is not None:
+            stmt = stmt.where(rollup.platform == platform)
+
+        result = await db.execute(stmt)
+        return [dict(row._mapping) for row in result.all()]
+
+
+engagement_rollup_service = EngagementRollupService()
@@ -0,0 +1,186 @@
+import csv
+import enum
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import Any, AsyncIterator, List, Optional
+
+from loguru import logger
+from sqlalchemy import Select
+from sqlalchemy.future import select
+
+from app.core.config import settings
+from app.db.session import get_read_session_factory
+from app.models.post import Post
+from app.models.post_variant import PostVariant
+from app.services.engagement_analytics import engagement_history_query
+
+DATASETS = ("posts", "variants", "engagements")
+FORMATS = ("ndjson", "csv")
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _to_text(value: Any) -> Any:
+    """Make a column value JSON/CSV friendly."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+class ExportService:
+    @staticmethod
+    def build_query(
+        dataset: str,
+        user_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> Select:
+        """
+        Build the export query for one dataset of a user.
+
+        start_date/end_date filter posts and variants on created_at and
+        engagement snapshots on captured_at. Engagements cover the raw
+        snapshots and, past their retention, the hourly and daily buckets.
+        """
+        if dataset == "posts":
+            stmt = (
+                select(Post.id, Post.platform, Post.status, Post.scheduled_at, Post.created_at, Post.updated_at)
+                .where(Post.user_id == user_id)
+                .order_by(Post.id)
+            )
+            time_column = Post.created_at
+        elif dataset == "variants":
+            stmt = (
+                select(
+                    PostVariant.id, PostVariant.post_id, PostVariant.content, PostVariant.external_id,
+                    PostVariant.published_at, PostVariant.created_at,
+                )
+                .join(Post, Post.id == PostVariant.post_id)
+                .where(Post.user_id == user_id)
+                .order_by(PostVariant.id)
+            )
+            time_column = PostVariant.created_at
+        elif dataset == "engagements":
+            snapshot = engagement_history_query()
+            stmt = (
+                select(
+                    PostVariant.post_id, snapshot.c.post_variant_id, snapshot.c.captured_at,
+                    snapshot.c.likes, snapshot.c.comments, snapshot.c.shares, snapshot.c.upvotes,
+                )
+                .join(PostVariant, PostVariant.id == snapshot.c.post_variant_id)
+                .join(Post, Post.id == PostVariant.post_id)
+                .where(Post.user_id == user_id)
+                .order_by(snapshot.c.post_variant_id, snapshot.c.captured_at)
+            )
+            time_column = snapshot.c.captured_at
+        else:
+            raise ValueError(f"Unsupported dataset: {dataset}")
+
+        if start_date is not None:
+            stmt = stmt.where(time_column >= start_date)
+        if end_date is not None:
+            stmt = stmt.where(time_column <= end_date)
+        return stmt
+
+    @staticmethod
+    async def _stream_rows(stmt: Select) -> AsyncIterator[List[Any]]:
+        """
+        Run a query on a server-side cursor and yield batches of rows.
+
+        The session is opened here rather than taken from a request
+        dependency, since it has to outlive the endpoint function.
+        """
+        session_factory = await get_read_session_factory()
+        async with session_factory() as db:
+            result = await db.stream(stmt.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+            async for rows in result.partitions():
+                yield rows
+
+    @staticmethod
+    def stream(
+        dataset: str,
+        user_id: int,
+        fmt: str = "ndjson",
+        compress: bool = False,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream a dataset as NDJSON or CSV, optionally gzip-compressed.
+
+        Arguments are validated up front so errors can still be returned as
+        a normal response. At most one batch of rows is held in memory at a
+        time, and for CSV the header is sent before the query runs.
+
+        Args:
+            dataset: posts, variants or engagements
+            user_id: Owner of the exported data
+            fmt: ndjson or csv
+            compress: gzip the output
+            start_date: Lower time bound (optional)
+            end_date: Upper time bound (optional)
+
+        Returns:
+            Async iterator of encoded output chunks
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Unsupported format: {fmt}")
+        stmt = ExportService.build_query(dataset, user_id, start_date, end_date)
+        return ExportService._generate(stmt, dataset, user_id, fmt, compress)
+
+    @staticmethod
+    async def _generate(
+        stmt: Select,
+        dataset: str,
+        user_id: int,
+        fmt: str,
+        compress: bool,
+    ) -> AsyncIterator[bytes]:
+        """Encode the query result batch by batch."""
+        columns = [c.key for c in stmt.selected_columns]
+        # wbits=31 produces a gzip container; each batch is sync-flushed so
+        # clients can decompress as data arrives
+        compressor = zlib.compressobj(wbits=31) if compress else None
+
+        def encode(text: str) -> bytes:
+            data = text.encode()
+            if compressor is None:
+                return data
+            return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if fmt == "csv":
+            writer.writerow(columns)
+            yield encode(buffer.getvalue())
+
+        try:
+            async for rows in ExportService._stream_rows(stmt):
+                if fmt == "ndjson":
+                    chunk = "".join(
+                        json.dumps({c: _to_text(v) for c, v in zip(columns, row)}, ensure_ascii=False) + "\n"
+                        for row in rows
+                    )
+                else:
+                    buffer.seek(0)
+                    buffer.truncate()
+                    writer.writerows([_to_text(v) for v in row] for row in rows)
+                    chunk = buffer.getvalue()
+                yield encode(chunk)
+        except Exception as e:
+            # Headers are already sent; the truncated body is the only signal
+            logger.error(f"Error exporting {dataset} for user {user_id}: {str(e)}")
+            raise
+
+        if compressor is not None:
+            yield compressor.flush()
+
+
+export_service = ExportService()
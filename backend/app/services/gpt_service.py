@@ -1,8 +1,10 @@
+import time
 import openai
 from typing import List, Dict, Any, Optional
 from loguru import logger
 
 from app.core.config import settings
+from app.core.metrics import GPT_REQUEST_DURATION, GPT_TOKENS
 
 # Configure OpenAI API key
 openai.api_key = settings.OPENAI_API_KEY
@@ -54,15 +56,27 @@ class GPTService:
             Provide exactly {num_variants} different variations, each separated by [VARIANT].
             """
             
-            response = await openai.ChatCompletion.acreate(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are an expert social media marketer specializing in tech products."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=1500,
-                temperature=0.7,
-            )
+            model = settings.GPT_MODEL
+            started = time.perf_counter()
+            outcome = "error"
+            try:
+                response = await openai.ChatCompletion.acreate(
+                    model=model,
+                    messages=[
+                        {"role": "system", "content": "You are an expert social media marketer specializing in tech products."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    max_tokens=1500,
+                    temperature=0.7,
+                )
+                outcome = "success"
+            finally:
+                GPT_REQUEST_DURATION.labels(model, outcome).observe(time.perf_counter() - started)
+            
+            usage = getattr(response, "usage", None)
+            if usage is not None:
+                GPT_TOKENS.labels(model, "prompt").inc(getattr(usage, "prompt_tokens", 0) or 0)
+                GPT_TOKENS.labels(model, "completion").inc(getattr(usage, "completion_tokens", 0) or 0)
             
             content = response.choices[0].message.content
             variants = content.split("[VARIANT]")
@@ -0,0 +1,116 @@
+import asyncio
+import random
+from typing import List, Dict, Any
+from loguru import logger
+
+from app.models.post import Platform
+
+# Maximum number of post IDs a single lookup request accepts on each platform
+BULK_LIMITS = {
+    Platform.X: 100,            # GET /2/tweets?ids=...
+    Platform.REDDIT: 100,       # GET /api/info?id=t3_...,t3_...
+    Platform.PRODUCTHUNT: 20,   # GraphQL posts(first: 20)
+}
+
+
+class PlatformEngagementService:
+    @staticmethod
+    async def fetch_engagements(
+        platform: Platform,
+        external_ids: List[str],
+    ) -> Dict[str, Dict[str, int]]:
+        """
+        Look up engagement counters for many published posts on one platform.
+
+        IDs are split into chunks of the platform's bulk limit and the chunks
+        are requested concurrently, so refreshing N posts costs
+        ceil(N / limit) outbound calls instead of N.
+
+        Args:
+            platform: Platform the posts were published to
+            external_ids: Platform-side post IDs
+
+        Returns:
+            Mapping of external ID to likes/comments/shares/upvotes; IDs the
+            platform did not return are omitted
+        """
+        unique_ids = list(dict.fromkeys(external_ids))
+        if not unique_ids:
+            return {}
+
+        limit = BULK_LIMITS.get(platform, 1)
+        chunks = [unique_ids[i:i + limit] for i in range(0, len(unique_ids), limit)]
+        results = await asyncio.gather(
+            *[PlatformEngagementService._fetch_chunk(platform, chunk) for chunk in chunks],
+            return_exceptions=True,
+        )
+
+        engagements: Dict[str, Dict[str, int]] = {}
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error fetching {platform.value} engagements for {len(chunk)} posts: {str(result)}")
+                continue
+            engagements.update(result)
+        return engagements
+
+    @staticmethod
+    async def _fetch_chunk(platform: Platform, external_ids: List[str]) -> Dict[str, Dict[str, int]]:
+        """Fetch one bulk-limit-sized chunk from the selected platform."""
+        if platform == Platform.X:
+            return await PlatformEngagementService._fetch_twitter(external_ids)
+        elif platform == Platform.REDDIT:
+            return await PlatformEngagementService._fetch_reddit(external_ids)
+        elif platform == Platform.PRODUCTHUNT:
+            return await PlatformEngagementService._fetch_producthunt(external_ids)
+        raise ValueError(f"Unsupported platform: {platform}")
+
+    @staticmethod
+    async def _fetch_twitter(external_ids: List[str]) -> Dict[str, Any]:
+        """
+        Fetch public metrics for up to 100 tweets in one request.
+
+        In the real implementation, call GET /2/tweets?ids=<comma separated>
+        &tweet.fields=public_metrics with proper authentication.
+        This is a placeholder implementation.
+        """
+        # TODO: Implement actual Twitter API call
+        return {
+            tweet_id: {
+                "likes": random.randint(0, 100),
+                "comments": random.randint(0, 50),
+                "shares": random.randint(0, 20),
+                "upvotes": 0,
+            }
+            for tweet_id in external_ids
+        }
+
+    @staticmethod
+    async def _fetch_reddit(external_ids: List[str]) -> Dict[str, Any]:
+        """Fetch score and comment counts for up to 100 submissions via /api/info (placeholder)"""
+        # TODO: Implement actual Reddit API call
+        return {
+            post_id: {
+                "likes": 0,
+                "comments": random.randint(0, 50),
+                "shares": 0,
+                "upvotes": random.randint(0, 100),
+            }
+            for post_id in external_ids
+        }
+
+    @staticmethod
+    async def _fetch_producthunt(external_ids: List[str]) -> Dict[str, Any]:
+        """Fetch votes and comments for up to 20 posts in one GraphQL query (placeholder)"""
+        # TODO: Implement actual Product Hunt API call
+        return {
+            post_id: {
+                "likes": 0,
+                "comments": random.randint(0, 50),
+                "shares": 0,
+                "upvotes": random.randint(0, 100),
+            }
+            for post_id in external_ids
+        }
+
+
+platform_engagement_service = PlatformEngagementService()
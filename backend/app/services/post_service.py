@@ -1,14 +1,21 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
+import base64
+import time
 import httpx
+from sqlalchemy import insert, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm import joinedload, selectinload
 from loguru import logger
 
 from app.core.config import settings
+from app.core.metrics import PUBLISH_DURATION
+from app.models.engagement import Engagement
 from app.models.post import Post, Platform, PostStatus
 from app.models.post_variant import PostVariant
 from app.services.gpt_service import gpt_service
+from app.services.response_cache import post_tag, response_cache, user_tag
 
 
 class PostService:
@@ -19,59 +26,73 @@ class PostService:
         platform: Platform,
         title: str,
         keywords: List[str],
+        num_variants: int = 2,
     ) -> Dict[str, Any]:
         """
         Create a new post and generate variants with GPT.
         
+        The variants are generated before touching the database, then the
+        post and all of its variants are written in one transaction using
+        INSERT ... RETURNING, so no refresh round trips are needed.
+        
         Args:
             db: Database session
             user_id: User ID creating the post
             platform: Target platform (X, Reddit, ProductHunt)
             title: Post title/theme
             keywords: List of keywords for the post
+            num_variants: Number of variants to generate (default: 2)
             
         Returns:
             Dictionary with post data and generated variants
         """
-        # Create a new post
-        post = Post(
-            user_id=user_id,
-            platform=platform,
-            status=PostStatus.DRAFT
-        )
-        db.add(post)
-        await db.commit()
-        await db.refresh(post)
-        
         # Generate variants with GPT
         variant_texts = await gpt_service.generate_post_variants(
             platform=platform.value,
             title=title,
-            keywords=keywords
+            keywords=keywords,
+            num_variants=num_variants,
         )
         
-        # Create variant objects
-        variants = []
-        for content in variant_texts:
-            variant = PostVariant(
-                post_id=post.id,
-                content=content
+        try:
+            # Create a new post
+            stmt = (
+                insert(Post)
+                .values(user_id=user_id, platform=platform, status=PostStatus.DRAFT)
+                .returning(Post.id, Post.created_at)
             )
-            db.add(variant)
-            variants.append(variant)
-        
-        await db.commit()
+            post_row = (await db.execute(stmt)).one()
+            
+            # Bulk insert all variants as a single multi-row INSERT
+            variant_rows = []
+            if variant_texts:
+                stmt = insert(PostVariant).returning(
+                    PostVariant.id,
+                    PostVariant.content,
+                    PostVariant.created_at,
+                    sort_by_parameter_order=True,
+                )
+                result = await db.execute(
+                    stmt,
+                    [{"post_id": post_row.id, "content": content} for content in variant_texts],
+                )
+                variant_rows = result.all()
+            
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
         
-        # Refresh variants to get their IDs
-        for variant in variants:
-            await db.refresh(variant)
+        # Cached per-user analysis (e.g. total_posts) now misses this post
+        await response_cache.invalidate_tags([user_tag(user_id)])
         
         return {
-            "post_id": post.id,
+            "post_id": post_row.id,
             "platform": platform.value,
+            "created_at": post_row.created_at,
             "variants": [
-                {"id": variant.id, "content": variant.content}
-                for variant in variants
+                {"id": row.id, "content": row.content, "created_at": row.created_at}
+                for row in variant_rows
             ]
         }
     
@@ -79,7 +100,8 @@ class PostService:
     async def publish_post(
         db: AsyncSession,
         post_id: int,
-        variant_id: Optional[int] = None
+        variant_id: Optional[int] = None,
+        user_id: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Publish a post immediately to the target platform.
@@ -88,12 +110,15 @@ class PostService:
             db: Database session
             post_id: Post ID to publish
             variant_id: Specific variant to publish (optional)
+            user_id: Only publish the post if it belongs to this user (optional)
             
         Returns:
             Status and response from the social network
         """
         # Get post
         stmt = select(Post).where(Post.id == post_id)
+        if user_id is not None:
+            stmt = stmt.where(Post.user_id == user_id)
         result = await db.execute(stmt)
         post = result.scalar_one_or_none()
         
@@ -129,9 +154,16 @@ class PostService:
         # Placeholder for actual API calls to social platforms
         sns_response = await PostService._publish_to_platform(platform, content)
         
+        # Keep the platform's post ID so engagement can be looked up in bulk later
+        if "id" in sns_response:
+            variant.external_id = str(sns_response["id"])
+            variant.published_at = datetime.utcnow()
+        
         # Update post status
         post.status = PostStatus.PUBLISHED
+        user_id = post.user_id
         await db.commit()
+        await response_cache.invalidate_tags([post_tag(post_id), user_tag(user_id)])
         
         return {
             "status": "published",
@@ -150,18 +182,24 @@ class PostService:
         Returns:
             Response from the platform API
         """
+        started = time.perf_counter()
         try:
             if platform == Platform.X:
-                return await PostService._publish_to_twitter(content)
+                response = await PostService._publish_to_twitter(content)
             elif platform == Platform.REDDIT:
-                return await PostService._publish_to_reddit(content)
+                response = await PostService._publish_to_reddit(content)
             elif platform == Platform.PRODUCTHUNT:
-                return await PostService._publish_to_producthunt(content)
+                response = await PostService._publish_to_producthunt(content)
             else:
-                return {"error": "Unsupported platform"}
+                response = {"error": "Unsupported platform"}
         except Exception as e:
             logger.error(f"Error publishing to {platform}: {str(e)}")
-            return {"error": str(e)}
+            response = {"error": str(e)}
+        
+        outcome = "error" if "error" in response else "success"
+        platform_label = platform.value if isinstance(platform, Platform) else str(platform)
+        PUBLISH_DURATION.labels(platform_label, outcome).observe(time.perf_counter() - started)
+        return response
     
     @staticmethod
     async def _publish_to_twitter(content: str) -> Dict[str, Any]:
@@ -206,7 +244,7 @@ class PostService:
         post_id: int
     ) -> Optional[Dict[str, Any]]:
         """
-        Get a post with all its variants.
+        Get a post with all its variants in a single query.
         
         Args:
             db: Database session
@@ -215,18 +253,120 @@ class PostService:
         Returns:
             Post data with variants or None if not found
         """
-        stmt = select(Post).where(Post.id == post_id)
+        stmt = (
+            select(Post)
+            .options(joinedload(Post.variants))
+            .where(Post.id == post_id)
+        )
         result = await db.execute(stmt)
-        post = result.scalar_one_or_none()
+        post = result.unique().scalar_one_or_none()
         
         if not post:
             return None
         
-        # Get variants
-        stmt = select(PostVariant).where(PostVariant.post_id == post_id)
+        return PostService._serialize_post(post)
+    
+    @staticmethod
+    async def list_posts(
+        db: AsyncSession,
+        user_id: int,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        platform: Optional[Platform] = None,
+        status: Optional[PostStatus] = None,
+        include_engagement: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        List a user's posts, newest first, using keyset pagination on (created_at, id).
+        
+        Each page costs a fixed number of queries regardless of its size:
+        one for the posts, one for their variants and, when requested, one
+        for the latest engagement snapshot of every variant on the page.
+        
+        Args:
+            db: Database session
+            user_id: Owner of the posts
+            limit: Maximum number of posts to return
+            cursor: Opaque cursor returned as next_cursor by the previous page
+            platform: Only return posts for this platform (optional)
+            status: Only return posts with this status (optional)
+            include_engagement: Embed the latest engagement stats per variant
+            
+        Returns:
+            Dictionary with the page items and the cursor for the next page
+        """
+        stmt = (
+            select(Post)
+            .options(selectinload(Post.variants))
+            .where(Post.user_id == user_id)
+        )
+        if platform is not None:
+            stmt = stmt.where(Post.platform == platform)
+        if status is not None:
+            stmt = stmt.where(Post.status == status)
+        if cursor:
+            created_at, post_id = PostService._decode_cursor(cursor)
+            stmt = stmt.where(tuple_(Post.created_at, Post.id) < tuple_(created_at, post_id))
+        
+        # Fetch one extra row to know whether another page exists
+        stmt = stmt.order_by(Post.created_at.desc(), Post.id.desc()).limit(limit + 1)
         result = await db.execute(stmt)
-        variants = result.scalars().all()
+        posts = result.scalars().all()
         
+        has_more = len(posts) > limit
+        posts = posts[:limit]
+        
+        latest: Dict[int, Engagement] = {}
+        if include_engagement:
+            variant_ids = [variant.id for post in posts for variant in post.variants]
+            latest = await PostService._get_latest_engagements(db, variant_ids)
+        
+        items = []
+        for post in posts:
+            item = PostService._serialize_post(post)
+            if include_engagement:
+                for variant in item["variants"]:
+                    engagement = latest.get(variant["id"])
+                    variant["latest_engagement"] = (
+                        {
+                            "likes": engagement.likes,
+                            "comments": engagement.comments,
+                            "shares": engagement.shares,
+                            "upvotes": engagement.upvotes,
+                            "captured_at": engagement.captured_at,
+                        }
+                        if engagement
+                        else None
+                    )
+            items.append(item)
+        
+        next_cursor = None
+        if has_more and posts:
+            next_cursor = PostService._encode_cursor(posts[-1].created_at, posts[-1].id)
+        
+        return {"items": items, "next_cursor": next_cursor}
+    
+    @staticmethod
+    async def _get_latest_engagements(
+        db: AsyncSession,
+        variant_ids: List[int]
+    ) -> Dict[int, Engagement]:
+        """Get the most recent engagement row for each variant with one DISTINCT ON query."""
+        if not variant_ids:
+            return {}
+        
+        stmt = (
+            select(Engagement)
+            .where(Engagement.post_variant_id.in_(variant_ids))
+            .distinct(Engagement.post_variant_id)
+            .order_by(Engagement.post_variant_id, Engagement.captured_at.desc())
+        )
+        result = await db.execute(stmt)
+        return {engagement.post_variant_id: engagement for engagement in result.scalars().all()}
+    
+    @staticmethod
+    def _serialize_post(post: Post) -> Dict[str, Any]:
+        """Convert a Post with loaded variants into a response dictionary."""
         return {
             "id": post.id,
             "user_id": post.user_id,
@@ -241,9 +381,25 @@ class PostService:
                     "content": variant.content,
                     "created_at": variant.created_at
                 }
-                for variant in variants
+                for variant in post.variants
             ]
         }
+    
+    @staticmethod
+    def _encode_cursor(created_at: datetime, post_id: int) -> str:
+        """Encode a (created_at, id) keyset position as an opaque cursor."""
+        raw = f"{created_at.isoformat()}|{post_id}".encode()
+        return base64.urlsafe_b64encode(raw).decode()
+    
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+        """Decode a cursor produced by _encode_cursor."""
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+            created_at, post_id = raw.rsplit("|", 1)
+            return datetime.fromisoformat(created_at), int(post_id)
+        except (ValueError, UnicodeDecodeError):
+            raise ValueError("Invalid pagination cursor")
 
 
 post_service = PostService()
\ No newline at end of file
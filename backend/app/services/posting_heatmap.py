@@ -0,0 +1,187 @@
+from typing import List, Dict, Any, Optional
+from datetime import datetime, timedelta
+from sqlalchemy import text, Float, cast
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.config import settings
+from app.models.engagement_rollup import PostingHeatmap
+from app.models.post import Platform
+from app.services.engagement_rollup import COUNTERS
+
+# Namespace of the transaction-level advisory locks held per variant while
+# the heatmap is updated (first key of pg_advisory_xact_lock(int, int))
+HEATMAP_LOCK_NAMESPACE = 0x4854  # "HT"
+
+# Serializes concurrent flushers (API workers, the poller) on the variants
+# they update, in a fixed order so two batches cannot deadlock. The locks
+# are held until the transaction ends.
+LOCK_HEATMAP_VARIANTS = text("""
+    SELECT count(pg_advisory_xact_lock(:namespace, v.post_variant_id))
+    FROM (
+        SELECT DISTINCT post_variant_id
+        FROM unnest(CAST(:variant_ids AS integer[])) AS u(post_variant_id)
+        ORDER BY post_variant_id
+    ) v
+""")
+
+# Adds each variant's engagement increase since the last batch to the cell of
+# the hour of week it was published in. Every CTE sees the table state from
+# before the statement, so "previous" holds the amounts counted so far. This
+# is only correct while no other transaction updates the same variants, which
+# LOCK_HEATMAP_VARIANTS guarantees: the statement runs after the lock is
+# granted, so its snapshot includes the previous holder's committed update.
+APPLY_HEATMAP = text("""
+    WITH batch AS (
+        SELECT b.post_variant_id, max(b.interactions) AS interactions
+        FROM unnest(CAST(:variant_ids AS integer[]), CAST(:interactions AS bigint[]))
+            AS b(post_variant_id, interactions)
+        GROUP BY b.post_variant_id
+    ),
+    previous AS (
+        SELECT h.post_variant_id, h.interactions
+        FROM posting_heatmap_variants h
+        JOIN batch b ON b.post_variant_id = h.post_variant_id
+    ),
+    counted AS (
+        INSERT INTO posting_heatmap_variants
+            (post_variant_id, user_id, platform, hour_of_week, interactions)
+        SELECT b.post_variant_id, p.user_id, p.platform,
+               CAST((EXTRACT(ISODOW FROM pv.published_at) - 1) * 24 + EXTRACT(HOUR FROM pv.published_at) AS smallint),
+               b.interactions
+        FROM batch b
+        JOIN post_variants pv ON pv.id = b.post_variant_id
+        JOIN posts p ON p.id = pv.post_id
+        WHERE pv.published_at IS NOT NULL
+        ON CONFLICT (post_variant_id) DO UPDATE SET
+            interactions = GREATEST(posting_heatmap_variants.interactions, EXCLUDED.interactions)
+        RETURNING post_variant_id, user_id, platform, hour_of_week, interactions
+    )
+    INSERT INTO posting_heatmap (user_id, platform, hour_of_week, posts, interactions)
+    SELECT c.user_id, c.platform, c.hour_of_week,
+           count(*) FILTER (WHERE prev.post_variant_id IS NULL),
+           CAST(sum(c.interactions - COALESCE(prev.interactions, 0)) AS bigint)
+    FROM counted c
+    LEFT JOIN previous prev ON prev.post_variant_id = c.post_variant_id
+    GROUP BY c.user_id, c.platform, c.hour_of_week
+    ON CONFLICT (user_id, platform, hour_of_week) DO UPDATE SET
+        posts = posting_heatmap.posts + EXCLUDED.posts,
+        interactions = posting_heatmap.interactions + EXCLUDED.interactions
+""")
+
+
+def next_occurrence(slot: int, after: datetime) -> datetime:
+    """First start of the given hour-of-week slot strictly after a datetime."""
+    week_start = (after - timedelta(days=after.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
+    candidate = week_start + timedelta(hours=slot)
+    if candidate <= after:
+        candidate += timedelta(days=7)
+    return candidate
+
+
+class PostingHeatmapService:
+    @staticmethod
+    async def apply_snapshots(
+        db: AsyncSession,
+        snapshots: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Fold a batch of engagement snapshots into the posting heatmap.
+
+        Only published variants are counted. Runs in the caller's
+        transaction, alongside the daily rollups, and holds a lock per
+        variant until it commits.
+
+        Args:
+            db: Database session
+            snapshots: Dicts with post_variant_id and counters
+        """
+        if not snapshots:
+            return
+        variant_ids = [s["post_variant_id"] for s in snapshots]
+        await db.execute(LOCK_HEATMAP_VARIANTS, {"namespace": HEATMAP_LOCK_NAMESPACE, "variant_ids": variant_ids})
+        await db.execute(APPLY_HEATMAP, {
+            "variant_ids": variant_ids,
+            "interactions": [sum(s.get(c, 0) for c in COUNTERS) for s in snapshots],
+        })
+
+    @staticmethod
+    async def get_heatmap(
+        db: AsyncSession,
+        user_id: int,
+        platform: Optional[Platform] = None,
+    ) -> Dict[str, Any]:
+        """
+        Read a user's posting heatmap.
+
+        Reads at most 168 precomputed cells per platform by primary key.
+
+        Args:
+            db: Database session
+            user_id: User ID
+            platform: Restrict to one platform (optional)
+
+        Returns:
+            Cells and best slot per platform value
+        """
+        stmt = (
+            select(PostingHeatmap)
+            .where(PostingHeatmap.user_id == user_id)
+            .order_by(PostingHeatmap.platform, PostingHeatmap.hour_of_week)
+        )
+        if platform is not None:
+            stmt = stmt.where(PostingHeatmap.platform == platform)
+
+        platforms: Dict[str, Dict[str, Any]] = {}
+        for row in (await db.execute(stmt)).scalars().all():
+            entry = platforms.setdefault(row.platform.value, {"cells": [], "best_hour_of_week": None})
+            entry["cells"].append({
+                "hour_of_week": row.hour_of_week,
+                "posts": row.posts,
+                "interactions": row.interactions,
+                "avg_interactions": row.interactions / row.posts if row.posts else 0.0,
+            })
+
+        for entry in platforms.values():
+            eligible = [c for c in entry["cells"] if c["posts"] >= settings.POSTING_HEATMAP_MIN_POSTS]
+            if eligible:
+                entry["best_hour_of_week"] = max(eligible, key=lambda c: c["avg_interactions"])["hour_of_week"]
+        return platforms
+
+    @staticmethod
+    async def best_slot(db: AsyncSession, user_id: int, platform: Platform) -> Optional[int]:
+        """Hour of week with the highest average engagement per post, if known."""
+        heatmap = PostingHeatmap
+        stmt = (
+            select(heatmap.hour_of_week)
+            .where(
+                heatmap.user_id == user_id,
+                heatmap.platform == platform,
+                heatmap.posts >= settings.POSTING_HEATMAP_MIN_POSTS,
+            )
+            .order_by((cast(heatmap.interactions, Float) / heatmap.posts).desc())
+            .limit(1)
+        )
+        return (await db.execute(stmt)).scalar_one_or_none()
+
+    @staticmethod
+    async def next_best_time(
+        db: AsyncSession,
+        user_id: int,
+        platform: Platform,
+        now: Optional[datetime] = None,
+    ) -> datetime:
+        """
+        Next start of the user's best posting slot on a platform.
+
+        Raises:
+            ValueError: When there is not enough engagement history yet
+        """
+        slot = await PostingHeatmapService.best_slot(db, user_id, platform)
+        if slot is None:
+            raise ValueError(f"Not enough engagement history to pick a posting time for {platform.value}")
+        earliest = (now or datetime.utcnow()) + timedelta(minutes=settings.AUTO_SCHEDULE_MIN_LEAD_MINUTES)
+        return next_occurrence(slot, earliest)
+
+
+posting_heatmap_service = PostingHeatmapService()
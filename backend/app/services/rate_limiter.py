@@ -0,0 +1,145 @@
+import math
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from loguru import logger
+
+from app.core.config import settings
+from app.core.ttl_cache import TTLCache
+from app.db.redis_client import async_redis_client
+
+KEY_PREFIX = "ratelimit"
+
+# GCRA (generic cell rate algorithm): one key per identifier holding the
+# theoretical arrival time (TAT) in milliseconds. Uses the Redis clock so
+# all workers agree on "now".
+#   ARGV[1] = emission interval (period / limit), ARGV[2] = period
+# Returns {allowed, remaining, retry_after_ms}
+GCRA_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = now_parts[1] * 1000 + math.floor(now_parts[2] / 1000)
+local emission = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+local new_tat = tat + emission
+local allow_at = new_tat - period
+if now < allow_at then
+    return {0, 0, allow_at - now}
+end
+redis.call('SET', KEYS[1], new_tat, 'PX', math.ceil(new_tat - now))
+return {1, math.floor((period - (new_tat - now)) / emission), 0}
+"""
+
+
+@dataclass
+class RateLimitRule:
+    limit: int    # Requests allowed per period (also the burst size)
+    period: float  # Seconds
+
+    @property
+    def emission_interval(self) -> float:
+        return self.period / self.limit
+
+
+@dataclass
+class RateLimitResult:
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float  # Seconds until the next request would be allowed
+
+    def headers(self) -> Dict[str, str]:
+        """Standard rate limit response headers."""
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(max(self.remaining, 0)),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(math.ceil(self.retry_after), 1))
+        return headers
+
+
+DEFAULT_RULE = RateLimitRule(limit=300, period=60)
+
+
+def parse_rules(spec: str) -> Dict[str, RateLimitRule]:
+    """Parse "route=limit/seconds,..." into rules."""
+    rules = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        route, rate = item.split("=", 1)
+        limit, period = rate.split("/", 1)
+        rules[route.strip()] = RateLimitRule(limit=int(limit), period=float(period))
+    return rules
+
+
+class RateLimiter:
+    """
+    Distributed rate limiter shared by all workers through Redis.
+
+    Each (route, identifier) pair is limited with GCRA, evaluated atomically
+    by a Lua script in a single round trip. GCRA behaves like a sliding
+    window with smooth refill but needs only one small key. If Redis is
+    unavailable, the same algorithm runs on a per-worker in-process table;
+    after a failure Redis is skipped for redis_cooldown seconds, so an
+    outage does not add a connection timeout to every request.
+    """
+
+    def __init__(self, rules: Dict[str, RateLimitRule], redis_cooldown: float, max_local_keys: int = 100000):
+        self.rules = rules
+        self.redis_cooldown = redis_cooldown
+        self._script = async_redis_client.register_script(GCRA_SCRIPT)
+        self._redis_retry_at = 0.0
+        self._local: TTLCache[float] = TTLCache(max_local_keys, ttl=max(
+            (rule.period for rule in rules.values()), default=60.0
+        ))
+
+    def rule_for(self, route: str) -> RateLimitRule:
+        return self.rules.get(route) or self.rules.get("default") or DEFAULT_RULE
+
+    async def hit(self, route: str, identifier: str, rule: Optional[RateLimitRule] = None) -> RateLimitResult:
+        """
+        Count one request and decide whether it is allowed.
+
+        Args:
+            route: Rule name (falls back to "default")
+            identifier: Client IP, user ID or any other key to limit on
+            rule: Override the configured rule
+
+        Returns:
+            RateLimitResult
+        """
+        rule = rule or self.rule_for(route)
+        key = f"{KEY_PREFIX}:{route}:{identifier}"
+        if time.monotonic() >= self._redis_retry_at:
+            try:
+                allowed, remaining, retry_ms = await self._script(
+                    keys=[key],
+                    args=[rule.emission_interval * 1000, rule.period * 1000],
+                )
+                return RateLimitResult(bool(allowed), rule.limit, int(remaining), float(retry_ms) / 1000)
+            except Exception as e:
+                # Open the circuit: use local limits until the cooldown ends
+                self._redis_retry_at = time.monotonic() + self.redis_cooldown
+                logger.warning(
+                    f"Redis rate limiter unavailable, using local limits for {self.redis_cooldown:g}s: {str(e)}"
+                )
+        return self._hit_local(key, rule)
+
+    def _hit_local(self, key: str, rule: RateLimitRule) -> RateLimitResult:
+        """In-process GCRA; limits apply per worker."""
+        now = time.time()
+        tat = max(self._local.get(key) or now, now)
+        new_tat = tat + rule.emission_interval
+        allow_at = new_tat - rule.period
+        if now < allow_at:
+            return RateLimitResult(False, rule.limit, 0, allow_at - now)
+        self._local.set(key, new_tat, expires_at=new_tat)
+        remaining = int((rule.period - (new_tat - now)) / rule.emission_interval)
+        return RateLimitResult(True, rule.limit, remaining, 0.0)
+
+
+rate_limiter = RateLimiter(parse_rules(settings.RATE_LIMIT_RULES), redis_cooldown=settings.RATE_LIMIT_REDIS_COOLDOWN)
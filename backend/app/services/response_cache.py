@@ -0,0 +1,241 @@
+import asyncio
+import hashlib
+import json
+import zlib
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from loguru import logger
+
+from app.core.config import settings
+from app.core.responses import dumps
+from app.db.redis_client import async_redis_client
+
+KEY_PREFIX = "cache:analysis"
+TAG_PREFIX = "cache:tag"
+GENERATION_PREFIX = "cache:gen"
+
+# Store an entry and register it under its tags, unless one of the tags was
+# invalidated since the caller read its generation.
+#   KEYS = [entry, tag sets..., generations...]
+#   ARGV = [payload, ttl, check (0/1), expected generations...]
+SET_IF_CURRENT_SCRIPT = """
+local tags = (#KEYS - 1) / 2
+if ARGV[3] == '1' then
+    for i = 1, tags do
+        if (redis.call('GET', KEYS[1 + tags + i]) or '0') ~= ARGV[3 + i] then
+            return 0
+        end
+    end
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+for i = 1, tags do
+    redis.call('SADD', KEYS[1 + i], KEYS[1])
+    redis.call('EXPIRE', KEYS[1 + i], ARGV[2])
+end
+return 1
+"""
+
+# First byte of every stored payload: plain or zlib-compressed JSON
+_RAW = b"j"
+_COMPRESSED = b"z"
+
+
+def post_tag(post_id: int) -> str:
+    return f"post:{post_id}"
+
+
+def user_tag(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+class ResponseCache:
+    """
+    Redis-backed cache for analysis endpoint responses.
+
+    Entries are keyed by endpoint, user and request parameters and stored as
+    compact JSON (zlib-compressed above a size threshold). Each entry is
+    registered under tags such as post:<id> and user:<id>, so writing new
+    engagement data for a post drops exactly the responses derived from it.
+
+    Concurrent misses for the same key within a process are coalesced into
+    a single computation that every caller awaits. Every tag also has a generation counter that
+    invalidation increments; a response computed while one of its tags was
+    invalidated is not stored. When Redis is unavailable every call computes
+    the response directly.
+    """
+
+    def __init__(self, ttl: int, compress_min_bytes: int, enabled: bool = True):
+        self.ttl = ttl
+        self.compress_min_bytes = compress_min_bytes
+        self.enabled = enabled
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._set_if_current = async_redis_client.register_script(SET_IF_CURRENT_SCRIPT)
+
+    @staticmethod
+    def make_key(endpoint: str, user_id: int, **params: Any) -> str:
+        """Build a cache key; parameter order does not matter."""
+        encoded = json.dumps(jsonable_encoder(params), sort_keys=True, separators=(",", ":"))
+        digest = hashlib.sha1(encoded.encode()).hexdigest()[:16]
+        return f"{KEY_PREFIX}:{endpoint}:{user_id}:{digest}"
+
+    def _dumps(self, value: Any) -> bytes:
+        data = dumps(value)
+        if len(data) >= self.compress_min_bytes:
+            return _COMPRESSED + zlib.compress(data)
+        return _RAW + data
+
+    @staticmethod
+    def _loads(payload: bytes) -> Any:
+        data = payload[1:]
+        if payload[:1] == _COMPRESSED:
+            data = zlib.decompress(data)
+        return orjson.loads(data)
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the cached response, or None on a miss."""
+        if not self.enabled:
+            return None
+        try:
+            payload = await async_redis_client.get(key)
+            return self._loads(payload) if payload is not None else None
+        except Exception as e:
+            logger.warning(f"Response cache read failed for {key}: {str(e)}")
+            return None
+
+    async def generations(self, tags: List[str]) -> List[str]:
+        """Current generation of each tag ("0" if never invalidated)."""
+        values = await async_redis_client.mget([f"{GENERATION_PREFIX}:{tag}" for tag in tags])
+        return [value.decode() if value is not None else "0" for value in values]
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        tags: Iterable[str],
+        generations: Optional[List[str]] = None,
+    ) -> bool:
+        """
+        Store a response and register it under the given tags.
+
+        Args:
+            key: Key from make_key
+            value: Response to store
+            tags: Tags the response depends on
+            generations: Tag generations read before computing the response;
+                the entry is not stored if any of them has changed since
+
+        Returns:
+            Whether the entry was stored
+        """
+        if not self.enabled:
+            return False
+        tags = list(tags)
+        try:
+            stored = await self._set_if_current(
+                keys=[key, *[f"{TAG_PREFIX}:{tag}" for tag in tags], *[f"{GENERATION_PREFIX}:{tag}" for tag in tags]],
+                args=[self._dumps(value), self.ttl, 0 if generations is None else 1, *(generations or [])],
+            )
+            return bool(stored)
+        except Exception as e:
+            logger.warning(f"Response cache write failed for {key}: {str(e)}")
+            return False
+
+    async def get_or_compute(
+        self,
+        key: str,
+        tags: Iterable[str],
+        compute: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        Return the cached response for key, computing and storing it on a miss.
+
+        Args:
+            key: Key from make_key
+            tags: Tags the response depends on
+            compute: Coroutine factory producing the response
+
+        Returns:
+            The response, as JSON-compatible data when served from the cache
+        """
+        cached = await self.get(key)
+        if cached is not None:
+            return cached
+        if not self.enabled:
+            return await compute()
+
+        task = self._inflight.get(key)
+        if task is not None and not task.done():
+            try:
+                # Shielded so a waiter going away does not cancel the others
+                return await asyncio.shield(task)
+            except asyncio.CancelledError:
+                if not task.cancelled():
+                    raise
+                # The request that started the computation was cancelled;
+                # start over, this caller becoming the new owner
+                return await self.get_or_compute(key, tags, compute)
+
+        # compute() may use the owner's DB session, so the owner awaits the
+        # task directly: if it is cancelled, the computation stops with it
+        task = asyncio.ensure_future(self._compute_and_store(key, list(tags), compute))
+        self._inflight[key] = task
+        task.add_done_callback(lambda done: self._forget(key, done))
+        return await task
+
+    async def _compute_and_store(
+        self,
+        key: str,
+        tags: List[str],
+        compute: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        try:
+            generations = await self.generations(tags)
+        except Exception as e:
+            logger.warning(f"Response cache read failed for {key}: {str(e)}")
+            return await compute()
+        value = await compute()
+        # Skipped if new data invalidated a tag while computing
+        await self.set(key, value, tags, generations)
+        return value
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark a failure as retrieved even if every waiter went away
+            task.exception()
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """
+        Drop every entry registered under any of the tags and advance their
+        generations, so responses still being computed are not stored.
+
+        Returns:
+            Number of cache keys deleted
+        """
+        tag_keys: List[str] = [f"{TAG_PREFIX}:{tag}" for tag in set(tags)]
+        if not self.enabled or not tag_keys:
+            return 0
+        try:
+            async with async_redis_client.pipeline(transaction=False) as pipe:
+                for tag_key in tag_keys:
+                    pipe.smembers(tag_key)
+                for tag in set(tags):
+                    # Outlives every entry computed before the invalidation
+                    pipe.incr(f"{GENERATION_PREFIX}:{tag}")
+                    pipe.expire(f"{GENERATION_PREFIX}:{tag}", self.ttl * 2)
+                keys = set().union(*(await pipe.execute())[:len(tag_keys)])
+            await async_redis_client.delete(*keys, *tag_keys)
+            return len(keys)
+        except Exception as e:
+            logger.warning(f"Response cache invalidation failed: {str(e)}")
+            return 0
+
+
+response_cache = ResponseCache(
+    ttl=settings.RESPONSE_CACHE_TTL,
+    compress_min_bytes=settings.RESPONSE_CACHE_COMPRESS_MIN_BYTES,
+    enabled=settings.RESPONSE_CACHE_ENABLED,
+)
@@ -1,14 +1,42 @@
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+import asyncio
+from typing import List, Dict, Any, Optional, Tuple, Union
+from datetime import datetime, timezone
 import json
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from loguru import logger
 
-from app.db.redis_client import redis_client, schedule_queue
-from app.models.post import Post, PostStatus
+from app.db.redis_client import RedisScheduler, async_redis_client, get_schedule_queue
+from app.models.post import Platform, Post, PostStatus
 from app.models.post_variant import PostVariant
 from app.services.post_service import post_service
+from app.services.posting_heatmap import posting_heatmap_service
+
+# scheduled_at に指定すると、ユーザーの投稿時間ヒートマップから最適な時間を選ぶ
+AUTO_SCHEDULE = "auto"
+
+
+def scheduled_job_id(post_id: int, variant_id: int) -> str:
+    """schedule_post が RQ に登録するジョブのID"""
+    return f"post:{post_id}:variant:{variant_id}"
+
+
+def parse_scheduled_job_id(job_id: str) -> Optional[Tuple[int, int]]:
+    """scheduled_job_id の形式のジョブIDを (post_id, variant_id) に戻す（形式が違う場合は None）"""
+    parts = job_id.split(":")
+    if len(parts) != 4 or parts[0] != "post" or parts[2] != "variant":
+        return None
+    try:
+        return int(parts[1]), int(parts[3])
+    except ValueError:
+        return None
+
+
+def to_naive_utc(value: datetime) -> datetime:
+    """タイムゾーン付きの日時をUTCのnaiveな日時に変換する（DBとジョブはnaiveなUTCで扱う）"""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
 
 
 class ScheduleService:
@@ -17,8 +45,9 @@ class ScheduleService:
         db: AsyncSession,
         post_id: int,
         variant_id: int,
-        scheduled_at: datetime
-    ) -> Dict[str, Any]:
+        scheduled_at: Union[datetime, str],
+        user_id: int
+    ) -> Optional[Dict[str, Any]]:
         """
         Schedule a post for future publication.
         
@@ -26,18 +55,21 @@ class ScheduleService:
             db: Database session
             post_id: Post ID to schedule
             variant_id: Variant ID to publish
-            scheduled_at: When to publish the post
+            scheduled_at: When to publish the post (naive values are UTC),
+                or "auto" to use the next start of the user's best hour of
+                week on the platform
+            user_id: Owner of the post
             
         Returns:
-            Scheduling status and job ID
+            Scheduling status and job ID, or None if the user has no such post
         """
-        # Verify post exists
-        stmt = select(Post).where(Post.id == post_id)
+        # Verify the post exists and belongs to the user
+        stmt = select(Post).where(Post.id == post_id, Post.user_id == user_id)
         result = await db.execute(stmt)
         post = result.scalar_one_or_none()
         
         if not post:
-            raise ValueError(f"Post with ID {post_id} not found")
+            return None
         
         # Verify variant exists
         stmt = select(PostVariant).where(
@@ -50,6 +82,10 @@ class ScheduleService:
         if not variant:
             raise ValueError(f"Variant ID {variant_id} not found for post ID {post_id}")
         
+        if scheduled_at == AUTO_SCHEDULE:
+            scheduled_at = await posting_heatmap_service.next_best_time(db, post.user_id, post.platform)
+        scheduled_at = to_naive_utc(scheduled_at)
+        
         # Update post scheduled time and status
         post.scheduled_at = scheduled_at
         post.status = PostStatus.SCHEDULED
@@ -76,9 +112,10 @@ class ScheduleService:
                 "result": publish_result
             }
         
-        # Schedule job with RQ
-        job_id = f"post:{post_id}:variant:{variant_id}"
-        job = schedule_queue.enqueue_in(
+        # Schedule job with RQ (the RQ client is synchronous, so run it off the event loop)
+        job_id = scheduled_job_id(post_id, variant_id)
+        job = await asyncio.to_thread(
+            get_schedule_queue().enqueue_in,
             time_delta=time_diff,
             func="app.tasks.scheduler.publish_scheduled_post",
             post_id=post_id,
@@ -88,7 +125,7 @@ class ScheduleService:
         
         # Store additional metadata in Redis
         redis_key = f"schedule:post:{post_id}"
-        await redis_client.set(redis_key, json.dumps(job_data))
+        await async_redis_client.set(redis_key, json.dumps(job_data))
         
         return {
             "status": "scheduled",
@@ -96,13 +133,119 @@ class ScheduleService:
             "scheduled_at": scheduled_at.isoformat()
         }
     
+    @staticmethod
+    async def list_scheduled_jobs(
+        db: AsyncSession,
+        user_id: int,
+        platform: Optional[Platform] = None,
+        limit: int = 50,
+        offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """
+        List the user's scheduled posts together with their RQ job IDs.
+        
+        Args:
+            db: Database session
+            user_id: Owner of the posts
+            platform: Only list jobs for this platform (optional)
+            limit: Maximum number of jobs
+            offset: Number of jobs to skip
+            
+        Returns:
+            Jobs ordered by scheduled time
+        """
+        stmt = select(Post.id, Post.platform, Post.scheduled_at).where(
+            Post.user_id == user_id,
+            Post.status == PostStatus.SCHEDULED
+        )
+        if platform is not None:
+            stmt = stmt.where(Post.platform == platform)
+        stmt = stmt.order_by(Post.scheduled_at, Post.id).limit(limit).offset(offset)
+        rows = (await db.execute(stmt)).all()
+        if not rows:
+            return []
+        
+        # The variant to publish is only kept in the job metadata
+        metadata = await async_redis_client.mget([f"schedule:post:{row.id}" for row in rows])
+        jobs = []
+        for row, job_data in zip(rows, metadata):
+            if job_data is None:
+                continue
+            variant_id = json.loads(job_data)["variant_id"]
+            jobs.append({
+                "job_id": scheduled_job_id(row.id, variant_id),
+                "post_id": row.id,
+                "variant_id": variant_id,
+                "platform": row.platform,
+                "scheduled_at": row.scheduled_at
+            })
+        return jobs
+    
+    @staticmethod
+    async def get_scheduled_job(db: AsyncSession, job_id: str, user_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Get a scheduled job of the user with its RQ status.
+        
+        Returns:
+            Job details, or None if the user has no such job
+        """
+        ids = parse_scheduled_job_id(job_id)
+        if ids is None:
+            return None
+        post_id, variant_id = ids
+        
+        stmt = select(Post).where(Post.id == post_id, Post.user_id == user_id)
+        post = (await db.execute(stmt)).scalar_one_or_none()
+        if not post:
+            return None
+        
+        job = await asyncio.to_thread(get_schedule_queue().fetch_job, job_id)
+        if job is None:
+            return None
+        return {
+            "job_id": job_id,
+            "post_id": post_id,
+            "variant_id": variant_id,
+            "platform": post.platform,
+            "scheduled_at": post.scheduled_at,
+            "status": (await asyncio.to_thread(job.get_status)).value
+        }
+    
+    @staticmethod
+    async def cancel_scheduled_job(db: AsyncSession, job_id: str, user_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Cancel a scheduled job of the user and return the post to draft.
+        
+        Returns:
+            Cancellation status, or None if the user has no such job
+        """
+        ids = parse_scheduled_job_id(job_id)
+        if ids is None:
+            return None
+        post_id, _ = ids
+        
+        stmt = select(Post).where(Post.id == post_id, Post.user_id == user_id)
+        post = (await db.execute(stmt)).scalar_one_or_none()
+        if not post:
+            return None
+        
+        if not await asyncio.to_thread(RedisScheduler.cancel_job, job_id):
+            return None
+        
+        if post.status == PostStatus.SCHEDULED:
+            post.status = PostStatus.DRAFT
+            post.scheduled_at = None
+            await db.commit()
+        await async_redis_client.delete(f"schedule:post:{post_id}")
+        return {"status": "cancelled"}
+    
     @staticmethod
     async def get_schedule_jobs() -> list:
         """
         Redis キュー "schedule_queue" からすべてのジョブを取得してリストで返す。
         """
         jobs = []
-        job_list = redis_client.lrange("schedule_queue", 0, -1)
+        job_list = await async_redis_client.lrange("schedule_queue", 0, -1)
         for job_data in job_list:
             try:
                 job = json.loads(job_data)
@@ -116,12 +259,12 @@ class ScheduleService:
         """
         指定された job_id のジョブを Redis キューから削除し、キャンセル処理を行う。
         """
-        job_list = redis_client.lrange("schedule_queue", 0, -1)
+        job_list = await async_redis_client.lrange("schedule_queue", 0, -1)
         for job_data in job_list:
             try:
                 job = json.loads(job_data)
                 if job.get("job_id") == job_id:
-                    redis_client.lrem("schedule_queue", 1, job_data)
+                    await async_redis_client.lrem("schedule_queue", 1, job_data)
                     return {"status": "cancelled"}
             except Exception:
                 continue
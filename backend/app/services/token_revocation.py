@@ -0,0 +1,181 @@
+import asyncio
+import time
+from typing import Optional
+
+from loguru import logger
+
+from app.core.bloom import BloomFilter
+from app.core.config import settings
+from app.db.redis_client import async_redis_client
+
+KEY_PREFIX = "auth:revoked"
+CHANNEL = "auth:revocations"
+
+
+class TokenRevocationList:
+    """
+    Revoked access tokens, checked on every authenticated request.
+
+    The source of truth is one Redis key per revoked token ID (jti) that
+    expires together with the token. Each worker mirrors the IDs in a local
+    Bloom filter, fed by a pub/sub subscription and rebuilt periodically so
+    expired IDs fall out. A Bloom miss, the common case, answers the check
+    from memory. Only a Bloom hit is confirmed against Redis.
+
+    If the subscription drops, the listener re-subscribes with exponential
+    backoff and rebuilds the filter, picking up anything revoked while it
+    was disconnected.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        error_rate: float,
+        rebuild_interval: float,
+        reconnect_min_delay: float,
+        reconnect_max_delay: float,
+    ):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.rebuild_interval = rebuild_interval
+        self.reconnect_min_delay = reconnect_min_delay
+        self.reconnect_max_delay = reconnect_max_delay
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._rebuilding: Optional[BloomFilter] = None
+        self._pubsub = None
+        self._listener: Optional[asyncio.Task] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def revoke(self, jti: str, expires_at: float) -> None:
+        """
+        Revoke a token until it would have expired anyway.
+
+        Args:
+            jti: Token ID
+            expires_at: Token exp (epoch seconds)
+        """
+        ttl = int(expires_at - time.time()) + 1
+        if ttl <= 0:
+            return
+        self._bloom.add(jti)
+        async with async_redis_client.pipeline(transaction=False) as pipe:
+            pipe.set(f"{KEY_PREFIX}:{jti}", 1, ex=ttl)
+            pipe.publish(CHANNEL, jti)
+            await pipe.execute()
+
+    async def is_revoked(self, jti: Optional[str]) -> bool:
+        """Whether a token ID has been revoked."""
+        if not jti or not self._bloom.might_contain(jti):
+            return False
+        try:
+            return bool(await async_redis_client.exists(f"{KEY_PREFIX}:{jti}"))
+        except Exception as e:
+            # Possible false positive; fail closed for tokens the filter flags
+            logger.warning(f"Revocation check failed: {str(e)}")
+            return True
+
+    async def rebuild(self) -> int:
+        """
+        Reload the Bloom filter from Redis, dropping expired token IDs.
+
+        Returns:
+            Number of revoked token IDs loaded
+        """
+        bloom = BloomFilter(self.capacity, self.error_rate)
+        # Revocations published while scanning go into both filters
+        self._rebuilding = bloom
+        try:
+            prefix_length = len(KEY_PREFIX) + 1
+            async for key in async_redis_client.scan_iter(match=f"{KEY_PREFIX}:*", count=1000):
+                bloom.add(key.decode()[prefix_length:])
+            self._bloom = bloom
+        finally:
+            self._rebuilding = None
+        if bloom.count > self.capacity:
+            logger.warning(
+                f"{bloom.count} revoked tokens exceed the Bloom filter capacity of {self.capacity}; "
+                f"raise REVOCATION_BLOOM_CAPACITY"
+            )
+        return bloom.count
+
+    def _on_message(self, message) -> None:
+        jti = message["data"].decode()
+        self._bloom.add(jti)
+        rebuilding = self._rebuilding
+        if rebuilding is not None:
+            rebuilding.add(jti)
+
+    async def run(self) -> None:
+        """Rebuild the filter periodically until cancelled."""
+        while True:
+            await asyncio.sleep(self.rebuild_interval)
+            try:
+                await self.rebuild()
+            except Exception as e:
+                logger.error(f"Error rebuilding revocation filter: {str(e)}")
+
+    async def _subscribe(self) -> int:
+        """Open a new subscription, then reload the filter from Redis."""
+        # Subscribe first so nothing revoked during the load is missed
+        self._pubsub = async_redis_client.pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.subscribe(**{CHANNEL: self._on_message})
+        return await self.rebuild()
+
+    async def _close_pubsub(self) -> None:
+        pubsub, self._pubsub = self._pubsub, None
+        if pubsub is None:
+            return
+        try:
+            await pubsub.reset()
+        except Exception as e:
+            logger.warning(f"Error closing revocation subscription: {str(e)}")
+
+    async def listen(self) -> None:
+        """Deliver published revocations until cancelled, re-subscribing after a failure."""
+        delay = self.reconnect_min_delay
+        while True:
+            try:
+                if self._pubsub is None:
+                    count = await self._subscribe()
+                    logger.info(f"Re-subscribed to token revocations, loaded {count} revoked token IDs")
+                delay = self.reconnect_min_delay
+                # Without an exception_handler, run() raises on a connection error
+                await self._pubsub.run()
+            except Exception as e:
+                logger.error(f"Token revocation subscription failed, retrying in {delay:g}s: {str(e)}")
+            await self._close_pubsub()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.reconnect_max_delay)
+
+    async def start(self) -> None:
+        """Subscribe to revocations, load revoked IDs and start the listener and periodic rebuilds."""
+        try:
+            count = await self._subscribe()
+            logger.info(f"Loaded {count} revoked token IDs")
+        except Exception as e:
+            # The listener keeps retrying in the background
+            logger.error(f"Error subscribing to token revocations: {str(e)}")
+            await self._close_pubsub()
+        self._listener = asyncio.create_task(self.listen())
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        for task in (self._task, self._listener):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = None
+        self._listener = None
+        await self._close_pubsub()
+
+
+token_revocation = TokenRevocationList(
+    capacity=settings.REVOCATION_BLOOM_CAPACITY,
+    error_rate=settings.REVOCATION_BLOOM_ERROR_RATE,
+    rebuild_interval=settings.REVOCATION_REBUILD_INTERVAL,
+    reconnect_min_delay=settings.REVOCATION_RECONNECT_MIN_DELAY,
+    reconnect_max_delay=settings.REVOCATION_RECONNECT_MAX_DELAY,
+)
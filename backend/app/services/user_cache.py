@@ -0,0 +1,82 @@
+import hashlib
+from typing import Optional, Tuple
+
+from loguru import logger
+
+from app.core.config import settings
+from app.core.ttl_cache import TTLCache
+from app.db.redis_client import async_redis_client
+from app.schemas.user_schemas import User
+
+REDIS_KEY_PREFIX = "auth:user"
+
+
+def token_key(token: str) -> str:
+    """Cache key for a raw token; the token itself is never stored."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class UserCache:
+    """
+    Two-level cache used to resolve the authenticated user.
+
+    Verified tokens are remembered by hash together with their subject and
+    exp, so a repeated token skips JWT decoding and is dropped once it
+    expires. Users are cached by subject in process, backed by Redis
+    (optional) so a new worker does not have to hit the database.
+    invalidate() must be called whenever a user row changes. Other workers
+    pick up the change after at most USER_CACHE_TTL seconds.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, use_redis: bool = True):
+        self.ttl = ttl
+        self.use_redis = use_redis
+        self._tokens: TTLCache[Tuple[str, Optional[str], float]] = TTLCache(maxsize, ttl=float("inf"))
+        self._users: TTLCache[User] = TTLCache(maxsize, ttl=ttl)
+
+    def get_token(self, token: str) -> Optional[Tuple[str, Optional[str], float]]:
+        """(subject, jti, exp) of a previously verified, unexpired token."""
+        return self._tokens.get(token_key(token))
+
+    def set_token(self, token: str, subject: str, jti: Optional[str], expires_at: float) -> None:
+        self._tokens.set(token_key(token), (subject, jti, expires_at), expires_at=expires_at)
+
+    async def get_user(self, subject: str) -> Optional[User]:
+        user = self._users.get(subject)
+        if user is not None or not self.use_redis:
+            return user
+        try:
+            payload = await async_redis_client.get(f"{REDIS_KEY_PREFIX}:{subject}")
+        except Exception as e:
+            logger.warning(f"User cache read failed: {str(e)}")
+            return None
+        if payload is None:
+            return None
+        user = User.model_validate_json(payload)
+        self._users.set(subject, user)
+        return user
+
+    async def set_user(self, subject: str, user: User) -> None:
+        self._users.set(subject, user)
+        if self.use_redis:
+            try:
+                await async_redis_client.set(f"{REDIS_KEY_PREFIX}:{subject}", user.model_dump_json(), ex=int(self.ttl))
+            except Exception as e:
+                logger.warning(f"User cache write failed: {str(e)}")
+
+    async def invalidate(self, user_id: int) -> None:
+        """Forget a user after its row was created or changed."""
+        subject = str(user_id)
+        self._users.pop(subject)
+        if self.use_redis:
+            try:
+                await async_redis_client.delete(f"{REDIS_KEY_PREFIX}:{subject}")
+            except Exception as e:
+                logger.warning(f"User cache invalidation failed: {str(e)}")
+
+
+user_cache = UserCache(
+    maxsize=settings.USER_CACHE_SIZE,
+    ttl=settings.USER_CACHE_TTL,
+    use_redis=settings.USER_CACHE_REDIS_ENABLED,
+)
@@ -0,0 +1,164 @@
+import asyncio
+from collections import OrderedDict
+from dataclasses import replace
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.services.engagement_analytics import (
+    LatestEngagement,
+    SignificanceResult,
+    VariantComparison,
+    engagement_analytics,
+)
+
+# Gamma(shape, rate) prior on interactions per hour: one interaction per
+# hour on average, weak enough that a few hours of data dominate it
+PRIOR_SHAPE = 1.0
+PRIOR_RATE = 1.0
+
+# Shortest exposure credited to a variant, in hours
+MIN_EXPOSURE_HOURS = 1.0
+
+
+class VariantSignificanceEngine:
+    """
+    Bayesian A/B comparison of post variants.
+
+    Each variant's engagement is modelled as a Poisson process with a
+    Gamma-distributed rate. Posterior rates are sampled for all variants at
+    once and the share of draws in which a variant has the highest rate is
+    its probability of being the winner.
+
+    Only the latest values and first/last capture times of each variant
+    are loaded. Results are cached per (post, metric) and the posterior is
+    re-sampled only when those values change.
+    """
+
+    def __init__(self, samples: int, credible_level: float, cache_size: int):
+        self.samples = samples
+        self.credible_level = credible_level
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[int, str], Tuple[tuple, VariantComparison]]" = OrderedDict()
+
+    @staticmethod
+    def exposure_hours(
+        latest: LatestEngagement,
+        published_at: Dict[int, Optional[datetime]],
+    ) -> np.ndarray:
+        """
+        Hours each variant has been collecting engagement, aligned with
+        latest.variant_ids.
+
+        Measured from publication (or the first snapshot when the
+        publication time is unknown) to the latest snapshot.
+        """
+        first = latest.first_captured_at
+        last = latest.last_captured_at
+
+        published = np.array(
+            [published_at.get(int(v)) or np.datetime64("NaT") for v in latest.variant_ids],
+            dtype="datetime64[us]",
+        )
+        known = ~np.isnat(published)
+        start = first.copy()
+        start[known] = published[known].astype(np.int64) / 1e6
+        return np.maximum((last - np.minimum(start, last)) / 3600, MIN_EXPOSURE_HOURS)
+
+    def posterior(
+        self,
+        variant_ids: np.ndarray,
+        counts: np.ndarray,
+        exposures: np.ndarray,
+        seed: Optional[int] = None,
+    ) -> SignificanceResult:
+        """
+        Sample the posterior rates of all variants and summarise them.
+
+        Args:
+            variant_ids: (v,) variant IDs
+            counts: (v,) observed interactions per variant
+            exposures: (v,) exposure per variant in hours
+            seed: Random seed, so repeated evaluations agree
+
+        Returns:
+            SignificanceResult with winner probabilities and credible intervals
+        """
+        rng = np.random.default_rng(seed)
+        shape = PRIOR_SHAPE + np.asarray(counts, dtype=np.float64)
+        rate = PRIOR_RATE + np.asarray(exposures, dtype=np.float64)
+
+        # (samples, variants) draws in a single call
+        draws = rng.gamma(shape, 1.0 / rate, size=(self.samples, len(shape)))
+        wins = np.bincount(draws.argmax(axis=1), minlength=len(shape)) / self.samples
+
+        tail = (1.0 - self.credible_level) / 2
+        lower, upper = np.quantile(draws, [tail, 1.0 - tail], axis=0)
+        ids = [int(v) for v in variant_ids]
+        return SignificanceResult(
+            winner_probabilities={v: round(float(p), 4) for v, p in zip(ids, wins)},
+            credible_intervals={
+                v: (round(float(lo), 4), round(float(hi), 4)) for v, lo, hi in zip(ids, lower, upper)
+            },
+            posterior_rates={v: round(float(m), 4) for v, m in zip(ids, shape / rate)},
+            credible_level=self.credible_level,
+            samples=self.samples,
+        )
+
+    async def evaluate(
+        self,
+        db: AsyncSession,
+        post_id: int,
+        metric: str,
+        published_at: Dict[int, Optional[datetime]],
+    ) -> Optional[VariantComparison]:
+        """
+        Compare the variants of a post, reusing the cached result while the
+        latest values and capture times are unchanged.
+
+        Args:
+            db: Database session
+            post_id: Post ID
+            metric: One of likes, comments, shares, upvotes, engagement_rate
+            published_at: Publication time per variant ID
+
+        Returns:
+            A copy of the VariantComparison with significance set (callers
+            may modify it), or None when there is no engagement data
+        """
+        key = (post_id, metric)
+        latest = await engagement_analytics.load_latest(db, list(published_at))
+        # Publication times feed the exposure, so they are part of the version
+        version = (latest.fingerprint(), tuple(sorted(published_at.items())))
+
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] == version:
+            self._cache.move_to_end(key)
+            return replace(cached[1])
+
+        comparison = engagement_analytics.compare_latest(latest, metric)
+        if comparison is None:
+            return None
+
+        counts = latest.metrics[metric]
+        exposures = self.exposure_hours(latest, published_at)
+        # Sampling is CPU-bound; keep it off the event loop
+        comparison.significance = await asyncio.to_thread(
+            self.posterior, latest.variant_ids, counts, exposures, post_id
+        )
+
+        self._cache[key] = (version, comparison)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return replace(comparison)
+
+
+variant_significance = VariantSignificanceEngine(
+    samples=settings.AB_POSTERIOR_SAMPLES,
+    credible_level=settings.AB_CREDIBLE_LEVEL,
+    cache_size=settings.AB_RESULT_CACHE_SIZE,
+)
@@ -0,0 +1,238 @@
+# backend/app/tasks/engagement_poller.py
+import asyncio
+import heapq
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.core.logger import logger, setup_logger
+from app.db.session import AsyncSessionLocal
+from app.models.post import Post, Platform, PostStatus
+from app.models.post_variant import PostVariant
+from app.services.analysis_service import fetch_latest_engagements_for_posts
+from app.services.engagement_history import engagement_history
+
+# プラットフォームごとの同時リクエスト数の上限
+PLATFORM_CONCURRENCY = {
+    Platform.X: settings.ENGAGEMENT_POLL_CONCURRENCY_X,
+    Platform.REDDIT: settings.ENGAGEMENT_POLL_CONCURRENCY_REDDIT,
+    Platform.PRODUCTHUNT: settings.ENGAGEMENT_POLL_CONCURRENCY_PRODUCTHUNT,
+}
+
+# 次回の確認までの最大待機秒数（新規投稿の検出を遅らせないため）
+MAX_IDLE_SLEEP = 5.0
+
+
+@dataclass
+class PollState:
+    """投稿ごとのポーリング状態"""
+    post_id: int
+    platform: Platform
+    published_at: datetime
+    interval: float
+    next_poll_at: float
+    last_polled_at: Optional[float] = None
+    last_total: Optional[int] = None
+    velocity: Optional[float] = None  # インタラクション数/秒
+
+
+class EngagementPoller:
+    """
+    公開済みの投稿のエンゲージメントを適応的な間隔で取得するバックグラウンドワーカー
+
+    新しい投稿ほど短い間隔で取得し、エンゲージメントの増加速度が落ちるにつれて
+    間隔を延ばします。取得はプラットフォームごとにまとめて一括で行い、
+    同時実行数はプラットフォームごとに制限します。
+    """
+
+    def __init__(self):
+        self.states: Dict[int, PollState] = {}
+        self._queue: List[Tuple[float, int]] = []
+        self._semaphores = {
+            platform: asyncio.Semaphore(max(limit, 1)) for platform, limit in PLATFORM_CONCURRENCY.items()
+        }
+        self._last_sync: Optional[float] = None
+
+    @staticmethod
+    def initial_interval(published_at: datetime, now: datetime) -> float:
+        """投稿からの経過時間に比例した初回の取得間隔（秒）"""
+        age_hours = max((now - published_at).total_seconds() / 3600, 1.0)
+        return min(settings.ENGAGEMENT_POLL_MIN_INTERVAL * age_hours, settings.ENGAGEMENT_POLL_MAX_INTERVAL)
+
+    @staticmethod
+    def next_interval(state: PollState, velocity: Optional[float]) -> float:
+        """
+        直近のエンゲージメント速度から次回の取得間隔を決定します。
+
+        増加が止まった、または速度が半分以下に落ちた場合は間隔を延ばし、
+        速度が上がっている場合は間隔を縮めます。
+
+        Args:
+            state: 前回までのポーリング状態
+            velocity: 今回のエンゲージメント速度（初回はNone）
+
+        Returns:
+            float: 次回までの秒数
+        """
+        interval = state.interval
+        backoff = settings.ENGAGEMENT_POLL_BACKOFF
+        if velocity is not None:
+            if velocity <= 0:
+                interval *= backoff
+            elif state.velocity is not None and velocity > state.velocity:
+                interval /= backoff
+            elif state.velocity is not None and velocity < state.velocity / 2:
+                interval *= backoff
+        return min(max(interval, settings.ENGAGEMENT_POLL_MIN_INTERVAL), settings.ENGAGEMENT_POLL_MAX_INTERVAL)
+
+    def _schedule(self, state: PollState) -> None:
+        heapq.heappush(self._queue, (state.next_poll_at, state.post_id))
+
+    async def sync_published_posts(self) -> int:
+        """
+        追跡対象の公開済み投稿を更新します。
+        新しく公開された投稿を追加し、最大追跡期間を過ぎた投稿を除外します。
+
+        Returns:
+            int: 新たに追加した投稿数
+        """
+        now = datetime.utcnow()
+        cutoff = now - timedelta(days=settings.ENGAGEMENT_POLL_MAX_AGE_DAYS)
+
+        # 公開時刻はバリエーションの最初の公開時刻（投稿の編集で updated_at が変わっても影響しない）。
+        # published_at を持たない以前の投稿のみ updated_at で代用する
+        published_at = func.coalesce(func.min(PostVariant.published_at), Post.updated_at).label("published_at")
+        async with AsyncSessionLocal() as db:
+            stmt = (
+                select(Post.id, Post.platform, published_at)
+                .outerjoin(PostVariant, PostVariant.post_id == Post.id)
+                .where(Post.status == PostStatus.PUBLISHED)
+                .group_by(Post.id, Post.platform, Post.updated_at)
+                .having(published_at >= cutoff)
+            )
+            rows = (await db.execute(stmt)).all()
+
+        active_ids = set()
+        added = 0
+        for row in rows:
+            active_ids.add(row.id)
+            if row.id in self.states:
+                continue
+            state = PollState(
+                post_id=row.id,
+                platform=row.platform,
+                published_at=row.published_at,
+                interval=self.initial_interval(row.published_at, now),
+                next_poll_at=time.monotonic(),
+            )
+            self.states[row.id] = state
+            self._schedule(state)
+            added += 1
+
+        # 期間外になった投稿はキューから遅延削除される
+        for post_id in list(self.states):
+            if post_id not in active_ids:
+                del self.states[post_id]
+
+        self._last_sync = time.monotonic()
+        if added:
+            logger.info(f"Engagement poller tracking {len(self.states)} posts ({added} new)")
+        return added
+
+    def _pop_due(self, now: float) -> Dict[Platform, List[PollState]]:
+        """期限が来た投稿をプラットフォームごとに取り出します。"""
+        due: Dict[Platform, List[PollState]] = {}
+        while self._queue and self._queue[0][0] <= now:
+            scheduled_at, post_id = heapq.heappop(self._queue)
+            state = self.states.get(post_id)
+            # 再スケジュール済み・追跡終了のエントリは無視
+            if state is None or state.next_poll_at != scheduled_at:
+                continue
+            due.setdefault(state.platform, []).append(state)
+        return due
+
+    async def _poll_batch(self, platform: Platform, batch: List[PollState]) -> None:
+        """1プラットフォーム分の投稿をまとめて取得し、次回の取得時刻を決めます。"""
+        async with self._semaphores[platform]:
+            post_totals: Dict[int, int] = {}
+            try:
+                async with AsyncSessionLocal() as db:
+                    result = await fetch_latest_engagements_for_posts(
+                        [state.post_id for state in batch], db=db
+                    )
+                post_totals = result.get("post_totals", {})
+            except Exception as e:
+                logger.error(f"Error polling {platform.value} engagements: {e}")
+
+        now = time.monotonic()
+        for state in batch:
+            total = post_totals.get(state.post_id)
+            velocity = None
+            if total is not None and state.last_total is not None and state.last_polled_at is not None:
+                velocity = (total - state.last_total) / max(now - state.last_polled_at, 1.0)
+            elif total is None:
+                # 取得に失敗した場合はバックオフして再試行
+                velocity = 0.0
+
+            state.interval = self.next_interval(state, velocity)
+            if total is not None:
+                state.last_total = total
+                state.last_polled_at = now
+                state.velocity = velocity if velocity is not None else state.velocity
+            state.next_poll_at = now + state.interval
+            if state.post_id in self.states:
+                self._schedule(state)
+
+    async def run_once(self) -> int:
+        """
+        期限が来た投稿をすべて取得します。
+
+        Returns:
+            int: 取得した投稿数
+        """
+        if self._last_sync is None or time.monotonic() - self._last_sync >= settings.ENGAGEMENT_POLL_SYNC_INTERVAL:
+            await self.sync_published_posts()
+
+        due = self._pop_due(time.monotonic())
+        tasks = []
+        for platform, states in due.items():
+            for start in range(0, len(states), settings.ENGAGEMENT_POLL_BATCH_SIZE):
+                tasks.append(self._poll_batch(platform, states[start:start + settings.ENGAGEMENT_POLL_BATCH_SIZE]))
+        if tasks:
+            await asyncio.gather(*tasks)
+        return sum(len(states) for states in due.values())
+
+    async def run(self) -> None:
+        """キャンセルされるまでポーリングを続けます。"""
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Error in engagement poller: {e}")
+
+            sleep_for = MAX_IDLE_SLEEP
+            if self._queue:
+                sleep_for = min(max(self._queue[0][0] - time.monotonic(), 0.0), MAX_IDLE_SLEEP)
+            await asyncio.sleep(sleep_for)
+
+
+engagement_poller = EngagementPoller()
+
+
+async def poller_loop():
+    """
+    単独プロセスとしてポーラーを実行する（複数のAPIワーカーで重複して取得しないため）
+    """
+    engagement_history.start()
+    try:
+        await engagement_poller.run()
+    finally:
+        await engagement_history.stop()
+
+if __name__ == "__main__":
+    setup_logger()
+    asyncio.run(poller_loop())
@@ -0,0 +1,235 @@
+# backend/app/tasks/engagement_retention.py
+import asyncio
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.config import settings
+from app.core.logger import logger, setup_logger
+from app.db.session import get_async_engine
+
+RAW_TABLE = "engagement_snapshots"
+HOURLY_TABLE = "engagement_snapshots_hourly"
+DAILY_TABLE = "engagement_snapshots_daily"
+
+# パーティション名: <親テーブル名>_pYYYYMM
+PARTITION_SUFFIX = "_p"
+
+
+def _month_start(dt: datetime) -> datetime:
+    return datetime(dt.year, dt.month, 1)
+
+
+def _add_months(dt: datetime, months: int) -> datetime:
+    month_index = dt.year * 12 + (dt.month - 1) + months
+    return datetime(month_index // 12, month_index % 12 + 1, 1)
+
+
+def _partition_name(table: str, month: datetime) -> str:
+    return f"{table}{PARTITION_SUFFIX}{month:%Y%m}"
+
+
+async def _create_partition(conn: AsyncConnection, table: str, month: datetime) -> None:
+    """指定した月のパーティションを作成します（既に存在する場合は何もしない）。"""
+    start = _month_start(month)
+    end = _add_months(start, 1)
+    await conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {_partition_name(table, start)} PARTITION OF {table} "
+        f"FOR VALUES FROM ('{start:%Y-%m-%d}') TO ('{end:%Y-%m-%d}')"
+    ))
+
+
+async def ensure_partitions(conn: AsyncConnection, table: str, months_ahead: int, now: datetime) -> None:
+    """
+    当月から months_ahead ヶ月先までの月次パーティションを作成します。
+
+    Args:
+        conn: DB接続
+        table: パーティション親テーブル名
+        months_ahead: 事前に作成する月数
+        now: 基準日時
+    """
+    current = _month_start(now)
+    for offset in range(months_ahead + 1):
+        await _create_partition(conn, table, _add_months(current, offset))
+
+
+async def ensure_upcoming_partitions(now: Optional[datetime] = None) -> None:
+    """
+    raw / hourly テーブルの当月から ENGAGEMENT_PARTITIONS_AHEAD ヶ月先までのパーティションを作成します。
+    パーティションが無い月のスナップショットは書き込めないため、履歴の書き込み処理からも定期的に呼び出します。
+
+    Args:
+        now: 基準日時（省略時は現在時刻）
+    """
+    now = now or datetime.utcnow()
+    async with get_async_engine().begin() as conn:
+        await ensure_partitions(conn, RAW_TABLE, settings.ENGAGEMENT_PARTITIONS_AHEAD, now)
+        await ensure_partitions(conn, HOURLY_TABLE, settings.ENGAGEMENT_PARTITIONS_AHEAD, now)
+
+
+def raw_partition_window(now: datetime) -> Tuple[datetime, datetime]:
+    """
+    raw テーブルに書き込める captured_at の範囲 [開始, 終了) を返します。
+    保持期間の境界を含む月から、事前に作成する最後の月の末までです（それ以外の月のパーティションは作成しない）。
+
+    Args:
+        now: 基準日時
+
+    Returns:
+        Tuple[datetime, datetime]: 開始と終了
+    """
+    start = _month_start(now - timedelta(days=settings.ENGAGEMENT_RAW_RETENTION_DAYS))
+    end = _add_months(_month_start(now), settings.ENGAGEMENT_PARTITIONS_AHEAD + 1)
+    return start, end
+
+
+async def ensure_raw_partitions(captured_at: Iterable[datetime]) -> List[datetime]:
+    """
+    指定した日時を含む月の raw テーブルのパーティションを作成します（書き込み前の補完用）。
+
+    Args:
+        captured_at: スナップショットの取得日時
+
+    Returns:
+        List[datetime]: 対象にした月（月初）
+    """
+    months = sorted({_month_start(dt) for dt in captured_at})
+    async with get_async_engine().begin() as conn:
+        for month in months:
+            await _create_partition(conn, RAW_TABLE, month)
+    return months
+
+
+async def _list_partitions(conn: AsyncConnection, table: str) -> List[Tuple[str, datetime]]:
+    """親テーブルに属する月次パーティションを (名前, 月初) の昇順で取得します。"""
+    result = await conn.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :parent"
+        ),
+        {"parent": table},
+    )
+    partitions = []
+    for (name,) in result.all():
+        suffix = name[len(table) + len(PARTITION_SUFFIX):]
+        try:
+            partitions.append((name, datetime.strptime(suffix, "%Y%m")))
+        except ValueError:
+            continue
+    return sorted(partitions, key=lambda p: p[1])
+
+
+async def _downsample_expired(
+    source_table: str,
+    time_column: str,
+    target_table: str,
+    bucket: str,
+    retention_days: int,
+    now: datetime,
+) -> int:
+    """
+    保持期間を過ぎた月次パーティションを粗い粒度へ集約してから削除します。
+    エンゲージメント数は累積値のため、各バケットの最大値（＝最後の値）を残します。
+
+    Args:
+        source_table: 集約元のパーティション親テーブル
+        time_column: 集約元の時刻カラム
+        target_table: 集約先テーブル
+        bucket: date_trunc の単位（hour / day）
+        retention_days: 集約元の保持日数
+        now: 基準日時
+
+    Returns:
+        int: 削除したパーティション数
+    """
+    cutoff = now - timedelta(days=retention_days)
+    dropped = 0
+
+    async with get_async_engine().connect() as conn:
+        partitions = await _list_partitions(conn, source_table)
+
+    for name, month in partitions:
+        if _add_months(month, 1) > cutoff:
+            break
+
+        # パーティションごとに1トランザクションで集約と削除を行う
+        async with get_async_engine().begin() as conn:
+            if target_table == HOURLY_TABLE:
+                await _create_partition(conn, target_table, month)
+            await conn.execute(text(
+                f"INSERT INTO {target_table} (post_variant_id, bucket_start, likes, comments, shares, upvotes) "
+                f"SELECT post_variant_id, date_trunc('{bucket}', {time_column}), "
+                f"max(likes), max(comments), max(shares), max(upvotes) "
+                f"FROM {name} GROUP BY 1, 2 "
+                f"ON CONFLICT (post_variant_id, bucket_start) DO UPDATE SET "
+                f"likes = GREATEST({target_table}.likes, EXCLUDED.likes), "
+                f"comments = GREATEST({target_table}.comments, EXCLUDED.comments), "
+                f"shares = GREATEST({target_table}.shares, EXCLUDED.shares), "
+                f"upvotes = GREATEST({target_table}.upvotes, EXCLUDED.upvotes)"
+            ))
+            await conn.execute(text(f"DROP TABLE {name}"))
+
+        logger.info(f"Downsampled and dropped partition {name} into {target_table}")
+        dropped += 1
+
+    return dropped
+
+
+async def run_engagement_maintenance(now: Optional[datetime] = None) -> Dict[str, int]:
+    """
+    エンゲージメント履歴のパーティション作成・ダウンサンプリング・保持期間の適用を行います。
+
+    raw (engagement_snapshots) -> hourly -> daily の順に集約し、
+    daily は ENGAGEMENT_DAILY_RETENTION_DAYS を過ぎた行を削除します。
+
+    Args:
+        now: 基準日時（省略時は現在時刻）
+
+    Returns:
+        Dict[str, int]: 処理件数
+    """
+    now = now or datetime.utcnow()
+
+    await ensure_upcoming_partitions(now)
+
+    raw_dropped = await _downsample_expired(
+        RAW_TABLE, "captured_at", HOURLY_TABLE, "hour", settings.ENGAGEMENT_RAW_RETENTION_DAYS, now
+    )
+    hourly_dropped = await _downsample_expired(
+        HOURLY_TABLE, "bucket_start", DAILY_TABLE, "day", settings.ENGAGEMENT_HOURLY_RETENTION_DAYS, now
+    )
+
+    async with get_async_engine().begin() as conn:
+        result = await conn.execute(
+            text(f"DELETE FROM {DAILY_TABLE} WHERE bucket_start < :cutoff"),
+            {"cutoff": now - timedelta(days=settings.ENGAGEMENT_DAILY_RETENTION_DAYS)},
+        )
+        daily_deleted = result.rowcount
+
+    return {
+        "raw_partitions_dropped": raw_dropped,
+        "hourly_partitions_dropped": hourly_dropped,
+        "daily_rows_deleted": daily_deleted,
+    }
+
+
+async def maintenance_loop():
+    """
+    ENGAGEMENT_MAINTENANCE_INTERVAL 秒ごとにエンゲージメント履歴のメンテナンスを実行するバックグラウンドワーカー
+    """
+    while True:
+        try:
+            result = await run_engagement_maintenance()
+            logger.info(f"Engagement maintenance completed: {result}")
+        except Exception as e:
+            logger.error(f"Error running engagement maintenance: {e}")
+        await asyncio.sleep(settings.ENGAGEMENT_MAINTENANCE_INTERVAL)
+
+if __name__ == "__main__":
+    setup_logger()
+    asyncio.run(maintenance_loop())
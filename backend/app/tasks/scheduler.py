@@ -1,9 +1,24 @@
 # backend/app/tasks/scheduler.py
 import json
 import asyncio
-from app.db.redis_client import redis_client
+from datetime import datetime, timezone
+from prometheus_client import start_http_server
+from app.core.config import settings
+from app.db.redis_client import async_redis_client
 from app.services.post_service import publish_post
-from app.core.logger import logger
+from app.core.logger import logger, setup_logger
+from app.core.metrics import JOB_LATENESS
+
+def observe_lateness(job: dict) -> None:
+    """予定時刻（UTC）から実行開始までの遅延を記録する（不正な scheduled_at でもジョブは止めない）"""
+    try:
+        scheduled_at = datetime.fromisoformat(job["scheduled_at"])
+        if scheduled_at.tzinfo is not None:
+            scheduled_at = scheduled_at.astimezone(timezone.utc).replace(tzinfo=None)
+        lateness = (datetime.utcnow() - scheduled_at).total_seconds()
+        JOB_LATENESS.observe(max(lateness, 0.0))
+    except Exception as e:
+        logger.warning(f"Could not record job lateness for scheduled_at={job.get('scheduled_at')!r}: {e}")
 
 async def scheduler_loop():
     """
@@ -11,11 +26,13 @@ async def scheduler_loop():
     所定の投稿（post_id）を実行するバックグラウンドワーカー
     """
     while True:
-        job_data = redis_client.lpop("schedule_queue")
+        job_data = await async_redis_client.lpop("schedule_queue")
         if job_data:
             try:
                 job = json.loads(job_data)
                 logger.info(f"Executing scheduled job: {job}")
+                if job.get("scheduled_at"):
+                    observe_lateness(job)
                 post_id = job.get("post_id")
                 if post_id is not None:
                     # 即時投稿の実行（SNS API 連携等の実装は post_service.publish_post 内で処理）
@@ -30,5 +47,9 @@ async def scheduler_loop():
             await asyncio.sleep(5)
 
 if __name__ == "__main__":
+    setup_logger()
+    # ジョブの遅延などワーカー側のメトリクスを公開する（APIの /metrics とは別プロセスのため）
+    if settings.SCHEDULER_METRICS_PORT:
+        start_http_server(settings.SCHEDULER_METRICS_PORT)
     # asyncio.run() で scheduler_loop を実行
     asyncio.run(scheduler_loop())
\ No newline at end of file
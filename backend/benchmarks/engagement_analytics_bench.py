@@ -0,0 +1,60 @@
+"""
+エンゲージメント分析エンジンのスループット計測
+
+メモリ上の系列に対するNumPyの処理時間のみを計測します（DBからの読み込みは含まない）。
+
+Usage:
+    python -m benchmarks.engagement_analytics_bench [snapshots] [variants]
+"""
+import sys
+import time
+
+import numpy as np
+
+from app.services.engagement_analytics import EngagementSeries, engagement_analytics
+
+
+def make_series(snapshots: int, variants: int, seed: int = 0) -> EngagementSeries:
+    """5分間隔で取得した累積エンゲージメントを模した系列を生成します。"""
+    rng = np.random.default_rng(seed)
+    per_variant = snapshots // variants
+    variant_ids = np.repeat(np.arange(1, variants + 1), per_variant)
+    captured_at = np.tile(np.arange(per_variant) * 300.0, variants) + 1.7e9
+    columns = {
+        metric: np.cumsum(rng.poisson(scale, size=len(variant_ids)).reshape(variants, per_variant), axis=1).ravel()
+        for metric, scale in (("likes", 3), ("comments", 1), ("shares", 0.5), ("upvotes", 2))
+    }
+    # DBからの読み込み順に依存しないよう並びを崩しておく
+    order = rng.permutation(len(variant_ids))
+    return EngagementSeries.from_columns(
+        variant_ids[order], captured_at[order], **{m: c[order] for m, c in columns.items()}
+    )
+
+
+def timed(label: str, rows: int, func, repeat: int = 5):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    print(f"{label:<20} {best * 1000:9.2f} ms  {rows / best / 1e6:8.1f} M snapshots/s")
+    return result
+
+
+def main():
+    snapshots = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    variants = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    series = make_series(snapshots, variants)
+    print(f"{series.size:,} snapshots, {len(series.variant_ids)} variants")
+
+    start, end = series.captured_at.min(), series.captured_at.max()
+    timed("build (sort)", series.size, lambda: make_series(snapshots, variants), repeat=1)
+    timed("latest", series.size, lambda: engagement_analytics.latest(series))
+    timed("deltas", series.size, lambda: engagement_analytics.deltas(series))
+    timed("growth_curves 1h", series.size, lambda: engagement_analytics.growth_curves(series, 3600, start, end))
+    timed("compare_variants", series.size, lambda: engagement_analytics.compare_variants(series, "engagement_rate"))
+
+
+if __name__ == "__main__":
+    main()
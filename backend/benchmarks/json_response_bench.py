@@ -0,0 +1,108 @@
+"""
+APIレスポンスのJSONシリアライズのスループット計測（FastAPI標準のJSONResponse と ORJSONResponse の比較）
+
+エンドポイントの戻り値は、どちらのレスポンスクラスでも先にFastAPIの serialize_response で
+JSON互換の値に変換される（response_model があればその検証・変換、無ければ jsonable_encoder）。
+レスポンスクラスで差が出るのはその後の render のみなので、両方を計測する。
+
+endpoint: serialize_response + render（実際のリクエスト処理と同じ経路）
+render:   serialize_response 済みの値の render のみ
+
+Usage:
+    python -m benchmarks.json_response_bench [jobs] [snapshots]
+"""
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.core.responses import ORJSONResponse
+from app.models.post import Platform, PostStatus
+from app.schemas.analysis_schemas import EngagementResponse, VariantEngagement
+from app.schemas.schedule_schemas import ScheduleJob, ScheduleJobsList
+
+
+def make_jobs(count: int) -> ScheduleJobsList:
+    base = datetime(2024, 1, 1)
+    return ScheduleJobsList(jobs=[
+        ScheduleJob(job_id=f"post:{i}:variant:{i % 3}", post_id=i, variant_id=i % 3, scheduled_at=base + timedelta(minutes=i))
+        for i in range(count)
+    ])
+
+
+def make_posts(count: int) -> list:
+    """ORMから組み立てたdictを返すエンドポイントを模したデータ（Enumとdatetimeを含む）"""
+    base = datetime(2024, 1, 1)
+    platforms, statuses = list(Platform), list(PostStatus)
+    return [
+        {
+            "id": i,
+            "platform": platforms[i % len(platforms)],
+            "status": statuses[i % len(statuses)],
+            "content": "新機能をリリースしました！ " * 4,
+            "scheduled_at": base + timedelta(hours=i),
+            "created_at": base,
+        }
+        for i in range(count)
+    ]
+
+
+def make_engagements(snapshots: int, variants: int = 5) -> EngagementResponse:
+    base = datetime(2024, 1, 1)
+    return EngagementResponse(
+        post_id=1,
+        start_date=base,
+        end_date=base + timedelta(minutes=5 * snapshots),
+        variants=[
+            VariantEngagement(
+                variant_id=i % variants + 1,
+                likes=i, comments=i // 3, shares=i // 7, upvotes=i // 2,
+                captured_at=base + timedelta(minutes=5 * i),
+            )
+            for i in range(snapshots)
+        ],
+    )
+
+
+def timed(label: str, func, repeat: int = 5) -> None:
+    best = float("inf")
+    size = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        size = len(func())
+        best = min(best, time.perf_counter() - started)
+    print(f"{label:<44} {best * 1000:9.2f} ms  {size / best / 1e6:8.1f} MB/s")
+
+
+def compare(loop, name: str, payload, response_model=None) -> None:
+    field = create_response_field(name="response", type_=response_model) if response_model else None
+
+    def serialize():
+        return loop.run_until_complete(serialize_response(field=field, response_content=payload))
+
+    for response_class in (JSONResponse, ORJSONResponse):
+        timed(f"{name} endpoint ({response_class.__name__})", lambda: response_class(serialize()).body)
+    content = serialize()
+    for response_class in (JSONResponse, ORJSONResponse):
+        timed(f"{name} render ({response_class.__name__})", lambda: response_class(content).body)
+
+
+def main():
+    jobs = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    snapshots = int(sys.argv[2]) if len(sys.argv) > 2 else 50_000
+
+    loop = asyncio.new_event_loop()
+    try:
+        compare(loop, "jobs", make_jobs(jobs), ScheduleJobsList)
+        compare(loop, "posts (enum/datetime)", make_posts(jobs))
+        compare(loop, "engagements", make_engagements(snapshots), EngagementResponse)
+    finally:
+        loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+アプリケーションのインポート時間（起動コスト）の計測
+
+各回を新しいPythonプロセスで実行し、`import main` に掛かる時間の中央値を表示します。
+--importtime を指定すると `-X importtime` の結果から累積時間の大きいモジュールを表示します。
+
+Usage:
+    python -m benchmarks.startup_bench [runs] [--importtime]
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+MEASURE = "import time; t = time.perf_counter(); import main; print(time.perf_counter() - t)"
+
+
+def run_once(env) -> float:
+    completed = subprocess.run(
+        [sys.executable, "-c", MEASURE], capture_output=True, text=True, check=True, env=env
+    )
+    return float(completed.stdout.strip().splitlines()[-1])
+
+
+def top_imports(env, limit: int = 15):
+    """`-X importtime` の出力（stderr）から累積時間の大きい順にモジュールを返します。"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        capture_output=True, text=True, check=True, env=env,
+    )
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if cumulative.isdigit():
+            rows.append((int(cumulative), name))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    runs = int(args[0]) if args else 10
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+
+    # 1回目は .pyc の作成やOSのファイルキャッシュの影響を受けるため除外する
+    run_once(env)
+    samples = [run_once(env) for _ in range(runs)]
+    print(f"import main  runs={runs}")
+    print(f"  median {statistics.median(samples) * 1000:9.1f} ms")
+    print(f"  min    {min(samples) * 1000:9.1f} ms")
+    print(f"  max    {max(samples) * 1000:9.1f} ms")
+
+    if "--importtime" in sys.argv:
+        print("\ncumulative import time (top modules)")
+        for cumulative, name in top_imports(env):
+            print(f"  {cumulative / 1000:9.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,57 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from app.api.router import api_router
 from app.core.config import settings
+from app.core.jwks import supabase_jwks
+from app.core.logger import app_logger, setup_logger
+from app.core.metrics import SCHEDULER_QUEUE_DEPTH, MetricsMiddleware, render_metrics
+from app.core.responses import ORJSONResponse
+from app.db.pool_metrics import get_pool_metrics
+from app.db.readiness import client_readiness
+from app.db.redis_client import close_async_redis, get_schedule_queue_depth
+from app.services.engagement_history import engagement_history
+from app.services.token_revocation import token_revocation
+from app.tasks.engagement_poller import engagement_poller
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    setup_logger()
+    # DB / Redis / Supabase クライアントを並列に作成し、接続を確認しておく
+    await client_readiness.warm_up()
+    # エンゲージメント履歴のバッチ書き込みを開始
+    engagement_history.start()
+    # Supabaseの署名鍵（JWKS）をバックグラウンドで取得・更新
+    supabase_jwks.start()
+    # 失効済みトークンのBloomフィルタを読み込み、pub/subで更新を受け取る
+    await token_revocation.start()
+    # 単一ワーカー構成の場合のみAPIプロセス内でポーラーを実行する
+    engagement_poller_task = None
+    if settings.ENGAGEMENT_POLLER_ENABLED:
+        engagement_poller_task = asyncio.create_task(engagement_poller.run())
+
+    yield
+
+    if engagement_poller_task is not None:
+        engagement_poller_task.cancel()
+        try:
+            await engagement_poller_task
+        except asyncio.CancelledError:
+            pass
+    await supabase_jwks.stop()
+    await token_revocation.stop()
+    # バッファに残っているエンゲージメント履歴を書き出してから終了
+    await engagement_history.stop()
+    await close_async_redis()
 
 app = FastAPI(
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     title="DevMarketer API",
     description="個人開発者向けSNSマーケティング自動化WebアプリのAPI",
     version="0.1.0",
@@ -26,6 +72,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ルートごとのリクエスト処理時間を記録（CORSを含むすべてのミドルウェアの外側）
+app.add_middleware(MetricsMiddleware)
+
 # Register API router
 app.include_router(api_router, prefix="/api")
 
@@ -37,5 +86,31 @@ async def root():
 async def health_check():
     return {"status": "ok"}
 
+@app.get("/health/ready")
+async def readiness_check():
+    """起動時のウォームアップ結果。プライマリDBに接続できない場合は503を返す"""
+    status_code = 200 if client_readiness.ready else 503
+    return JSONResponse(
+        status_code=status_code,
+        content={"ready": client_readiness.ready, "clients": client_readiness.status},
+    )
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus形式のメトリクス"""
+    # キューの長さはスクレイプ時に取得する
+    try:
+        for state, depth in (await get_schedule_queue_depth()).items():
+            SCHEDULER_QUEUE_DEPTH.labels(state).set(depth)
+    except Exception as e:
+        app_logger.warning(f"スケジュールキューの長さを取得できませんでした: {e}")
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+@app.get("/health/pools")
+async def pool_health():
+    """Postgres / Redis 接続プールの利用状況（チェックアウト数、待機数、待機時間）"""
+    return get_pool_metrics()
+
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
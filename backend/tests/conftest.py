@@ -0,0 +1,8 @@
+"""
+テスト共通の設定
+"""
+import importlib
+
+# リレーションシップを解決できるよう、アプリケーションと同じくすべてのモデルを読み込んでおく
+for _module in ("engagement", "engagement_rollup", "engagement_snapshot", "post", "post_variant", "user"):
+    importlib.import_module(f"app.models.{_module}")
@@ -0,0 +1,63 @@
+"""
+get_engagements がバリエーション数に関わらず1回のクエリで完結することを確認する回帰テスト
+"""
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services.analysis_service import get_engagements
+from app.services.engagement_rollup import COUNTERS
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+
+class CountingSession:
+    """発行されたステートメントを記録する AsyncSession の代替"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statements.append(statement)
+        return _Result(self.rows)
+
+
+def _row(variant_id: int):
+    return SimpleNamespace(
+        variant_id=variant_id,
+        captured_at=datetime(2024, 1, 1),
+        snapshot_count=3,
+        **{c: variant_id for c in COUNTERS},
+        **{f"{c}_gained": 1 for c in COUNTERS},
+    )
+
+
+@pytest.mark.parametrize("variant_count", [1, 5, 50])
+@pytest.mark.parametrize("include_stats", [False, True])
+def test_get_engagements_issues_one_query(variant_count, include_stats):
+    db = CountingSession([_row(i) for i in range(1, variant_count + 1)])
+
+    result = asyncio.run(get_engagements(
+        post_id=1,
+        user_id=1,
+        db=db,
+        start_date=datetime(2023, 12, 1),
+        end_date=datetime(2024, 1, 31),
+        include_stats=include_stats,
+    ))
+
+    assert len(db.statements) == 1
+    assert len(result["variants"]) == variant_count
+    # 生成したSQLがPostgres向けにコンパイルできること
+    sql = str(db.statements[0].compile(dialect=postgresql.dialect()))
+    assert "engagement_snapshots_daily" in sql
@@ -0,0 +1,25 @@
+"""
+必須クレームが不正なトークンが401になることを確認するテスト
+"""
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.services import auth_service
+
+
+@pytest.mark.parametrize("payload", [
+    {"sub": "1"},                       # exp が無い
+    {"sub": "user@example.com", "exp": 4102444800},  # sub が数値でない
+    {"exp": 4102444800},                # sub が無い
+    {"sub": "1", "exp": "tomorrow"},    # exp が数値でない
+])
+def test_malformed_claims_are_unauthorized(monkeypatch, payload):
+    monkeypatch.setattr(auth_service, "verify_token", lambda token: payload)
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(auth_service.get_current_user(token=f"token-{sorted(payload.items())}"))
+
+    assert error.value.status_code == 401
+    assert asyncio.run(auth_service.revoke_token(f"revoke-{sorted(payload.items())}")) is False
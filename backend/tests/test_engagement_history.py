@@ -0,0 +1,99 @@
+"""
+EngagementHistoryWriter.flush のテスト（DB・集計・キャッシュは代替オブジェクト）
+"""
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import engagement_history as history_module
+from app.services.engagement_history import EngagementHistoryWriter
+
+
+class _Result(list):
+    def all(self):
+        return list(self)
+
+
+class FakeSession:
+    def __init__(self):
+        self.inserted = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def execute(self, statement, rows=None):
+        if rows is None:
+            # 所有者の検索
+            return _Result()
+        self.inserted.extend(rows)
+        return _Result(SimpleNamespace(post_variant_id=r["post_variant_id"], captured_at=r["captured_at"]) for r in rows)
+
+    async def commit(self):
+        pass
+
+
+class _Recorder:
+    def __init__(self):
+        self.calls = []
+
+    async def apply_snapshots(self, db, snapshots):
+        self.calls.append(snapshots)
+
+    async def invalidate_tags(self, tags):
+        pass
+
+
+@pytest.fixture
+def db(monkeypatch):
+    session = FakeSession()
+    created = []
+
+    async def ensure_raw_partitions(captured_at):
+        months = sorted({datetime(dt.year, dt.month, 1) for dt in captured_at})
+        created.extend(months)
+        return months
+
+    monkeypatch.setattr(history_module, "AsyncSessionLocal", lambda: session)
+    monkeypatch.setattr(history_module, "ensure_raw_partitions", ensure_raw_partitions)
+    monkeypatch.setattr(history_module, "engagement_rollup_service", _Recorder())
+    monkeypatch.setattr(history_module, "posting_heatmap_service", _Recorder())
+    monkeypatch.setattr(history_module, "response_cache", _Recorder())
+    session.created_partitions = created
+    return session
+
+
+def test_out_of_range_reading_does_not_fail_the_batch(db):
+    writer = EngagementHistoryWriter(batch_size=100, flush_interval=1, max_retries=3, partition_interval=60)
+    now = datetime.utcnow()
+
+    async def main():
+        await writer.add([
+            {"post_variant_id": 1, "captured_at": now, "likes": 1},
+            {"post_variant_id": 2, "captured_at": datetime(1999, 1, 1), "likes": 2},
+            {"post_variant_id": 3, "captured_at": now + timedelta(days=3650), "likes": 3},
+        ])
+        return await writer.flush()
+
+    assert asyncio.run(main()) == 1
+    assert [r["post_variant_id"] for r in db.inserted] == [1]
+    assert db.created_partitions == [datetime(now.year, now.month, 1)]
+    # 範囲外の読み取りは再試行のためにバッファへ戻さない
+    assert writer._buffer == []
+
+
+def test_partitions_are_created_once_per_month(db):
+    writer = EngagementHistoryWriter(batch_size=100, flush_interval=1, max_retries=3, partition_interval=60)
+    now = datetime.utcnow()
+
+    async def main():
+        for i in range(2):
+            await writer.add([{"post_variant_id": 1, "captured_at": now + timedelta(seconds=i)}])
+            await writer.flush()
+
+    asyncio.run(main())
+    assert db.created_partitions == [datetime(now.year, now.month, 1)]
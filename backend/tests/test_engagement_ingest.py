@@ -0,0 +1,57 @@
+"""
+EngagementIngestService.upsert_engagements のテスト（DBと履歴の書き込みは代替オブジェクト）
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+from app.services import engagement_ingest
+from app.services.engagement_ingest import EngagementIngestService
+
+
+class _Result:
+    def __init__(self, rowcount):
+        self.rowcount = rowcount
+
+
+class FakeSession:
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statements.append(statement)
+        return _Result(1)
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        pass
+
+
+class FakeHistory:
+    def __init__(self):
+        self.rows = []
+
+    async def add(self, rows):
+        self.rows.extend(rows)
+
+
+def test_every_reading_reaches_history(monkeypatch):
+    history = FakeHistory()
+    monkeypatch.setattr(engagement_ingest, "engagement_history", history)
+    base = datetime(2024, 1, 1)
+    readings = [
+        {"post_variant_id": 1, "captured_at": base, "likes": 1},
+        {"post_variant_id": 1, "captured_at": base + timedelta(minutes=5), "likes": 3},
+        {"post_variant_id": 2, "captured_at": base, "likes": 2},
+    ]
+    db = FakeSession()
+
+    asyncio.run(EngagementIngestService.upsert_engagements(db, readings))
+
+    # 最新値の更新はバリエーションごとに最新の1行のみ
+    assert len(db.statements) == 1
+    upserted = db.statements[0].compile().params
+    assert sorted(v for k, v in upserted.items() if k.startswith("likes")) == [2, 3]
+    # 履歴には同じバリエーションの古い値も含めてすべて追加される
+    assert [(r["post_variant_id"], r["likes"]) for r in history.rows] == [(1, 1), (1, 3), (2, 2)]
@@ -0,0 +1,19 @@
+"""
+エクスポートのクエリが生データの保持期間を過ぎた履歴も含むことを確認するテスト
+"""
+from datetime import datetime
+
+from sqlalchemy.dialects import postgresql
+
+from app.services.export_service import ExportService
+
+
+def test_engagements_export_includes_downsampled_history():
+    stmt = ExportService.build_query("engagements", user_id=1, start_date=datetime(2023, 1, 1))
+
+    assert [c.key for c in stmt.selected_columns] == [
+        "post_id", "post_variant_id", "captured_at", "likes", "comments", "shares", "upvotes",
+    ]
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    for table in ("engagement_snapshots", "engagement_snapshots_hourly", "engagement_snapshots_daily"):
+        assert f"FROM {table}" in sql
@@ -0,0 +1,65 @@
+"""
+接続プールの待機数が、接続の取得に失敗した場合も元に戻ることを確認するテスト
+"""
+import asyncio
+import os
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+from app.core.metrics import render_metrics
+from app.db.pool_metrics import (
+    InstrumentedAsyncBlockingConnectionPool,
+    get_pool_stats,
+    instrumented_pool_class,
+    register_engine,
+)
+
+
+def _failing_connect():
+    raise exc.OperationalError("connect", {}, Exception("connection refused"))
+
+
+def test_sqlalchemy_pool_waiting_resets_on_connection_error():
+    pool = instrumented_pool_class(QueuePool, "test_sqlalchemy")(_failing_connect, pool_size=1)
+    stats = get_pool_stats("test_sqlalchemy")
+
+    with pytest.raises(exc.OperationalError):
+        pool.connect()
+
+    assert stats.waiting == 0
+    assert stats.timeouts == 0
+    assert stats.checked_out == 0
+
+
+def test_async_redis_pool_waiting_resets_on_cancel():
+    pool = InstrumentedAsyncBlockingConnectionPool.from_url(
+        "redis://localhost:1", metrics_name="test_redis_async", max_connections=1
+    )
+    stats = get_pool_stats("test_redis_async")
+
+    async def main():
+        # 空きを待っている間に取り消す
+        pool._available_connections.clear()
+        pool._in_use_connections.add(object())
+        task = asyncio.create_task(pool.get_connection("PING"))
+        await asyncio.sleep(0.05)
+        assert stats.waiting == 1
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    assert stats.waiting == 0
+
+
+def test_pool_metrics_rendered_in_multiprocess_mode(monkeypatch, tmp_path):
+    pool = instrumented_pool_class(QueuePool, "test_multiprocess")(_failing_connect, pool_size=3)
+    register_engine("test_multiprocess", SimpleNamespace(pool=pool))
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+
+    body, _ = render_metrics()
+
+    assert f'connection_pool_size{{pid="{os.getpid()}",pool="test_multiprocess",type="postgres"}} 3.0' in body.decode()
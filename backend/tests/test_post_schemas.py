@@ -0,0 +1,25 @@
+"""
+投稿スケジュールのリクエストスキーマのテスト
+"""
+from datetime import datetime
+
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.post_schemas import PostSchedule
+from app.services.schedule_service import AUTO_SCHEDULE
+
+
+def test_schedule_accepts_datetime():
+    request = PostSchedule(scheduled_at="2024-01-01T09:00:00", variant_id=1)
+    assert request.scheduled_at == datetime(2024, 1, 1, 9, 0)
+
+
+def test_schedule_accepts_auto():
+    request = PostSchedule(scheduled_at="auto", variant_id=1)
+    assert request.scheduled_at == AUTO_SCHEDULE
+
+
+def test_schedule_rejects_other_strings():
+    with pytest.raises(ValidationError):
+        PostSchedule(scheduled_at="tomorrow", variant_id=1)
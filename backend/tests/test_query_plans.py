@@ -0,0 +1,123 @@
+"""
+ホットパスのクエリが索引を使用していることをEXPLAINで確認する回帰テスト
+
+マイグレーション適用済みのPostgresが必要です（TEST_DATABASE_URL に asyncpg のURLを指定）。
+未指定の場合はスキップします。
+本番に近い件数のデータを1トランザクション内で投入して ANALYZE し、プランナーの既定の設定で
+実行計画を確認します（データはテスト後にロールバックされます）。
+"""
+import asyncio
+import json
+import os
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL is not set")
+
+USERS = 500
+POSTS = 50_000
+VARIANTS_PER_POST = 3
+EMAIL_PREFIX = "plan-test-"
+
+SEED = [
+    (
+        "INSERT INTO users (email, name, auth_provider, created_at, updated_at) "
+        f"SELECT '{EMAIL_PREFIX}' || g || '@example.com', NULL, 'GITHUB', now(), now() "
+        "FROM generate_series(1, :users) g"
+    ),
+    (
+        "INSERT INTO posts (user_id, platform, status, scheduled_at, created_at, updated_at) "
+        "SELECT u.id, (ARRAY['X', 'REDDIT', 'PRODUCTHUNT'])[1 + g % 3]::platform, "
+        "(ARRAY['DRAFT', 'SCHEDULED', 'PUBLISHED', 'FAILED'])[1 + g % 4]::poststatus, "
+        "now() - g * interval '1 minute', now(), now() "
+        "FROM generate_series(1, :posts) g "
+        f"JOIN users u ON u.email = '{EMAIL_PREFIX}' || (1 + g % :users) || '@example.com'"
+    ),
+    (
+        "INSERT INTO post_variants (post_id, content, created_at, updated_at) "
+        "SELECT p.id, 'variant ' || v, now(), now() "
+        "FROM posts p JOIN users u ON u.id = p.user_id, generate_series(1, :variants) v "
+        f"WHERE u.email LIKE '{EMAIL_PREFIX}%'"
+    ),
+    (
+        "INSERT INTO engagements "
+        "(post_variant_id, likes, comments, shares, upvotes, captured_at, created_at, updated_at) "
+        "SELECT pv.id, pv.id % 100, pv.id % 10, pv.id % 7, pv.id % 50, now(), now(), now() "
+        "FROM post_variants pv JOIN posts p ON p.id = pv.post_id JOIN users u ON u.id = p.user_id "
+        f"WHERE u.email LIKE '{EMAIL_PREFIX}%'"
+    ),
+    "ANALYZE users, posts, post_variants, engagements",
+]
+
+# (クエリ, 使用されるべき索引)。{user_id} などは投入したデータのIDに置き換える
+HOT_QUERIES = [
+    (
+        "SELECT * FROM engagements WHERE post_variant_id = ANY(ARRAY[{variant_ids}])",
+        "uq_engagements_post_variant_id",
+    ),
+    (
+        "SELECT * FROM posts WHERE user_id = {user_id} AND status = 'SCHEDULED' "
+        "AND scheduled_at <= now() ORDER BY scheduled_at",
+        "ix_posts_user_id_status_scheduled_at",
+    ),
+    (
+        "SELECT * FROM post_variants WHERE post_id = {post_id}",
+        "ix_post_variants_post_id",
+    ),
+]
+
+
+def _plan_nodes(node):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+async def _explain_all() -> dict:
+    engine = create_async_engine(TEST_DATABASE_URL)
+    plans = {}
+    try:
+        async with engine.connect() as conn:
+            transaction = await conn.begin()
+            try:
+                for statement in SEED:
+                    await conn.execute(
+                        text(statement), {"users": USERS, "posts": POSTS, "variants": VARIANTS_PER_POST}
+                    )
+                user_id = (await conn.execute(
+                    text("SELECT id FROM users WHERE email = :email"), {"email": f"{EMAIL_PREFIX}1@example.com"}
+                )).scalar_one()
+                post_id = (await conn.execute(
+                    text("SELECT min(id) FROM posts WHERE user_id = :user_id"), {"user_id": user_id}
+                )).scalar_one()
+                variant_ids = (await conn.execute(
+                    text("SELECT id FROM post_variants WHERE post_id = :post_id"), {"post_id": post_id}
+                )).scalars().all()
+                ids = {"user_id": user_id, "post_id": post_id, "variant_ids": ", ".join(map(str, variant_ids))}
+
+                for query, _ in HOT_QUERIES:
+                    plan = (await conn.execute(text(f"EXPLAIN (FORMAT JSON) {query.format(**ids)}"))).scalar()
+                    if isinstance(plan, str):
+                        plan = json.loads(plan)
+                    plans[query] = plan[0]["Plan"]
+            finally:
+                await transaction.rollback()
+    finally:
+        await engine.dispose()
+    return plans
+
+
+@pytest.fixture(scope="module")
+def plans():
+    return asyncio.run(_explain_all())
+
+
+@pytest.mark.parametrize("query,index", HOT_QUERIES)
+def test_hot_query_uses_index(plans, query, index):
+    nodes = list(_plan_nodes(plans[query]))
+    assert not any(node["Node Type"] == "Seq Scan" for node in nodes), nodes
+    assert any(node.get("Index Name") == index for node in nodes), nodes
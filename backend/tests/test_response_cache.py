@@ -0,0 +1,71 @@
+"""
+ResponseCache.get_or_compute の同時実行のテスト（Redisの読み書きは代替）
+"""
+import asyncio
+
+import pytest
+
+from app.services.response_cache import ResponseCache
+
+
+def _cache() -> ResponseCache:
+    cache = ResponseCache(ttl=60, compress_min_bytes=1024)
+    stored = {}
+
+    async def get(key):
+        return stored.get(key)
+
+    async def generations(tags):
+        return ["0" for _ in tags]
+
+    async def set(key, value, tags, generations=None):
+        stored[key] = value
+        return True
+
+    cache.get, cache.generations, cache.set = get, generations, set
+    return cache
+
+
+def test_concurrent_misses_compute_once():
+    cache = _cache()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"value": len(calls)}
+
+    async def main():
+        first = asyncio.gather(*(cache.get_or_compute("k", ["post:1"], compute) for _ in range(5)))
+        await asyncio.sleep(0.005)
+        # 計算中に届いたリクエストも同じ計算を待つ
+        late = asyncio.gather(*(cache.get_or_compute("k", ["post:1"], compute) for _ in range(5)))
+        return await first + await late
+
+    results = asyncio.run(main())
+    assert calls == [1]
+    assert results == [{"value": 1}] * 10
+    assert cache._inflight == {}
+
+
+def test_waiter_recomputes_when_owner_is_cancelled():
+    cache = _cache()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def main():
+        owner = asyncio.create_task(cache.get_or_compute("k", [], compute))
+        await asyncio.sleep(0.005)
+        waiter = asyncio.create_task(cache.get_or_compute("k", [], compute))
+        await asyncio.sleep(0.005)
+        owner.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await owner
+        return await waiter
+
+    assert asyncio.run(main()) == "done"
+    assert len(calls) == 2
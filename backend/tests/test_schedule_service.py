@@ -0,0 +1,104 @@
+"""
+ScheduleService.schedule_post のテスト（DB・RQ・Redisは代替オブジェクト）
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.models.post import Platform
+from app.schemas.post_schemas import PostSchedule
+from app.services import schedule_service
+from app.services.schedule_service import ScheduleService
+
+
+class _Result:
+    def __init__(self, value):
+        self._value = value
+
+    def scalar_one_or_none(self):
+        return self._value
+
+
+class FakeSession:
+    """execute の呼び出し順に結果を返す AsyncSession の代替"""
+
+    def __init__(self, *values):
+        self.values = list(values)
+        self.statements = []
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statements.append(statement)
+        return _Result(self.values.pop(0))
+
+    async def commit(self):
+        pass
+
+
+class FakeQueue:
+    def __init__(self):
+        self.calls = []
+
+    def enqueue_in(self, time_delta, func, **kwargs):
+        self.calls.append(time_delta)
+
+
+class FakeRedis:
+    async def set(self, key, value):
+        pass
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    queue = FakeQueue()
+    monkeypatch.setattr(schedule_service, "get_schedule_queue", lambda: queue)
+    monkeypatch.setattr(schedule_service, "async_redis_client", FakeRedis())
+    return queue
+
+
+def _post():
+    return SimpleNamespace(id=1, user_id=1, platform=Platform.X, scheduled_at=None, status=None)
+
+
+def test_schedule_accepts_timezone_aware_datetime(queue):
+    # JSONで送られる通常の形式（UTCオフセット付き）
+    scheduled_at = (datetime.now(timezone.utc) + timedelta(hours=2)).astimezone(timezone(timedelta(hours=9)))
+    request = PostSchedule(scheduled_at=scheduled_at.isoformat(), variant_id=2)
+    post = _post()
+    db = FakeSession(post, SimpleNamespace(id=2, post_id=1))
+
+    result = asyncio.run(ScheduleService.schedule_post(db, 1, request.variant_id, request.scheduled_at, user_id=1))
+
+    assert result["status"] == "scheduled"
+    # naiveなUTCとして保存される
+    assert post.scheduled_at.tzinfo is None
+    assert post.scheduled_at == scheduled_at.astimezone(timezone.utc).replace(tzinfo=None)
+    assert timedelta(hours=1, minutes=59) < queue.calls[0] <= timedelta(hours=2)
+
+
+def test_schedule_returns_none_for_other_users_post(queue):
+    # 所有者で絞り込んだ検索に一致しない
+    db = FakeSession(None)
+
+    result = asyncio.run(ScheduleService.schedule_post(db, 1, 2, datetime.utcnow(), user_id=2))
+
+    assert result is None
+    assert "user_id" in str(db.statements[0])
+    assert queue.calls == []
+
+
+def test_cancel_returns_none_for_other_users_job(queue):
+    db = FakeSession(None)
+
+    result = asyncio.run(ScheduleService.cancel_scheduled_job(db, "post:1:variant:2", user_id=2))
+
+    assert result is None
+    assert "user_id" in str(db.statements[0])
+
+
+def test_cancel_ignores_malformed_job_id(queue):
+    db = FakeSession()
+
+    assert asyncio.run(ScheduleService.cancel_scheduled_job(db, "post:x", user_id=1)) is None
+    assert db.statements == []
@@ -0,0 +1,67 @@
+"""
+VariantSignificanceEngine.evaluate のテスト（DBは代替オブジェクト）
+"""
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from app.services.engagement_analytics import METRICS
+from app.services.variant_significance import VariantSignificanceEngine
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+
+class CountingSession:
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statements.append(statement)
+        return _Result(self.rows)
+
+
+def _row(variant_id: int, likes: int, last: datetime):
+    return SimpleNamespace(
+        id=variant_id,
+        first_captured_at=datetime(2024, 1, 1),
+        last_captured_at=last,
+        **{m: 0 for m in METRICS if m != "likes"},
+        likes=likes,
+    )
+
+
+def test_evaluate_loads_only_latest_rows_and_reuses_samples():
+    engine = VariantSignificanceEngine(samples=1000, credible_level=0.95, cache_size=10)
+    sampled = []
+    posterior = engine.posterior
+    engine.posterior = lambda *args: sampled.append(args) or posterior(*args)
+
+    last = datetime(2024, 1, 2)
+    db = CountingSession([_row(1, 10, last), _row(2, 50, last)])
+    published_at = {1: datetime(2024, 1, 1), 2: None}
+
+    first = asyncio.run(engine.evaluate(db, 1, "likes", published_at))
+    second = asyncio.run(engine.evaluate(db, 1, "likes", published_at))
+
+    assert first.variant_id == 2
+    assert second.significance is first.significance
+    assert len(sampled) == 1
+    # 1リクエストにつき1クエリ。履歴全体の件数は数えない
+    assert len(db.statements) == 2
+    sql = str(db.statements[0].compile(dialect=postgresql.dialect()))
+    assert "LIMIT" in sql and "count(" not in sql
+
+    # 新しい値が届くと再計算する
+    db.rows = [_row(1, 10, last), _row(2, 60, last + timedelta(minutes=5))]
+    third = asyncio.run(engine.evaluate(db, 1, "likes", published_at))
+    assert third.metric_value == 60
+    assert len(sampled) == 2